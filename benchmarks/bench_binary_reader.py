@@ -0,0 +1,84 @@
+""" Per-field decode cost of BinaryReader compared to the former BufferedReader + unpack approach.
+
+    python -m benchmarks.bench_binary_reader [--count N] [--repeat N]
+"""
+
+from argparse import ArgumentParser
+from io import BufferedReader
+from io import BytesIO
+from struct import unpack
+from time import perf_counter
+
+from io_soulworker.core.binary_reader import BinaryReader
+
+
+class LegacyReader(BufferedReader):
+    """ Reads the way BinaryReader did before: one read() plus a format string per field """
+
+    def read_uint8(self) -> int: return int(unpack("<B", self.read(1))[0])
+    def read_uint16(self) -> int: return int(unpack("<H", self.read(2))[0])
+    def read_int32(self) -> int: return int(unpack("<i", self.read(4))[0])
+    def read_uint32(self) -> int: return int(unpack("<I", self.read(4))[0])
+    def read_float(self) -> float: return float(unpack("<f", self.read(4))[0])
+
+    def read_float_vector3(self):
+        return (self.read_float(), self.read_float(), self.read_float())
+
+    def __init__(self, data: bytes) -> None:
+        super().__init__(BytesIO(data))
+
+
+def chunk_header(reader):
+    """ the three fields VisChunkScope reads on enter """
+
+    reader.read_int32()
+    reader.read_uint32()
+    reader.read_uint32()
+
+
+FIELDS = [
+    # name, field size, fields per call, decode
+    ("uint8", 1, 1, lambda reader: reader.read_uint8()),
+    ("uint16", 2, 1, lambda reader: reader.read_uint16()),
+    ("uint32", 4, 1, lambda reader: reader.read_uint32()),
+    ("float", 4, 1, lambda reader: reader.read_float()),
+    ("float_tuple3", 12, 3, lambda reader: reader.read_float_tuple3()),
+    ("chunk_header", 12, 3, chunk_header),
+]
+
+
+def measure(create, size: int, decode, count: int, repeat: int) -> float:
+    data = bytes(size * count)
+    best = float("inf")
+
+    for _ in range(repeat):
+        reader = create(data)
+        calls = range(count)
+
+        start = perf_counter()
+        for _ in calls:
+            decode(reader)
+        best = min(best, perf_counter() - start)
+
+        reader.close()
+
+    return best / count
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print("%-16s %14s %14s %10s" % ("field", "legacy ns", "reader ns", "speedup"))
+
+    for name, size, fields, decode in FIELDS:
+        legacy = measure(LegacyReader, size, decode, args.count, args.repeat) / fields
+        current = measure(BinaryReader, size, decode, args.count, args.repeat) / fields
+
+        print("%-16s %14.1f %14.1f %9.2fx" % (name, legacy * 1e9, current * 1e9, legacy / current))
+
+
+if __name__ == "__main__":
+    main()
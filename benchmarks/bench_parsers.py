@@ -0,0 +1,194 @@
+""" Parser timings across model size tiers, on synthetic files, without Blender.
+
+    python -m benchmarks.bench_parsers [--tiers small medium] [--repeat N] [--output results.json] [--table]
+
+Results are json: one record per (tier, case) with best and median seconds, bytes and MB/s,
+so runs can be compared to track scaling and catch regressions.
+"""
+
+from argparse import ArgumentParser
+from json import dump
+from pathlib import Path
+from platform import platform
+from platform import python_version
+from statistics import median
+from sys import stdout
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable
+
+import numpy
+
+from benchmarks.synthetic_model import LAYOUTS
+from benchmarks.synthetic_model import SyntheticAnimation
+from benchmarks.synthetic_model import SyntheticModel
+from io_soulworker.chunks.anim_chunk import AnimChunk
+from io_soulworker.chunks.mtrs_chunk import MtrsChunk
+from io_soulworker.chunks.skel_chunk import SkelChunk
+from io_soulworker.chunks.vmsh_chunk import VMshChunk
+from io_soulworker.chunks.wght_chunk import WghtChunk
+from io_soulworker.core.binary_reader import BinaryReader
+from io_soulworker.core.vis_bin_header import VisBinHeader
+from io_soulworker.core.vis_chunk_id import VisChunkId
+from io_soulworker.core.vis_chunk_toc import VisChunkToc
+from io_soulworker.core.vis_index_format import VisIndexFormat
+from io_soulworker.out.model_file_reader import ModelFileReader
+
+
+TIERS = {
+    # vertices, materials, bones
+    "small": (1_000, 2, 16),
+    "medium": (30_000, 8, 64),
+    "large": (250_000, 16, 200),
+    "huge": (1_000_000, 32, 256),
+}
+
+ANIMATION_FRAMES = 2000
+""" every bone of the tier keyed on every frame """
+
+
+def model(tier: str, layout: str) -> SyntheticModel:
+    vertices, materials, bones = TIERS[tier]
+    index_format = VisIndexFormat._16 if vertices <= 0x10000 else VisIndexFormat._32
+
+    return SyntheticModel(vertices, layout=layout, index_format=index_format,
+                          material_count=materials, bone_count=bones)
+
+
+def read_materials(reader: BinaryReader) -> list[MtrsChunk]:
+    """ MTRS without the materials.xml lookup """
+
+    count = reader.read_uint32()
+
+    return [MtrsChunk(reader) for _ in range(count)]
+
+
+def read_toc(reader: BinaryReader) -> VisChunkToc:
+    VisBinHeader(reader)
+
+    return VisChunkToc(reader)
+
+
+def read_file(path: Path) -> None:
+    ModelFileReader(path).run()
+
+
+def cases(synthetic: SyntheticModel, path: Path) -> list[tuple[str, bytes | Path, Callable]]:
+    """ name, input, decode; bytes are decoded from a BinaryReader over them """
+
+    return [
+        ("BinaryReader", path, lambda path: BinaryReader(path).close()),
+        ("VisChunkToc", synthetic.to_bytes(), read_toc),
+        ("VisChunkFileReader", path, read_file),
+        ("VMshChunk", synthetic.vmsh(), lambda reader: VMshChunk(VisChunkId.VMSH, reader)),
+        ("MtrsChunk", synthetic.mtrs(), read_materials),
+        ("SkelChunk", synthetic.skel(), SkelChunk),
+        ("WghtChunk", synthetic.wght(), lambda reader: WghtChunk(reader).influences()),
+        ("AnimChunk", SyntheticAnimation(ANIMATION_FRAMES, synthetic.bone_count).skan(), AnimChunk),
+    ]
+
+
+def measure(source: bytes | Path, decode: Callable, repeat: int) -> list[float]:
+    times = []
+
+    for _ in range(repeat):
+        if isinstance(source, Path):
+            start = perf_counter()
+            decode(source)
+            times.append(perf_counter() - start)
+            continue
+
+        with BinaryReader(source) as reader:
+            start = perf_counter()
+            decode(reader)
+            times.append(perf_counter() - start)
+
+    return times
+
+
+def run(tiers: list[str], layout: str, repeat: int) -> list[dict]:
+    results = []
+
+    with TemporaryDirectory() as root:
+        for tier in tiers:
+            synthetic = model(tier, layout)
+            path = synthetic.write(Path(root) / ("%s.model" % tier))
+
+            for name, source, decode in cases(synthetic, path):
+                size = path.stat().st_size if isinstance(source, Path) else len(source)
+
+                result = {
+                    "tier": tier,
+                    "case": name,
+                    "layout": layout,
+                    "vertices": synthetic.vertex_count,
+                    "triangles": synthetic.triangle_count,
+                    "materials": synthetic.material_count,
+                    "bones": synthetic.bone_count,
+                    "bytes": size,
+                }
+
+                try:
+                    times = measure(source, decode, repeat)
+                except Exception as e:
+                    # one broken case must not hide the others
+                    result["error"] = "%s: %s" % (type(e).__name__, e)
+                else:
+                    best = min(times)
+
+                    result["best"] = best
+                    result["median"] = median(times)
+                    result["mb_per_s"] = size / best / 1e6 if best > 0 else None
+
+                results.append(result)
+
+    return results
+
+
+def print_table(results: list[dict]) -> None:
+    print("%-8s %-20s %10s %12s %12s %10s" % ("tier", "case", "vertices", "bytes", "best ms", "MB/s"))
+
+    for result in results:
+        if "error" in result:
+            print("%-8s %-20s %10d %12d %s" % (result["tier"], result["case"], result["vertices"],
+                                               result["bytes"], result["error"]))
+            continue
+
+        print("%-8s %-20s %10d %12d %12.3f %10.1f" % (result["tier"], result["case"], result["vertices"],
+                                                      result["bytes"], result["best"] * 1000,
+                                                      result["mb_per_s"] or 0))
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--tiers", nargs="+", choices=list(TIERS), default=["small", "medium", "large"])
+    parser.add_argument("--layout", choices=sorted(LAYOUTS), default="pos_normal_uv")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=None, help="json file, stdout when omitted")
+    parser.add_argument("--table", action="store_true", help="human readable table instead of json")
+    args = parser.parse_args()
+
+    results = run(args.tiers, args.layout, args.repeat)
+
+    if args.table:
+        print_table(results)
+        return
+
+    report = {
+        "python": python_version(),
+        "numpy": numpy.__version__,
+        "platform": platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+
+    if args.output is None:
+        dump(report, stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as file:
+            dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+""" Valid VBIN files with VMSH, MTRS, SUBM, SKEL and WGHT chunks of any size, and SKAN clips, for tests and benchmarks.
+
+    python -m benchmarks.synthetic_model out.model [--vertices N] [--layout full] [--index-format 32]
+"""
+
+from argparse import ArgumentParser
+from pathlib import Path
+from struct import pack
+
+from numpy import arange
+from numpy import dtype
+from numpy import float32
+from numpy import int16
+from numpy import ndarray
+from numpy import uint8
+from numpy import zeros
+from numpy.linalg import norm
+from numpy.random import default_rng
+
+from io_soulworker.chunks.vmsh_chunk import VMshChunk
+from io_soulworker.chunks.wght_chunk import INFLUENCE
+from io_soulworker.core.vis_chunk_id import VisChunkId
+from io_soulworker.core.vis_index_format import VisIndexFormat
+from io_soulworker.core.vis_prim_type import VisPrimitiveType
+from io_soulworker.core.vis_vertex_descriptor import VisVertexDescriptor
+from io_soulworker.core.vis_vertex_format import VisVertexFormat
+
+
+COMPONENTS = {
+    # name, format, size
+    "pos": ("<3f4", 12),
+    "normal": ("<3f4", 12),
+    "color": ("<4u1", 4),
+    "uv": ("<2f4", 8),
+    "uv2": ("<2f4", 8),
+    "pos_half": ("<4f2", 8),
+    "normal_byte": ("<4u1", 4),
+    "uv_short": ("<2i2", 4),
+}
+
+FORMATS = {
+    # stored in another format: descriptor slot, format bits
+    "pos_half": ("pos", VisVertexFormat.HALF4),
+    "normal_byte": ("normal", VisVertexFormat.BYTE4N),
+    "uv_short": ("uv", VisVertexFormat.SHORT2N),
+}
+
+LAYOUTS = {
+    "pos": ("pos",),
+    "pos_uv": ("pos", "uv"),
+    "pos_normal_uv": ("pos", "normal", "uv"),
+    "full": ("pos", "normal", "color", "uv", "uv2"),
+    "compact": ("pos_half", "normal_byte", "uv_short"),
+}
+
+ABSENT = 0xFFFF
+""" offset of a component that is not in the vertex """
+
+BIN_VERSION = 65536
+VMSH_VERSION = 5
+DESCRIPTOR_VERSION = 48
+MTRL_VERSION = 9
+WGHT_INFLUENCES = 4
+SUBM_VERSION = 2
+
+
+def chunk(cid: VisChunkId, payload: bytes) -> bytes:
+    """ depth, cid, length, payload, exit depth, exit cid """
+
+    return pack("<iII", 1, cid, len(payload)) + payload + pack("<iI", 1, cid)
+
+
+def string(value: str) -> bytes:
+    data = value.encode("cp949")
+
+    return pack("<I", len(data)) + data
+
+
+class SyntheticModel(object):
+    """ Deterministic model description; the same arguments always produce the same bytes """
+
+    vertex_count: int
+
+    triangle_count: int
+
+    layout: tuple[str, ...]
+    """ vertex components in buffer order, see COMPONENTS """
+
+    padding: int
+    """ unused bytes at the end of each vertex """
+
+    index_format: VisIndexFormat
+
+    material_count: int
+    """ MTRL chunks, each one owning a SUBM range """
+
+    bone_count: int
+    """ SKEL and WGHT are left out when 0 """
+
+    def __init__(self, vertex_count: int = 1024, triangle_count: int | None = None,
+                 layout: tuple[str, ...] | str = "pos_normal_uv", padding: int = 0,
+                 index_format: VisIndexFormat = VisIndexFormat._16, material_count: int = 1,
+                 bone_count: int = 0, seed: int = 0) -> None:
+
+        if index_format == VisIndexFormat._16 and vertex_count > 0x10000:
+            raise ValueError("%d vertices can't be addressed by 16 bit indices" % vertex_count)
+
+        self.vertex_count = vertex_count
+        self.triangle_count = 2 * vertex_count if triangle_count is None else triangle_count
+        self.layout = LAYOUTS[layout] if isinstance(layout, str) else tuple(layout)
+        self.padding = padding
+        self.index_format = index_format
+        self.material_count = max(material_count, 1)
+        self.bone_count = bone_count
+        self.seed = seed
+
+    def offsets(self) -> dict[str, int]:
+        offsets = {}
+        offset = 0
+
+        for name in self.layout:
+            offsets[name] = offset
+            offset += COMPONENTS[name][1]
+
+        return offsets
+
+    @property
+    def stride(self) -> int:
+        return sum(COMPONENTS[name][1] for name in self.layout) + self.padding
+
+    def vertex_dtype(self) -> dtype:
+        offsets = self.offsets()
+
+        return dtype({
+            "names": list(offsets),
+            "formats": [COMPONENTS[name][0] for name in offsets],
+            "offsets": list(offsets.values()),
+            "itemsize": self.stride,
+        })
+
+    def vertices(self) -> ndarray:
+        rng = default_rng(self.seed)
+        vertices = zeros(self.vertex_count, self.vertex_dtype())
+
+        for name in self.layout:
+            field = vertices[name]
+
+            if name in ("color", "normal_byte"):
+                field[:] = rng.integers(0, 256, field.shape, uint8)
+            elif name == "uv_short":
+                field[:] = rng.integers(-32767, 32768, field.shape, int16)
+            elif name == "normal":
+                normals = rng.standard_normal(field.shape).astype(float32)
+                field[:] = normals / ((normals ** 2).sum(axis=1, keepdims=True) ** 0.5 + 1e-6)
+            else:
+                field[:] = rng.random(field.shape, float32)
+
+        return vertices
+
+    def indices(self) -> ndarray:
+        rng = default_rng(self.seed + 1)
+        index_type = "<u2" if self.index_format == VisIndexFormat._16 else "<u4"
+
+        return rng.integers(0, max(self.vertex_count, 1), self.triangle_count * 3).astype(index_type)
+
+    def descriptor(self) -> bytes:
+        offsets = self.offsets()
+
+        def offset(name: str) -> int:
+            for component, value in offsets.items():
+                slot, format = FORMATS.get(component, (component, 0))
+
+                if slot == name:
+                    return value | format
+
+            return ABSENT
+
+        tex = [offset("uv"), offset("uv2")] + [ABSENT] * (VisVertexDescriptor.MAX_TEXTURES - 2)
+        channels = [i for i, value in enumerate(tex) if value != ABSENT]
+
+        data = pack("<IIHHHH16HH", VisVertexDescriptor.MAGICK, DESCRIPTOR_VERSION, self.stride,
+                    offset("pos"), offset("color"), offset("normal"), *tex, ABSENT)
+        data += pack("<BBI", channels[0] if channels else 0, channels[-1] if channels else 0, 0)
+
+        return data + pack("<I", 0)
+
+    def vmsh(self) -> bytes:
+        indices = self.indices()
+
+        header = pack("<IIII", VisChunkId.VMSH, 1, VMshChunk.MAGICK, VMSH_VERSION) + self.descriptor()
+        header += pack("<IBBBH", self.vertex_count, 0, 0, 0, 0)
+        header += pack("<IIIIBB", VisPrimitiveType.INDEXED_TRILIST, len(indices),
+                       self.index_format, self.triangle_count, 0, 0)
+        header += pack("<BBB", 0, 0, 0)
+        header += pack("<BBH", 0, 0, 0)
+        header += pack("<BB", 0, 1)
+        header += pack("<H", 0)
+
+        return header + self.vertices().tobytes() + indices.tobytes()
+
+    def mtrl(self, index: int) -> bytes:
+        name = "Material_%d" % index
+
+        data = pack("<H", MTRL_VERSION) + string(name)
+        data += pack("<IBIffBB", 0, 0, index % 15, 1, 16, 0, 0)
+        data += pack("<ffff", 0, 0, 0, 0.5)
+        data += string("%s_D.dds" % name) + string("%s_S.dds" % name) + string("%s_N.dds" % name)
+        data += pack("<I", 1) + string("%s_A.dds" % name)
+        data += string("") + pack("<I", 0)
+        data += pack("<4BI4B", 255, 255, 255, 255, 0, 255, 255, 255, 255)
+        data += pack("<ffI", 0, 0, 0)
+        data += b"".join(string("") for _ in range(6))
+
+        return data
+
+    def mtrs(self) -> bytes:
+        return pack("<I", self.material_count) \
+            + b"".join(chunk(VisChunkId.MTRL, self.mtrl(i)) for i in range(self.material_count))
+
+    def subm(self) -> bytes:
+        """ triangles split evenly between the materials """
+
+        bounds = (0, 0, 0, 1, 1, 1)
+        data = pack("<iiiI", -1, SUBM_VERSION, 0, self.material_count)
+
+        per_material = self.triangle_count // self.material_count
+
+        for i in range(self.material_count):
+            start = i * per_material * 3
+            count = (self.triangle_count * 3 - start) if i == self.material_count - 1 else per_material * 3
+
+            data += pack("<8i6f2i", start, count, 0, 0, 0, self.vertex_count, 0, 0, *bounds, i, 0)
+
+        return data
+
+    def skel(self) -> bytes:
+        data = pack("<HH", 0, self.bone_count)
+
+        for i in range(self.bone_count):
+            # a chain, every bone hangs off the previous one
+            parent = 0xFFFF if i == 0 else i - 1
+
+            data += string("Bone_%d" % i) + pack("<H", parent)
+            data += pack("<3f4f3f4f", 0, 0, 0, 0, 0, 0, 1, 0, 0.1, 0, 0, 0, 0, -1)
+
+        return data
+
+    def wght(self) -> bytes:
+        """ WGHT_INFLUENCES random bones per vertex, the last slot left empty """
+
+        rng = default_rng(self.seed + 2)
+        slots = zeros((self.vertex_count, WGHT_INFLUENCES), INFLUENCE)
+
+        slots["bone"] = rng.integers(0, self.bone_count, slots.shape)
+        slots["weight"][:, :-1] = rng.random((self.vertex_count, WGHT_INFLUENCES - 1), float32)
+
+        return pack("<HIH", 0, self.vertex_count, WGHT_INFLUENCES) + slots.tobytes()
+
+    def to_bytes(self) -> bytes:
+        data = b"VBIN" + pack("<I", BIN_VERSION)
+
+        data += chunk(VisChunkId.MTRS, self.mtrs())
+        data += chunk(VisChunkId.VMSH, self.vmsh())
+        data += chunk(VisChunkId.SUBM, self.subm())
+
+        if self.bone_count:
+            data += chunk(VisChunkId.SKEL, self.skel())
+            data += chunk(VisChunkId.WGHT, self.wght())
+
+        return data + pack("<i", -1)
+
+    def write(self, path: Path) -> Path:
+        path.write_bytes(self.to_bytes())
+
+        return path
+
+
+class SyntheticAnimation(object):
+    """ Clip for the bones of a SyntheticModel: every bone keyed on every frame """
+
+    def __init__(self, frame_count: int = 2000, bone_count: int = 150, fps: float = 30, seed: int = 0) -> None:
+        self.frame_count = frame_count
+        self.bone_count = bone_count
+        self.fps = fps
+        self.seed = seed
+
+    def skan(self) -> bytes:
+        rng = default_rng(self.seed)
+        times = (arange(self.frame_count) / self.fps).astype(float32)
+
+        data = pack("<H", 0) + string("Clip") + pack("<fH", self.frame_count / self.fps, self.bone_count)
+
+        for bone in range(self.bone_count):
+            positions = rng.standard_normal((self.frame_count, 3)).astype(float32)
+
+            rotations = rng.standard_normal((self.frame_count, 4)).astype(float32)
+            rotations /= norm(rotations, axis=1, keepdims=True)
+
+            data += pack("<HI", bone, self.frame_count) + times.tobytes() + positions.tobytes()
+            data += pack("<I", self.frame_count) + times.tobytes() + rotations.tobytes()
+
+        return data
+
+    def to_bytes(self) -> bytes:
+        return b"VBIN" + pack("<I", BIN_VERSION) + chunk(VisChunkId.SKAN, self.skan()) + pack("<i", -1)
+
+    def write(self, path: Path) -> Path:
+        path.write_bytes(self.to_bytes())
+
+        return path
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--vertices", type=int, default=1024)
+    parser.add_argument("--triangles", type=int, default=None)
+    parser.add_argument("--layout", choices=sorted(LAYOUTS), default="pos_normal_uv")
+    parser.add_argument("--padding", type=int, default=0)
+    parser.add_argument("--index-format", type=int, choices=[16, 32], default=16)
+    parser.add_argument("--materials", type=int, default=1)
+    parser.add_argument("--bones", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    model = SyntheticModel(args.vertices, args.triangles, args.layout, args.padding,
+                           VisIndexFormat(args.index_format), args.materials, args.bones, args.seed)
+    model.write(args.path)
+
+    print("%s: %d bytes" % (args.path, args.path.stat().st_size))
+
+
+if __name__ == "__main__":
+    main()
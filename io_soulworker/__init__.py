@@ -1,15 +1,27 @@
-import bpy
-
 from logging import basicConfig, debug
-from logging import DEBUG, INFO
+from logging import INFO
+from logging import getLevelName
+from os import environ
+
+try:
+    import bpy
+except ImportError:
+    # outside of blender (benchmarks, tooling) only the parsers are usable
+    bpy = None
+
+if bpy is not None:
+    from io_soulworker.out.object_panel_default_values import OutObjectPanelDefaultValues
+    from io_soulworker.out.object_panel_features import OutObjectPanelFeatures
+    from io_soulworker.out.file_runner import FileRunner
+    from io_soulworker.out.proxy_swap import ProxySwap
 
-from io_soulworker.out.object_panel_default_values import OutObjectPanelDefaultValues
-from io_soulworker.out.object_panel_features import OutObjectPanelFeatures
-from io_soulworker.out.file_runner import FileRunner
 
+# per field debug output dominated import time, it is opt-in now: IO_SOULWORKER_LOG=DEBUG
+LOG_LEVEL = environ.get("IO_SOULWORKER_LOG", "").upper()
 
 basicConfig(
-    level=DEBUG if __debug__ else INFO,
+    # an unknown name would keep the addon from loading
+    level=LOG_LEVEL if isinstance(getLevelName(LOG_LEVEL), int) else INFO,
     format="[%(filename)40s():%(lineno)4s() - %(funcName)20s() ] %(message)s"
 )
 
@@ -30,7 +42,8 @@ classes = {
     OutObjectPanelDefaultValues,
     OutObjectPanelFeatures,
     FileRunner,
-}
+    ProxySwap,
+} if bpy is not None else set()
 
 
 def menu_func_import(self, context):
@@ -40,14 +53,20 @@ def menu_func_import(self, context):
     )
 
 
+def menu_func_swap(self, context):
+    self.layout.operator(ProxySwap.bl_idname)
+
+
 def register():
     for cls in classes:
         bpy.utils.register_class(cls)
 
     bpy.types.TOPBAR_MT_file_import.append(menu_func_import)
+    bpy.types.VIEW3D_MT_object.append(menu_func_swap)
 
 
 def unregister():
+    bpy.types.VIEW3D_MT_object.remove(menu_func_swap)
     bpy.types.TOPBAR_MT_file_import.remove(menu_func_import)
 
     for cls in classes:
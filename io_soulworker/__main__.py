@@ -0,0 +1,123 @@
+""" Headless tools, usable without Blender.
+
+    python -m io_soulworker convert SOURCE [--output DIR] [--jobs N] [--pattern *.model]
+    python -m io_soulworker index ROOT [--db assets.sqlite] [--jobs N]
+    python -m io_soulworker find [--db assets.sqlite] [--texture NAME] [--bones MODEL] [--vertices N] [--indices N]
+"""
+
+from argparse import ArgumentParser
+from multiprocessing import cpu_count
+from multiprocessing import get_context
+from pathlib import Path
+from time import perf_counter
+
+from io_soulworker.out.asset_index import AssetIndex
+from io_soulworker.out.glb_writer import convert
+
+
+def targets(source: Path, output: Path | None, pattern: str) -> list[tuple[Path, Path]]:
+    """ (model, glb) pairs; the tree under source is mirrored under output, or converted in place """
+
+    if source.is_file():
+        root = output if output is not None else source.parent
+        return [(source, root / source.with_suffix(".glb").name)]
+
+    root = output if output is not None else source
+
+    return [(path, root / path.relative_to(source).with_suffix(".glb"))
+            for path in sorted(source.rglob(pattern))]
+
+
+def run_convert(args) -> int:
+    paths = targets(args.source, args.output, args.pattern)
+    if not paths:
+        print("nothing to convert under %s" % args.source)
+        return 1
+
+    failed = 0
+    total_in = 0
+    total_vertices = 0
+    start = perf_counter()
+
+    jobs = max(1, min(args.jobs, len(paths)))
+
+    with get_context("spawn").Pool(jobs) as pool:
+        for result in pool.imap_unordered(convert, paths, chunksize=4):
+            if "error" in result:
+                failed += 1
+                print("%s: failed, %s" % (result["source"], result["error"]))
+                continue
+
+            total_in += result["bytes_in"]
+            total_vertices += result["vertices"]
+
+            print("%s: %d bytes, %d vertices in %.1f ms (%.1f MB/s)" % (
+                result["target"], result["bytes_out"], result["vertices"], result["time"] * 1000,
+                result["bytes_in"] / result["time"] / 1e6 if result["time"] > 0 else 0))
+
+    elapsed = perf_counter() - start
+
+    print("%d files, %d failed, %d vertices, %.1f MB in %.2f s (%.1f files/s, %.1f MB/s) on %d processes" % (
+        len(paths), failed, total_vertices, total_in / 1e6, elapsed,
+        len(paths) / elapsed, total_in / elapsed / 1e6, jobs))
+
+    return 1 if failed else 0
+
+
+def run_index(args) -> int:
+    with AssetIndex(args.db) as index:
+        counts = index.update(args.root, args.pattern, args.jobs)
+
+    print("%(scanned)d files, %(parsed)d parsed, %(removed)d removed, %(failed)d failed" % counts)
+
+    return 0
+
+
+def run_find(args) -> int:
+    with AssetIndex(args.db) as index:
+        if args.texture:
+            print("\n".join(index.models_using_texture(args.texture)))
+
+        if args.bones:
+            print("\n".join(index.models_sharing_bones(args.bones)))
+
+        if args.vertices is not None or args.indices is not None:
+            for path, vertices, indices in index.models_over_budget(args.vertices, args.indices):
+                print("%s: %d vertices, %d indices" % (path, vertices, indices))
+
+    return 0
+
+
+def main() -> int:
+    parser = ArgumentParser(prog="python -m io_soulworker", description="SoulWorker asset tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("convert", help="convert .model files to .glb")
+    command.add_argument("source", type=Path, help=".model file or directory, searched recursively")
+    command.add_argument("--output", type=Path, default=None, help="output directory, next to the sources by default")
+    command.add_argument("--jobs", type=int, default=cpu_count() or 1)
+    command.add_argument("--pattern", default="*.model")
+    command.set_defaults(run=run_convert)
+
+    command = commands.add_parser("index", help="update the sqlite asset index of a data tree")
+    command.add_argument("root", type=Path)
+    command.add_argument("--db", type=Path, default=Path("assets.sqlite"))
+    command.add_argument("--jobs", type=int, default=cpu_count() or 1)
+    command.add_argument("--pattern", default="*.model")
+    command.set_defaults(run=run_index)
+
+    command = commands.add_parser("find", help="query the asset index")
+    command.add_argument("--db", type=Path, default=Path("assets.sqlite"))
+    command.add_argument("--texture", help="models using this texture file")
+    command.add_argument("--bones", type=Path, help="models sharing the bone set of this model")
+    command.add_argument("--vertices", type=int, help="models with more vertices")
+    command.add_argument("--indices", type=int, help="models with more indices")
+    command.set_defaults(run=run_find)
+
+    args = parser.parse_args()
+
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+from numpy import diff
+from numpy import isfinite
+from numpy import ndarray
+
+from io_soulworker.core.binary_reader import BinaryReader
+from io_soulworker.core.profiler import profiler
+from io_soulworker.core.utility import quaternion_conjugate
+from io_soulworker.core.utility import quaternion_continuous
+from io_soulworker.core.utility import quaternion_multiply
+from io_soulworker.core.utility import quaternion_rotate
+
+
+class VisBoneTrack(object):
+
+    def __init__(self, reader: BinaryReader) -> None:
+        self.bone = reader.read_uint16()
+        """ index in SkelChunk.bones """
+
+        count = reader.read_uint32()
+        self.position_times: ndarray = reader.read_float_array(count)
+        self.positions: ndarray = reader.read_float_vector3_array(count)
+        """ (count, 3), parent space like VisBone.local_pos """
+
+        count = reader.read_uint32()
+        self.rotation_times: ndarray = reader.read_float_array(count)
+        self.rotations: ndarray = reader.read_quaternion_array(count)
+        """ (count, 4) w, x, y, z, parent space like VisBone.local_rot """
+
+        for times, values in ((self.position_times, self.positions), (self.rotation_times, self.rotations)):
+            if not (isfinite(times).all() and isfinite(values).all() and (diff(times) >= 0).all()):
+                raise ValueError("keys of bone %d aren't finite and ordered, the SKAN layout doesn't match" % self.bone)
+
+    @property
+    def key_count(self) -> int:
+        return len(self.position_times) + len(self.rotation_times)
+
+    def to_pose(self, rest_rotation: ndarray, rest_position: ndarray, offset: ndarray) -> tuple[ndarray, ndarray]:
+        """ locations and rotations relative to the rest pose, in the frame of the bone built for it.
+
+        offset rotates the bone's file object space frame into the frame of the built bone;
+        a constant, so positions only depend on position keys and rotations on rotation keys.
+        """
+
+        # pose basis = offset^-1 @ rest^-1 @ key @ offset
+        inverse = quaternion_conjugate(quaternion_multiply(rest_rotation, offset))
+
+        locations = quaternion_rotate(inverse, self.positions - rest_position)
+        rotations = quaternion_multiply(quaternion_multiply(inverse, self.rotations), offset)
+
+        return locations, quaternion_continuous(rotations)
+
+
+class AnimChunk(object):
+    """ Skeletal animation clip, one track per animated bone.
+
+    Experimental: no reference for the layout is known and it hasn't been checked against
+    game files yet, this is a guess:
+        u16 version, string name, f32 length in seconds, u16 track count, then per track
+        u16 bone, u32 count, f32 times, 3f positions, u32 count, f32 times, 4f rotations (x, y, z, w)
+    Other versions, and keys that aren't finite and ordered, raise ValueError.
+    FileRunner doesn't offer .anim files until the layout is checked.
+    """
+
+    VERSION = 0
+
+    def __init__(self, reader: BinaryReader) -> None:
+        self.version = reader.read_uint16()
+
+        if self.version != self.VERSION:
+            raise ValueError("SKAN version %d isn't supported, animation import is experimental and only reads "
+                             "version %d" % (self.version, self.VERSION))
+
+        self.name = reader.read_utf8_uint32_string()
+        self.length = reader.read_float()
+        """ seconds """
+
+        count = reader.read_uint16()
+
+        with profiler.span("track decode", reader):
+            self.tracks = [VisBoneTrack(reader) for _ in range(count)]
+
+        profiler.count("track decode", sum(track.key_count for track in self.tracks))
@@ -66,12 +66,15 @@ class MtrsChunk:
             self.normal_map = reader.read_utf8_uint32_string()
             debug("normal path: %s", self.normal_map)
 
+            self.aux_filenames = []
+            """ auxiliary texture paths """
+
             if version >= 2:
                 count = reader.read_uint32()
                 debug("mtrschunk names count: %d",count)
-                aux_filenames = MtrsChunk.__names(count, reader)
+                self.aux_filenames = MtrsChunk.__names(count, reader)
 
-                for filename in aux_filenames:
+                for filename in self.aux_filenames:
                     debug("aux filename: %s", filename)
 
             self.user_data = reader.read_utf8_uint32_string()
@@ -116,7 +119,7 @@ class MtrsChunk:
             #    self.ui_mobile_shader_flags = reader.read_uint32()
 
     def __names(count: int, reader: BinaryReader):
-        return [reader.read_utf8_uint32_string(reader) for _ in range(count)]
+        return [reader.read_utf8_uint32_string() for _ in range(count)]
 
     def __mesh_config_effects(reader: BinaryReader) -> list[VisMaterialEffect]:
         count = reader.read_uint32()
@@ -1,27 +1,27 @@
 from io_soulworker.core.binary_reader import BinaryReader
-from mathutils import Matrix
-from mathutils import Quaternion
-import struct
-counter = 0
+
+
 class VisBone(object):
-    def __init__(self, reader: BinaryReader) -> None:
+
+    ROOT = 65535
+    """ parent_id of a bone without parent (-1) """
+
+    def __init__(self, id: int, reader: BinaryReader) -> None:
+        self.id = id
+        """ index in SkelChunk.bones, parent_id refers to it """
+
         self.name = reader.read_utf8_uint32_string()
-        global counter
-        self.id = counter
-        if counter == 0:
-            self.id = 65535 # -1
-        counter += 1
         self.parent_id = reader.read_uint16()
 
-        self.inverse_object_space_position = reader.read_float_vector3()
-        self.inverse_object_space_orientation = reader.read_quaternion()
-        self.local_pos = reader.read_float_vector3()
-        self.local_rot = reader.read_float_vector4()
-        quat_bytes_w = struct.unpack('<I', struct.pack('<f', self.local_rot[3]))
-        quat_bytes_w = quat_bytes_w[0] ^ 0x80000000
-        quatWFloat = struct.unpack('<f', struct.pack('<I', quat_bytes_w))
-        self.local_rot = Quaternion(((quatWFloat[0], self.local_rot[0], self.local_rot[1], self.local_rot[2])))
-        self.local_rot_euler = self.local_rot.to_euler("XYZ")
+        self.inverse_object_space_position = reader.read_float_tuple3()
+        self.inverse_object_space_orientation = reader.read_quaternion_tuple()
+        self.local_pos = reader.read_float_tuple3()
+
+        # stored x, y, z and a negated w
+        x, y, z, w = reader.read_float_tuple4()
+        self.local_rot = (-w, x, y, z)
+        """ w, x, y, z """
+
 
 class SkelChunk(object):
     VERSION = 0
@@ -29,7 +29,40 @@ class SkelChunk(object):
     def __init__(self, reader: BinaryReader) -> None:
         self.version = reader.read_uint16()
         assert self.version == self.VERSION
-        global counter
-        counter = 0
+
         count = reader.read_uint16()
-        self.bones = [VisBone(reader) for _ in range(count)]
\ No newline at end of file
+        self.bones = [VisBone(i, reader) for i in range(count)]
+
+    def parents(self) -> list[int]:
+        """ parent index of every bone, -1 for roots (and for ids pointing nowhere) """
+
+        count = len(self.bones)
+
+        return [bone.parent_id if bone.parent_id < count and bone.parent_id != i else -1
+                for i, bone in enumerate(self.bones)]
+
+    def order(self) -> list[int]:
+        """ every bone index once, parents before their children """
+
+        parents = self.parents()
+
+        children = [[] for _ in parents]
+        roots = []
+
+        for i, parent in enumerate(parents):
+            (roots if parent < 0 else children[parent]).append(i)
+
+        order = []
+        stack = roots[::-1]
+
+        while stack:
+            i = stack.pop()
+            order.append(i)
+            stack.extend(reversed(children[i]))
+
+        # bones in a parent cycle are never reached from a root
+        if len(order) < len(parents):
+            visited = set(order)
+            order += [i for i in range(len(parents)) if i not in visited]
+
+        return order
@@ -14,8 +14,8 @@ class VisVerticesMaterial:
         self.u10 = reader.read_int32()
         self.u11 = reader.read_int32()
 
-        self.bounding_box = reader.read_float_vector3()
-        self.bounding_box_max = reader.read_float_vector3()
+        self.bounding_box = reader.read_float_tuple3()
+        self.bounding_box_max = reader.read_float_tuple3()
 
         self.id = reader.read_int32()
 
@@ -35,7 +35,11 @@ class VisVerticesMaterial:
 
 class SubmChunk:
 
+    materials: list[VisVerticesMaterial]
+
     def __init__(self, reader: BinaryReader) -> None:
+        self.materials = []
+
         self.iSubMeshCount = reader.read_int32()
         if self.iSubMeshCount < 0:
             self.version = reader.read_int32()
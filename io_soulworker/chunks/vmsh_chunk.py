@@ -1,14 +1,35 @@
 from logging import debug
 
+from numpy import arange
+from numpy import frombuffer
+from numpy import ndarray
+from numpy import searchsorted
+from numpy import uint8
+from numpy import uint16
+from numpy import uint32
+from numpy import zeros
+
 from io_soulworker.core.binary_reader import BinaryReader
+from io_soulworker.core.binary_writer import BinaryWriter
+from io_soulworker.core.profiler import profiler
 from io_soulworker.core.utility import indices_to_face
+from io_soulworker.core.utility import strip_to_face
 from io_soulworker.core.vis_chunk_id import VisChunkId
 from io_soulworker.core.vis_index_format import VisIndexFormat
+from io_soulworker.core.vis_prim_type import VisPrimitiveType
+from io_soulworker.core.vis_vertex_decoder import VisVertexDecoder
 from io_soulworker.core.vis_vertex_descriptor import VisVertexDescriptor
 from io_soulworker.core.vis_render_state import VisRenderState
 from io_soulworker.core.vis_mesh_effect_config import VisMeshEffectConfig
 
 
+RESTART = {
+    VisIndexFormat._16: 0xFFFF,
+    VisIndexFormat._32: 0xFFFFFFFF,
+}
+""" primitive restart index of a strip """
+
+
 class VMshChunk(object):
 
     MAGICK = 0x4455ABCD
@@ -18,10 +39,19 @@ class VMshChunk(object):
     VERTEX_BIND_FLAGS = -1
     INDEX_BIND_FLAGS = -1
 
-    def __init__(self, id: VisChunkId, reader: BinaryReader) -> None:
+    vertex_buffer: ndarray | None = None
+    """ raw vertices (padding and unused components included), kept only when asked for """
 
-        cid = reader.read_cid()
-        assert cid == id
+    face_starts: ndarray | None = None
+    """ position in the index stream of every face of a strip, None for lists """
+
+    def __init__(self, id: VisChunkId, reader: BinaryReader, is_header_only: bool = False,
+                 is_keep_buffer: bool = False) -> None:
+        """ is_header_only: stop after the header, vertex and index buffers are left unread
+            is_keep_buffer: keep the raw vertex buffer, so write() reproduces the chunk byte for byte """
+
+        self.cid = reader.read_cid()
+        assert self.cid == id
 
         self.loader_version = reader.read_uint32()
         assert self.loader_version == 1
@@ -38,12 +68,12 @@ class VMshChunk(object):
         self.vertex_usage_flags = reader.read_uint8()
 
         if self.version >= 4:
-            iBindFlagVertices = reader.read_uint8()
+            self.vertex_bind_flags = reader.read_uint8()
 
         if self.version >= 3:
             self.bMeshDataIsBigEndian = reader.read_uint8()
 
-            _ = reader.read_uint16()
+            self.unused = reader.read_uint16()
             """ Unused """
 
         self.prim_type = reader.read_primitive_type()
@@ -53,7 +83,7 @@ class VMshChunk(object):
         self.mem_usage_flag_indices = reader.read_uint8()
 
         if (self.version >= 4):
-            iBindFlagIndices = reader.read_uint8()
+            self.index_bind_flags = reader.read_uint8()
 
         self.vertices_double_buffered = reader.read_uint8()
         self.indices_double_buffered = reader.read_uint8()
@@ -67,50 +97,171 @@ class VMshChunk(object):
 
         self.effect_config = VisMeshEffectConfig(reader)
 
-        indices_offset = reader.tell() + self.descriptor.stride * self.vertex_count
+        if is_header_only:
+            return
+
+        with profiler.span("vertex decode", reader):
+            self.__read_vertices(reader, is_keep_buffer)
+
+        with profiler.span("index decode", reader):
+            self.indices = self.__indices(reader)
+
+        profiler.count("vertex decode", self.vertex_count)
+        profiler.count("index decode", self.index_count)
+
+        self.faces = self.__faces()
+
+    def __faces(self) -> ndarray:
+        """ every primitive type as (faces, 3) triangles, (faces, 2) lines or (0, 3) for points """
+
+        match self.prim_type:
+            case VisPrimitiveType.INDEXED_TRILIST:
+                return indices_to_face(self.indices, 3)
+            case VisPrimitiveType.INDEXED_LINELIST:
+                return indices_to_face(self.indices, 2)
+            case VisPrimitiveType.INDEXED_TRISTRIP:
+                faces, self.face_starts = strip_to_face(self.indices, RESTART[self.index_format])
+                return faces
 
-        self.vertices = []
-        self.normals = []
-        self.uvs = []
+        # non-indexed primitives use the vertices in order
+        sequence = arange(self.vertex_count, dtype=uint32)
 
-        for _ in range(self.vertex_count):
-            t = reader.tell()
+        match self.prim_type:
+            case VisPrimitiveType.TRILIST:
+                return indices_to_face(sequence, 3)
+            case VisPrimitiveType.LINELIST:
+                return indices_to_face(sequence, 2)
+            case VisPrimitiveType.TRISTRIP:
+                faces, self.face_starts = strip_to_face(sequence)
+                return faces
 
-            if (self.descriptor.hasComponent(self.descriptor.pos_offset)):
-                offset = self.descriptor.offsetOf(self.descriptor.pos_offset)
-                reader.seek(t + offset)
+        return sequence[:0].reshape(0, 3)
 
-                pos = reader.read_float_vector3()
-                self.vertices.append([pos.x, pos.y, pos.z])
+    def face_range(self, indices_start: int, indices_count: int) -> tuple[int, int]:
+        """ first and end face built from a range of indices (of vertices, for non-indexed primitives) """
 
-            if (self.descriptor.hasComponent(self.descriptor.normal_offset)):
-                offset = self.descriptor.offsetOf(
-                    self.descriptor.normal_offset)
-                reader.seek(t + offset)
+        if self.face_starts is None:
+            vertices_per_face = max(self.faces.shape[1], 1)
 
-                normal = reader.read_float_vector3()
-                self.normals.append([normal.x, normal.y, normal.z])
+            return indices_start // vertices_per_face, (indices_start + indices_count) // vertices_per_face
 
-            if (self.descriptor.hasComponent(self.descriptor.tex_offset[0])):
-                offset = self.descriptor.offsetOf(
-                    self.descriptor.tex_offset[0])
-                reader.seek(t + offset)
+        # strip triangle k is made of positions k to k + 2
+        return (int(searchsorted(self.face_starts, indices_start)),
+                int(searchsorted(self.face_starts, indices_start + indices_count - 3, "right")))
 
-                texture = reader.read_float_vector3()
-                self.uvs.append([texture.x, -texture.y])
+    def set_triangles(self, vertices: ndarray, normals: ndarray, uvs: ndarray, faces: ndarray) -> None:
+        """ replace the decoded geometry with an indexed triangle list, e.g. a proxy built from it;
+            write() packs the vertices again """
 
-            reader.seek(t + self.descriptor.stride)
+        self.vertices, self.normals, self.uvs = vertices, normals, uvs
 
-        reader.seek(indices_offset)
+        self.vertex_count = len(vertices)
+        self.vertex_buffer = None
 
-        self.indices = list(self.__indices(reader))
+        self.prim_type = VisPrimitiveType.INDEXED_TRILIST
+        self.index_format = VisIndexFormat._16 if self.vertex_count <= 0x10000 else VisIndexFormat._32
 
-        vertices_per_face = self.index_count // self.current_prim_count
-        self.faces = list(indices_to_face(self.indices, vertices_per_face))
+        self.indices = faces.astype(uint16 if self.index_format == VisIndexFormat._16 else uint32).ravel()
+        self.index_count = len(self.indices)
+        self.current_prim_count = len(faces)
 
-    def __indices(self, reader: BinaryReader):
+        self.faces = indices_to_face(self.indices, 3)
+        self.face_starts = None
+
+    @property
+    def is_big_endian(self) -> bool:
+        """ vertex and index data byte order, little-endian before version 3 """
+
+        return bool(getattr(self, "bMeshDataIsBigEndian", 0))
+
+    def __read_vertices(self, reader: BinaryReader, is_keep_buffer: bool):
+        decoder = VisVertexDecoder.get(self.descriptor, self.is_big_endian)
+        layout = decoder.layout
+
+        buffer = reader.read_view(layout.itemsize * self.vertex_count)
+        vertices = frombuffer(buffer, layout, self.vertex_count)
+
+        if is_keep_buffer:
+            self.vertex_buffer = frombuffer(buffer, uint8).copy()
+
+        self.vertices = decoder.decode(vertices, "pos")
+        self.normals = decoder.decode(vertices, "normal")
+        self.uvs = decoder.decode(vertices, "uv")
+
+        # flip V for blender uv space
+        self.uvs[:, 1] *= -1
+
+    def __indices(self, reader: BinaryReader) -> ndarray:
         match self.index_format:
             case VisIndexFormat._16:
-                return reader.read_uint16_array(self.index_count)
+                indices = reader.read_uint16_array(self.index_count)
             case VisIndexFormat._32:
-                return reader.read_uint32_array(self.index_count)
+                indices = reader.read_uint32_array(self.index_count)
+            case _:
+                # non-indexed primitives come without an index buffer
+                assert self.index_count == 0
+                indices = zeros(0, uint32)
+
+        if self.is_big_endian:
+            indices.byteswap(inplace=True)
+
+        return indices
+
+    def write(self, writer: BinaryWriter) -> None:
+        """ payload as read; vertices come from vertex_buffer, or are packed from the decoded components """
+
+        writer.write_cid(self.cid)
+        writer.write_uint32(self.loader_version)
+        writer.write_uint32(self.MAGICK)
+        writer.write_uint32(self.version)
+
+        self.descriptor.write(writer)
+
+        writer.write_uint32(self.vertex_count)
+        writer.write_uint8(self.vertex_usage_flags)
+
+        if self.version >= 4:
+            writer.write_uint8(self.vertex_bind_flags)
+
+        if self.version >= 3:
+            writer.write_uint8(self.bMeshDataIsBigEndian)
+            writer.write_uint16(self.unused)
+
+        writer.write_uint32(self.prim_type)
+        writer.write_uint32(self.index_count)
+        writer.write_uint32(self.index_format)
+        writer.write_uint32(self.current_prim_count)
+        writer.write_uint8(self.mem_usage_flag_indices)
+
+        if self.version >= 4:
+            writer.write_uint8(self.index_bind_flags)
+
+        writer.write_uint8(self.vertices_double_buffered)
+        writer.write_uint8(self.indices_double_buffered)
+
+        if self.version >= 5:
+            writer.write_uint8(self.double_buffering_from_file)
+
+        self.render_state.write(writer)
+
+        writer.write_uint8(self.use_projection)
+        writer.write_uint8(self.texture_channels_count)
+
+        self.effect_config.write(writer)
+
+        writer.write_array(self.vertex_buffer if self.vertex_buffer is not None else self.__pack_vertices())
+        if self.is_big_endian:
+            # indices were swapped to native order when read, write_array would leave them little-endian
+            writer.write(self.indices.astype(self.indices.dtype.newbyteorder(">")).tobytes())
+        else:
+            writer.write_array(self.indices)
+
+    def __pack_vertices(self) -> ndarray:
+        decoder = VisVertexDecoder.get(self.descriptor, self.is_big_endian)
+        vertices = zeros(self.vertex_count, decoder.layout)
+
+        decoder.encode(vertices, "pos", self.vertices)
+        decoder.encode(vertices, "normal", self.normals)
+        decoder.encode(vertices, "uv", self.uvs * (1, -1))
+
+        return vertices
@@ -0,0 +1,110 @@
+from logging import error
+
+from numpy import append
+from numpy import arange
+from numpy import argpartition
+from numpy import ascontiguousarray
+from numpy import divide
+from numpy import dtype
+from numpy import flatnonzero
+from numpy import float32
+from numpy import frombuffer
+from numpy import int32
+from numpy import lexsort
+from numpy import ndarray
+from numpy import rint
+from numpy import take_along_axis
+from numpy import uint16
+from numpy import zeros_like
+
+from io_soulworker.core.binary_reader import BinaryReader
+from io_soulworker.core.profiler import profiler
+
+
+INFLUENCE = dtype([("bone", "<u2"), ("weight", "<f4")])
+""" one (bone, weight) slot, packed """
+
+WEIGHT_STEPS = 255
+""" weights are grouped at 8 bit precision, the resolution a GPU skins with """
+
+
+class WghtChunk(object):
+    """ Skin weights: a fixed number of (bone, weight) slots per vertex, unused slots weigh 0.
+
+    No reference for the layout is known and it hasn't been checked against game files yet,
+    this is a guess:
+        u16 version, u32 vertex count, u16 slots per vertex,
+        then vertex count * slots of (u16 bone index into SKEL, f32 weight)
+    Any other version raises ValueError; readers skip the chunk then, the mesh is imported unweighted.
+    """
+
+    VERSION = 0
+
+    def __init__(self, reader: BinaryReader) -> None:
+        self.version = reader.read_uint16()
+
+        if self.version != self.VERSION:
+            error("unknown WGHT version %d, expected %d", self.version, self.VERSION)
+            raise ValueError("unknown WGHT version %d" % self.version)
+
+        self.vertex_count = reader.read_uint32()
+        self.influence_count = reader.read_uint16()
+
+        size = self.vertex_count * self.influence_count * INFLUENCE.itemsize
+
+        with profiler.span("weight decode", reader, size):
+            slots = frombuffer(reader.read_view(size), INFLUENCE).reshape(self.vertex_count, self.influence_count)
+
+            self.bones = ascontiguousarray(slots["bone"], uint16)
+            """ (vertex_count, influence_count) """
+
+            self.weights = ascontiguousarray(slots["weight"], float32)
+            """ (vertex_count, influence_count) """
+
+        profiler.count("weight decode", self.vertex_count)
+
+    def influences(self, limit: int = 4, bone_count: int | None = None) -> tuple[ndarray, ndarray, ndarray]:
+        """ flat vertex, bone and weight arrays of the `limit` heaviest slots of every vertex,
+            normalized to sum 1; empty slots and bones past bone_count are dropped """
+
+        bones = self.bones
+        weights = self.weights.clip(0)
+
+        if bone_count is not None:
+            weights[bones >= bone_count] = 0
+
+        if self.influence_count > limit:
+            heaviest = argpartition(-weights, limit - 1, axis=1)[:, :limit]
+
+            bones = take_along_axis(bones, heaviest, 1)
+            weights = take_along_axis(weights, heaviest, 1)
+
+        totals = weights.sum(axis=1, keepdims=True)
+        weights = divide(weights, totals, out=zeros_like(weights), where=totals > 0)
+
+        vertices = arange(self.vertex_count, dtype=int32).repeat(bones.shape[1]).reshape(bones.shape)
+        is_used = weights > 0
+
+        return vertices[is_used], bones[is_used], weights[is_used]
+
+
+def weight_buckets(vertices: ndarray, bones: ndarray, weights: ndarray,
+                   steps: int = WEIGHT_STEPS) -> list[tuple[int, float, ndarray]]:
+    """ (bone, weight, vertices) per distinct quantized weight of a bone,
+        so a vertex group is filled with one add() per bucket instead of one per vertex """
+
+    levels = rint(weights * steps).astype(int32)
+    is_kept = levels > 0
+
+    vertices, bones, levels = vertices[is_kept], bones[is_kept], levels[is_kept]
+
+    order = lexsort((vertices, levels, bones))
+    vertices, bones, levels = vertices[order], bones[order], levels[order]
+
+    if not len(order):
+        return []
+
+    starts = flatnonzero(append(True, (bones[1:] != bones[:-1]) | (levels[1:] != levels[:-1])))
+    ends = append(starts[1:], len(order))
+
+    return [(int(bones[start]), float(levels[start]) / steps, vertices[start:end]) for start, end in zip(starts, ends)]
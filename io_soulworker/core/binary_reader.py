@@ -1,10 +1,14 @@
 from io import SEEK_CUR
-from io import BufferedReader
+from io import SEEK_END
+from io import SEEK_SET
+from mmap import ACCESS_READ
+from mmap import mmap
+from os import fstat
 from pathlib import Path
-from struct import unpack
+from struct import Struct
 
-from mathutils import Quaternion
-from mathutils import Vector
+from numpy import frombuffer
+from numpy import ndarray
 
 from io_soulworker.core.vis_chunk_id import VisChunkId
 from io_soulworker.core.vis_color import VisColor
@@ -17,26 +21,57 @@ from io_soulworker.core.vis_surface_flags import VisSurfaceFlags
 from io_soulworker.core.vis_vector_2_int import VisVector2Int
 
 
-class BinaryReader(BufferedReader):
+INT8 = Struct("<b")
+UINT8 = Struct("<B")
+INT16 = Struct("<h")
+UINT16 = Struct("<H")
+INT32 = Struct("<i")
+UINT32 = Struct("<I")
+FLOAT = Struct("<f")
+FLOAT2 = Struct("<2f")
+FLOAT3 = Struct("<3f")
+FLOAT4 = Struct("<4f")
+UINT8X2 = Struct("<2B")
+UINT8X4 = Struct("<4B")
+
+
+class BinaryReader(object):
+    """ Little-endian reader over a memory-mapped file or any bytes-like object.
+
+    Values are decoded in place with precompiled structs, the only state is an integer cursor.
+    """
+
+    # mathutils is only imported when called, so the parsers run without blender
     def read_float_vector4(self):
-        return Vector([self.read_float(), self.read_float(), self.read_float(), self.read_float()])
-    
+        from mathutils import Vector
+        return Vector(self.__unpack(FLOAT4))
+
     def read_float_vector3(self):
-        return Vector([self.read_float(), self.read_float(), self.read_float()])
+        from mathutils import Vector
+        return Vector(self.__unpack(FLOAT3))
 
     def read_float_vector2(self):
-        return Vector([self.read_float(), self.read_float()])
+        from mathutils import Vector
+        return Vector(self.__unpack(FLOAT2))
+
+    def read_quaternion(self):
+        from mathutils import Quaternion
+        return Quaternion(self.read_quaternion_tuple())
+
+    # plain tuples, for the parsers
+    def read_float_tuple4(self) -> tuple[float, float, float, float]: return self.__unpack(FLOAT4)
+    def read_float_tuple3(self) -> tuple[float, float, float]: return self.__unpack(FLOAT3)
+    def read_float_tuple2(self) -> tuple[float, float]: return self.__unpack(FLOAT2)
 
     def read_uint8_vector2(self):
-        return VisVector2Int(self.read_uint8(), self.read_uint8())
+        return VisVector2Int(*self.__unpack(UINT8X2))
 
-    def read_quaternion(self):
-        x = self.read_float()
-        y = self.read_float()
-        z = self.read_float()
-        w = self.read_float()
+    def read_quaternion_tuple(self) -> tuple[float, float, float, float]:
+        """ stored x, y, z, w; returned w, x, y, z like mathutils.Quaternion """
+
+        x, y, z, w = self.__unpack(FLOAT4)
 
-        return Quaternion([w, x, y, z])
+        return (w, x, y, z)
 
     def skip_utf8_uint32_string(self):
         length = self.read_uint32()
@@ -46,12 +81,11 @@ class BinaryReader(BufferedReader):
         length = self.read_uint32()
         if(length <= 0):
             return ""
-        value, = unpack("<%ds" % length, self.read(length))
 
-        return value.decode('cp949')
+        return str(self.read_view(length), 'cp949')
 
     def read_color(self) -> VisColor:
-        return VisColor(self.read_uint8(), self.read_uint8(), self.read_uint8(), self.read_uint8())
+        return VisColor(*self.__unpack(UINT8X4))
 
     def read_primitive_type(self) -> VisPrimitiveType:
         return VisPrimitiveType(self.read_uint32())
@@ -76,26 +110,120 @@ class BinaryReader(BufferedReader):
 
         return self.read_uint32()
 
-    def read_float(self) -> float: return float(unpack("<f", self.read(4))[0])
+    def read_float(self) -> float: return self.__unpack(FLOAT)[0]
+
+    def read_int8(self) -> int: return self.__unpack(INT8)[0]
+    def read_uint8(self) -> int: return self.__unpack(UINT8)[0]
+
+    def read_int16(self) -> int: return self.__unpack(INT16)[0]
+    def read_uint16(self) -> int: return self.__unpack(UINT16)[0]
+
+    def read_uint16_array(self, count: int) -> ndarray:
+        return frombuffer(self.read_view(count * 2), "<u2").copy()
+
+    def read_uint32_array(self, count: int) -> ndarray:
+        return frombuffer(self.read_view(count * 4), "<u4").copy()
+
+    def read_float_array(self, count: int) -> ndarray:
+        return frombuffer(self.read_view(count * 4), "<f4").copy()
+
+    def read_float_vector3_array(self, count: int) -> ndarray:
+        """ (count, 3) """
+
+        return frombuffer(self.read_view(count * 12), "<f4").reshape(count, 3).copy()
+
+    def read_quaternion_array(self, count: int) -> ndarray:
+        """ (count, 4) of read_quaternion_tuple: stored x, y, z, w; returned w, x, y, z """
+
+        return frombuffer(self.read_view(count * 16), "<f4").reshape(count, 4)[:, [3, 0, 1, 2]]
+
+    def read_int32(self) -> int: return self.__unpack(INT32)[0]
+    def read_uint32(self) -> int: return self.__unpack(UINT32)[0]
+
+    def read_view(self, size: int) -> memoryview:
+        """ Zero-copy view of the next `size` bytes """
+
+        start = self.__pos
+        end = start + size
+
+        if end > len(self.__view):
+            raise EOFError("read %d bytes at %d, only %d available" %
+                           (size, start, len(self.__view) - start))
+
+        self.__pos = end
+
+        return self.__view[start:end]
+
+    def read(self, size: int = -1) -> bytes:
+        start = self.__pos
+        end = len(self.__view) if size < 0 else min(start + size, len(self.__view))
+
+        self.__pos = max(start, end)
+
+        return self.__view[start:end].tobytes()
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        if whence == SEEK_SET:
+            self.__pos = offset
+        elif whence == SEEK_CUR:
+            self.__pos += offset
+        elif whence == SEEK_END:
+            self.__pos = len(self.__view) + offset
+
+        return self.__pos
+
+    def tell(self) -> int:
+        return self.__pos
+
+    def __unpack(self, value: Struct):
+        result = value.unpack_from(self.__view, self.__pos)
+        self.__pos += value.size
+
+        return result
+
+    @property
+    def closed(self) -> bool:
+        return self.__view is None
+
+    def close(self) -> None:
+        if self.closed:
+            return
+
+        view, self.__view = self.__view, None
+
+        try:
+            view.release()
+
+            if self.__mmap is not None:
+                self.__mmap.close()
+        except BufferError:
+            # a decoded array still borrows the mapping, it is unmapped once collected
+            pass
+
+    def __enter__(self):
+        return self
 
-    def read_int8(self) -> int: return int(unpack("<b", self.read(1))[0])
-    def read_uint8(self) -> int: return int(unpack("<B", self.read(1))[0])
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
 
-    def read_int16(self) -> int: return int(unpack("<h", self.read(2))[0])
-    def read_uint16(self) -> int: return int(unpack("<H", self.read(2))[0])
+    def __init__(self, source: Path | str | bytes | bytearray | memoryview, name: str = "") -> None:
+        self.__pos = 0
+        self.__mmap = None
 
-    def read_uint16_array(self, count: int):
-        for _ in range(count):
-            yield self.read_uint16()
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self.name = name
+            self.__view = memoryview(source).cast("B")
+            return
 
-    def read_uint32_array(self, count: int):
-        for _ in range(count):
-            yield self.read_uint32()
+        self.name = str(source)
 
-    def read_int32(self) -> int: return int(unpack("<i", self.read(4))[0])
-    def read_uint32(self) -> int: return int(unpack("<I", self.read(4))[0])
+        with open(source, "rb") as file:
+            # empty files can't be mapped
+            if fstat(file.fileno()).st_size == 0:
+                self.__view = memoryview(b"")
+                return
 
-    def __init__(self, path: Path) -> None:
-        super().__init__(open(path, "rb"))
+            self.__mmap = mmap(file.fileno(), 0, access=ACCESS_READ)
+            self.__view = memoryview(self.__mmap)
 
 # https://youtu.be/K741PecDK3c
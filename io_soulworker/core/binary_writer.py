@@ -0,0 +1,102 @@
+from io import SEEK_SET
+from pathlib import Path
+from typing import BinaryIO
+
+from numpy import ascontiguousarray
+from numpy import ndarray
+from numpy import uint8
+
+from io_soulworker.core.binary_reader import FLOAT
+from io_soulworker.core.binary_reader import FLOAT3
+from io_soulworker.core.binary_reader import FLOAT4
+from io_soulworker.core.binary_reader import INT8
+from io_soulworker.core.binary_reader import INT16
+from io_soulworker.core.binary_reader import INT32
+from io_soulworker.core.binary_reader import UINT8
+from io_soulworker.core.binary_reader import UINT8X4
+from io_soulworker.core.binary_reader import UINT16
+from io_soulworker.core.binary_reader import UINT32
+from io_soulworker.core.vis_color import VisColor
+
+
+class BinaryWriter(object):
+    """ Little-endian counterpart of BinaryReader over a seekable binary stream.
+
+    Fields are packed with the reader's precompiled structs, arrays are written through
+    the buffer protocol without a per-element Python step.
+    """
+
+    def __init__(self, target: Path | str | BinaryIO) -> None:
+        if isinstance(target, (Path, str)):
+            self.name = str(target)
+            self.__file = open(target, "wb")
+            self.__is_owner = True
+        else:
+            self.name = getattr(target, "name", "")
+            self.__file = target
+            self.__is_owner = False
+
+    def write(self, data) -> int:
+        return self.__file.write(data)
+
+    def write_array(self, value: ndarray) -> int:
+        """ raw array bytes, converted to little-endian C order when they aren't """
+
+        dtype = value.dtype.newbyteorder("<") if value.dtype.byteorder == ">" else value.dtype
+
+        return self.__file.write(ascontiguousarray(value, dtype).reshape(-1).view(uint8))
+
+    def write_int8(self, value: int): self.__file.write(INT8.pack(value))
+    def write_uint8(self, value: int): self.__file.write(UINT8.pack(value))
+
+    def write_int16(self, value: int): self.__file.write(INT16.pack(value))
+    def write_uint16(self, value: int): self.__file.write(UINT16.pack(value))
+
+    def write_int32(self, value: int): self.__file.write(INT32.pack(value))
+    def write_uint32(self, value: int): self.__file.write(UINT32.pack(value))
+
+    def write_float(self, value: float): self.__file.write(FLOAT.pack(value))
+
+    def write_float_vector3(self, value): self.__file.write(FLOAT3.pack(*value))
+    def write_float_vector4(self, value): self.__file.write(FLOAT4.pack(*value))
+
+    def write_cid(self, value: int):
+        """ Chunk Id """
+
+        self.write_uint32(value)
+
+    def write_color(self, value: VisColor):
+        self.__file.write(UINT8X4.pack(value.r, value.g, value.b, value.a))
+
+    def write_utf8_uint32_string(self, value: str):
+        data = value.encode("cp949")
+
+        self.write_uint32(len(data))
+        self.__file.write(data)
+
+    def patch_uint32(self, offset: int, value: int):
+        """ overwrite a field written earlier, the cursor is left where it was """
+
+        position = self.__file.tell()
+
+        self.__file.seek(offset, SEEK_SET)
+        self.write_uint32(value)
+        self.__file.seek(position, SEEK_SET)
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        return self.__file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self.__file.tell()
+
+    def close(self) -> None:
+        if self.__is_owner:
+            self.__file.close()
+        else:
+            self.__file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,121 @@
+from numpy import arange
+from numpy import array
+from numpy import cross
+from numpy import float32
+from numpy import isfinite
+from numpy import ndarray
+from numpy import repeat
+from numpy import sqrt
+from numpy import uint32
+from numpy import unique
+
+from io_soulworker.core.mesh_weld import MeshWeld
+from io_soulworker.core.profiler import profiler
+
+
+BOX_QUADS = array([
+    [0, 4, 6, 2],
+    [1, 3, 7, 5],
+    [0, 1, 5, 4],
+    [2, 6, 7, 3],
+    [0, 2, 3, 1],
+    [4, 5, 7, 6],
+])
+""" corners of every side of a box, counter-clockwise seen from outside; corner bits are x, y, z """
+
+BOX_NORMALS = array([
+    [-1, 0, 0],
+    [1, 0, 0],
+    [0, -1, 0],
+    [0, 1, 0],
+    [0, 0, -1],
+    [0, 0, 1],
+], float32)
+
+BOX_FACE_COUNT = 2 * len(BOX_QUADS)
+
+
+class MeshProxy(object):
+    """ Decimated stand-in of a triangle mesh by vertex clustering, on arrays only.
+
+    Positions are merged per cell of a grid (a MeshWeld with the cell as distance), each cell
+    keeps its first vertex. The cell is first estimated from the surface area so about `ratio`
+    of the faces are left, then scaled by the face count it gave, for at most PASSES welds.
+    """
+
+    PASSES = 3
+
+    TOLERANCE = 0.25
+    """ relative distance to the target face count that ends the passes """
+
+    def __init__(self, vertices: ndarray, faces: ndarray, ratio: float) -> None:
+        with profiler.span("proxy build"):
+            target = max(ratio * len(faces), 1)
+
+            corners = vertices[faces]
+            normals = cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+            area = sqrt((normals ** 2).sum(axis=1)).sum() / 2
+
+            # a clustered surface is left with about two triangles per occupied cell
+            self.cell = float(sqrt(2 * area / target))
+            """ grid cell size of the kept pass """
+
+            weld = None
+            cell = self.cell
+
+            for _ in range(self.PASSES):
+                candidate = MeshWeld(vertices, faces, cell)
+
+                if weld is None or abs(len(candidate.faces) - target) < abs(len(weld.faces) - target):
+                    weld, self.cell = candidate, cell
+
+                if abs(len(candidate.faces) - target) <= self.TOLERANCE * target:
+                    break
+
+                # too coarse collapses everything, shrink by half at most per pass then
+                cell *= float(sqrt(max(len(candidate.faces), target / 4) / target))
+
+            # cells only used by collapsed faces are dropped
+            used, inverse = unique(weld.faces.ravel(), return_inverse=True)
+
+            self.first: ndarray = weld.first[used]
+            """ decoded vertex of every proxy vertex """
+
+            self.faces: ndarray = inverse.reshape(-1, 3).astype(uint32)
+            """ faces over the proxy vertices """
+
+            self.kept: ndarray = weld.kept
+            """ decoded face index of every face left, in file order """
+
+        self.counts = {
+            "vertices": (len(vertices), len(self.first)),
+            "faces": (len(faces), len(self.faces)),
+        }
+
+        profiler.count("proxy build", len(faces))
+
+
+def is_valid_bounds(minimum, maximum) -> bool:
+    """ finite and not inverted; files store zeros or garbage when bounds were never computed """
+
+    minimum, maximum = array(minimum, float32), array(maximum, float32)
+
+    return bool(isfinite(minimum).all() and isfinite(maximum).all() and (minimum <= maximum).all()
+                and (minimum < maximum).any())
+
+
+def box_proxy(minimum, maximum) -> tuple[ndarray, ndarray, ndarray]:
+    """ vertices, normals and faces of an axis aligned box; 4 vertices per side so every side keeps its normal """
+
+    bits = array([[i & 1, i >> 1 & 1, i >> 2 & 1] for i in range(8)], float32)
+
+    minimum = array(minimum, float32)
+    corners = minimum + bits * (array(maximum, float32) - minimum)
+
+    vertices = corners[BOX_QUADS.ravel()]
+    normals = repeat(BOX_NORMALS, 4, axis=0)
+
+    quads = arange(BOX_QUADS.size, dtype=uint32).reshape(BOX_QUADS.shape)
+    faces = quads[:, [0, 1, 2, 0, 2, 3]].reshape(-1, 3)
+
+    return vertices, normals, faces
@@ -0,0 +1,84 @@
+from numpy import arange
+from numpy import argmin
+from numpy import cumsum
+from numpy import diff
+from numpy import empty
+from numpy import int64
+from numpy import intp
+from numpy import lexsort
+from numpy import ndarray
+from numpy import ones
+from numpy import rint
+from numpy import sort
+from numpy import take_along_axis
+
+from io_soulworker.core.profiler import profiler
+
+
+class MeshWeld(object):
+    """ Vertices split at UV and normal seams merged back, on arrays only.
+
+    Positions are snapped to a grid of `distance` and sorted, so coincident
+    positions share one vertex; two positions closer than `distance` but on either side of a
+    grid line stay apart. Faces are remapped, then degenerate faces (a vertex used twice) and
+    duplicate faces (same vertices, same winding) are dropped.
+    """
+
+    def __init__(self, vertices: ndarray, faces: ndarray, distance: float = 1e-5) -> None:
+        with profiler.span("weld"):
+            if distance > 0:
+                grid = rint(vertices / distance).astype(int64)
+            else:
+                grid = vertices
+
+            self.first, self.remap = MeshWeld.unique_rows(grid)
+            """ decoded vertex kept for every welded vertex, and welded vertex of every decoded vertex """
+
+            self.vertices: ndarray = vertices[self.first]
+
+            welded = self.remap[faces]
+
+            # sorted corners of a face with a vertex used twice have a zero step
+            is_degenerate = (diff(sort(welded, axis=1), axis=1) == 0).any(axis=1)
+
+            # the same cycle starts at its lowest vertex whatever corner the file starts at
+            count = faces.shape[1]
+            start = argmin(welded, axis=1)
+            cycles = take_along_axis(welded, (start[:, None] + arange(count)) % count, 1)
+
+            candidates = (~is_degenerate).nonzero()[0]
+            unique_faces, _ = MeshWeld.unique_rows(cycles[candidates])
+
+            self.kept: ndarray = candidates[sort(unique_faces)]
+            """ decoded face index of every face left, in file order """
+
+            self.faces: ndarray = welded[self.kept]
+            """ faces over the welded vertices """
+
+            self.corners: ndarray = faces[self.kept]
+            """ decoded vertex of every corner, to pick per loop uvs and normals """
+
+        self.counts = {
+            "vertices": (len(vertices), len(self.vertices)),
+            "faces": (len(faces), len(self.faces)),
+            "degenerate": int(is_degenerate.sum()),
+            "duplicate": len(candidates) - len(unique_faces),
+        }
+
+        profiler.count("weld", len(faces))
+
+    def unique_rows(values: ndarray) -> tuple[ndarray, ndarray]:
+        """ first row of every distinct value and the distinct value of every row;
+            numpy.unique(axis=0) without its structured dtype detour """
+
+        # lexsort is stable, the first row of a run is the first occurrence
+        order = lexsort(values.T[::-1])
+        ordered = values[order]
+
+        is_first = ones(len(values), bool)
+        is_first[1:] = (diff(ordered, axis=0) != 0).any(axis=1)
+
+        inverse = empty(len(values), intp)
+        inverse[order] = cumsum(is_first) - 1
+
+        return order[is_first], inverse
@@ -0,0 +1,198 @@
+from json import dump
+from logging import info
+from os import environ
+from pathlib import Path
+from time import perf_counter
+
+from io_soulworker.core.binary_reader import BinaryReader
+
+
+PROFILE_ENV = "IO_SOULWORKER_PROFILE"
+""" 1 prints the report to the console, a *.json path writes it there """
+
+
+class ProfileStats(object):
+
+    __slots__ = ("time", "calls", "bytes", "count")
+
+    def __init__(self) -> None:
+        self.time = 0.0
+        self.calls = 0
+        self.bytes = 0
+        self.count = 0
+
+    def to_dict(self) -> dict:
+        return {"time": self.time, "calls": self.calls, "bytes": self.bytes, "count": self.count}
+
+    def merge(self, values: dict) -> None:
+        self.time += values["time"]
+        self.calls += values["calls"]
+        self.bytes += values["bytes"]
+        self.count += values["count"]
+
+
+class ProfileSpan(object):
+    """ Times one stage; bytes are the reader cursor delta, or size when given """
+
+    __slots__ = ("stats", "reader", "size", "start", "offset")
+
+    def __init__(self, stats: ProfileStats, reader: BinaryReader | None, size: int) -> None:
+        self.stats = stats
+        self.reader = reader
+        self.size = size
+
+    def __enter__(self):
+        if self.reader is not None:
+            self.offset = self.reader.tell()
+
+        self.start = perf_counter()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        stats = self.stats
+
+        stats.time += perf_counter() - self.start
+        stats.calls += 1
+
+        if self.reader is not None:
+            stats.bytes += self.reader.tell() - self.offset
+        else:
+            stats.bytes += self.size
+
+
+class NullSpan(object):
+    """ Handed out while profiling is disabled """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class ProfileFile(object):
+    """ Attributes the spans inside it to one file """
+
+    __slots__ = ("profiler", "key", "previous")
+
+    def __init__(self, profiler: "Profiler", key: str) -> None:
+        self.profiler = profiler
+        self.key = key
+
+    def __enter__(self):
+        self.previous = self.profiler.current
+        self.profiler.current = self.key
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.profiler.current = self.previous
+
+
+class Profiler(object):
+    """ Named stage timings, bytes read and object counts per file.
+
+    Disabled, span() and file() return a shared no-op context and count() returns at once.
+    """
+
+    is_enabled: bool
+
+    current: str
+    """ file the spans are attributed to """
+
+    files: dict[str, dict[str, ProfileStats]]
+
+    def __init__(self, is_enabled: bool = False) -> None:
+        self.is_enabled = is_enabled
+        self.current = ""
+        self.files = {}
+
+    def enable(self, is_enabled: bool = True) -> None:
+        self.is_enabled = is_enabled
+
+    def file(self, path: Path):
+        if not self.is_enabled:
+            return NULL_SPAN
+
+        return ProfileFile(self, str(path))
+
+    def span(self, name: str, reader: BinaryReader | None = None, size: int = 0):
+        if not self.is_enabled:
+            return NULL_SPAN
+
+        return ProfileSpan(self.__stats(name), reader, size)
+
+    def count(self, name: str, value: int) -> None:
+        if not self.is_enabled:
+            return
+
+        self.__stats(name).count += value
+
+    def __stats(self, name: str) -> ProfileStats:
+        spans = self.files.setdefault(self.current, {})
+
+        stats = spans.get(name)
+        if stats is None:
+            stats = spans[name] = ProfileStats()
+
+        return stats
+
+    def pop(self, path: Path) -> dict | None:
+        """ plain values of one file, removed from this profiler (worker -> importer) """
+
+        spans = self.files.pop(str(path), None)
+        if spans is None:
+            return None
+
+        return {name: stats.to_dict() for name, stats in spans.items()}
+
+    def merge(self, path: Path, values: dict | None) -> None:
+        if not values:
+            return
+
+        spans = self.files.setdefault(str(path), {})
+
+        for name, stats in values.items():
+            spans.setdefault(name, ProfileStats()).merge(stats)
+
+    def report(self) -> dict:
+        return {key: {name: stats.to_dict() for name, stats in spans.items()}
+                for key, spans in self.files.items()}
+
+    def dump(self, path: Path | None = None) -> None:
+        """ json to path, console otherwise """
+
+        if path is not None:
+            with open(path, "w") as file:
+                dump(self.report(), file, indent=2)
+
+            info("profile written: %s", path)
+            return
+
+        for key, spans in self.files.items():
+            info("profile: %s", key or "<batch>")
+
+            for name, stats in spans.items():
+                info("  %-16s %10.3f ms %6d calls %12d bytes %10d count",
+                     name, stats.time * 1000, stats.calls, stats.bytes, stats.count)
+
+    def clear(self) -> None:
+        self.files.clear()
+
+
+def report_path() -> Path | None:
+    """ json target from the environment, None for the console """
+
+    value = environ.get(PROFILE_ENV, "")
+
+    return Path(value) if value.lower().endswith(".json") else None
+
+
+profiler = Profiler(environ.get(PROFILE_ENV, "") not in ("", "0"))
+""" shared by every reader and importer in this process """
@@ -1,5 +1,92 @@
-def indices_to_face(indices: list[int], vertices_per_face=3):
-    for offset in range(0, len(indices), vertices_per_face):
-        yield indices[offset: offset + vertices_per_face]
+from numpy import arange
+from numpy import concatenate
+from numpy import cross
+from numpy import cumprod
+from numpy import maximum
+from numpy import ndarray
+from numpy import ones
+from numpy import stack
+from numpy import where
+
+
+def indices_to_face(indices: ndarray, vertices_per_face=3) -> ndarray:
+    """ View of the index buffer as (faces, vertices_per_face); a trailing partial face is dropped """
+
+    count = len(indices) // vertices_per_face
+
+    return indices[:count * vertices_per_face].reshape(count, vertices_per_face)
+
+
+def strip_to_face(indices: ndarray, restart: int | None = None) -> tuple[ndarray, ndarray]:
+    """ Triangle strip unrolled to (faces, 3) and the strip position of every face.
+
+    Every other triangle is flipped so all keep the strip's winding; the flip restarts after a
+    `restart` index. Degenerate triangles (strip joins, restarts) are dropped.
+    """
+
+    count = len(indices) - 2
+
+    if count <= 0:
+        return indices[:0].reshape(0, 3), arange(0)
+
+    positions = arange(count)
+    first, second, third = indices[:-2], indices[1:-1], indices[2:]
+
+    if restart is not None:
+        is_restart = indices == restart
+
+        # strip position right after the last restart, triangles count from there
+        segment = maximum.accumulate(where(is_restart, arange(len(indices)) + 1, 0))[:-2]
+        is_odd = (positions - segment) & 1 == 1
+    else:
+        is_odd = positions & 1 == 1
+
+    faces = stack((where(is_odd, second, first), where(is_odd, first, second), third), axis=1)
+
+    is_kept = (first != second) & (second != third) & (first != third)
+
+    if restart is not None:
+        is_kept &= ~(is_restart[:-2] | is_restart[1:-1] | is_restart[2:])
+
+    return faces[is_kept], positions[is_kept]
+
+
+# quaternions are (..., 4) arrays of w, x, y, z like mathutils.Quaternion
+
+def quaternion_multiply(a: ndarray, b: ndarray) -> ndarray:
+    aw, ax, ay, az = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+    bw, bx, by, bz = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
+
+    return stack((
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ), axis=-1)
+
+
+def quaternion_conjugate(q: ndarray) -> ndarray:
+    return q * (1, -1, -1, -1)
+
+
+def quaternion_rotate(q: ndarray, v: ndarray) -> ndarray:
+    """ v (..., 3) rotated by the unit quaternion q """
+
+    w, axis = q[..., :1], q[..., 1:]
+    t = 2 * cross(axis, v)
+
+    return v + w * t + cross(axis, t)
+
+
+def quaternion_continuous(q: ndarray) -> ndarray:
+    """ keys flipped onto the hemisphere of their predecessor, so interpolation takes the short way """
+
+    if len(q) < 2:
+        return q
+
+    is_flipped = (q[1:] * q[:-1]).sum(axis=1) < 0
+    signs = cumprod(concatenate((ones(1), where(is_flipped, -1.0, 1.0))))
+
+    return q * signs[:, None]
 
 # https://youtu.be/2N4tXf3Ensw
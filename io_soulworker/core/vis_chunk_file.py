@@ -1,28 +1,104 @@
 from logging import debug
 from pathlib import Path
+from struct import error as StructError
+from typing import Any
+from typing import Callable
 
 from io_soulworker.core.binary_reader import BinaryReader
 from io_soulworker.core.vis_bin_header import VisBinHeader
 from io_soulworker.core.vis_chunk_id import VisChunkId
-from io_soulworker.core.vis_chunk_scope import VisChunkScope
+from io_soulworker.core.vis_chunk_id import chunk_name
+from io_soulworker.core.vis_chunk_toc import VisChunkToc
+from io_soulworker.core.profiler import profiler
+
+
+def is_chunk_end(reader: BinaryReader, cid: VisChunkId) -> bool:
+    """ whether a payload was read exactly: the chunk trailer (depth, id) follows; the cursor is kept """
+
+    position = reader.tell()
+
+    try:
+        reader.read_int32()
+        return reader.read_uint32() == cid
+    except (EOFError, StructError):
+        return False
+    finally:
+        reader.seek(position)
 
 
 class VisChunkFileReader(object):
 
+    handlers: dict[VisChunkId, Callable[[BinaryReader], None]] = {}
+    """ chunk handlers by chunk id; chunks without a handler are never entered """
+
     def __init__(self, path: Path) -> None:
         self.path = path
 
-    def on_chunk_start(self, chunk: VisChunkId, _: BinaryReader) -> None:
-        raise NotImplementedError("chunk: %d" % chunk)
+    def on_chunk_start(self, chunk: VisChunkId, reader: BinaryReader) -> None:
+        handler = self.handlers.get(chunk)
+
+        if handler is not None:
+            handler(reader)
 
     def run(self) -> None:
-        with BinaryReader(self.path) as reader:
-            header = VisBinHeader(reader)
+        with profiler.file(self.path), BinaryReader(self.path) as reader:
+            with profiler.span("header", reader):
+                header = VisBinHeader(reader)
+                toc = VisChunkToc(reader)
+
             debug("[VisChunkFile] version: %d", header.version)
 
-            while True:
-                with VisChunkScope(reader) as scope:
-                    self.on_chunk_start(scope.cid, reader)
+            for entry in toc:
+                reader.seek(entry.offset)
+
+                with profiler.span(chunk_name(entry.cid), size=entry.length):
+                    self.on_chunk_start(entry.cid, reader)
+
+
+class VisChunkFile(object):
+    """ Random access to the chunks of a file, each decoded on first access """
+
+    decoders: dict[VisChunkId, Callable[[BinaryReader], Any]] = {}
+    """ chunk decoders by chunk id """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.reader = BinaryReader(path)
+
+        try:
+            with profiler.file(path), profiler.span("header", self.reader):
+                self.header = VisBinHeader(self.reader)
+                self.toc = VisChunkToc(self.reader)
+        except Exception:
+            # the caller never gets an object to close, a corrupt table of contents would leak the mapping
+            self.reader.close()
+            raise
+
+        self.__decoded: dict[VisChunkId, Any] = {}
+
+    def get(self, cid: VisChunkId, default=None):
+        if cid in self.__decoded:
+            return self.__decoded[cid]
+
+        entry = self.toc.find(cid)
+        if entry is None:
+            return default
+
+        self.reader.seek(entry.offset)
+
+        with profiler.file(self.path), profiler.span(chunk_name(cid), size=entry.length):
+            value = self.__decoded[cid] = self.decoders[cid](self.reader)
+
+        return value
+
+    def __contains__(self, cid: VisChunkId) -> bool:
+        return cid in self.toc
+
+    def close(self) -> None:
+        self.reader.close()
+
+    def __enter__(self):
+        return self
 
-                    if scope.depth < 0:
-                        break
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,71 @@
+from pathlib import Path
+from typing import BinaryIO
+
+from io_soulworker.chunks.vmsh_chunk import VMshChunk
+from io_soulworker.core.binary_writer import BinaryWriter
+from io_soulworker.core.vis_chunk_id import VisChunkId
+
+
+class VisChunkWriteScope(object):
+    """ Writing counterpart of VisChunkScope: the length is backpatched once the payload is written """
+
+    def __init__(self, writer: BinaryWriter, cid: VisChunkId, depth: int) -> None:
+        self.writer = writer
+        self.cid = cid
+        self.depth = depth
+
+    def __enter__(self):
+        self.writer.write_int32(self.depth)
+        self.writer.write_cid(self.cid)
+
+        self.length_offset = self.writer.tell()
+        self.writer.write_uint32(0)
+
+        self.pos = self.writer.tell()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None:
+            return
+
+        self.writer.patch_uint32(self.length_offset, self.writer.tell() - self.pos)
+
+        # the reader subtracts the exit depth from the enter depth
+        self.writer.write_int32(self.depth)
+        self.writer.write_cid(self.cid)
+
+
+class VisChunkFileWriter(object):
+    """ Streams a chunk file: VBIN header, chunks written in order, end of file marker on close """
+
+    def __init__(self, target: Path | str | BinaryIO, version: int) -> None:
+        self.writer = BinaryWriter(target)
+
+        self.writer.write_cid(VisChunkId.VBIN)
+        self.writer.write_uint32(version)
+
+    def chunk(self, cid: VisChunkId, depth: int = 1) -> VisChunkWriteScope:
+        """ scope for a chunk whose payload the caller writes through self.writer """
+
+        return VisChunkWriteScope(self.writer, cid, depth)
+
+    def write_raw(self, cid: VisChunkId, payload, depth: int = 1) -> None:
+        """ a chunk whose payload is already encoded, e.g. copied from another file """
+
+        with self.chunk(cid, depth):
+            self.writer.write(payload)
+
+    def write_mesh(self, chunk: VMshChunk, depth: int = 1) -> None:
+        with self.chunk(VisChunkId.VMSH, depth):
+            chunk.write(self.writer)
+
+    def close(self) -> None:
+        self.writer.write_int32(-1)
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -16,3 +16,10 @@ class VisChunkId(enum.IntEnum):
     CBPR = int.from_bytes(b"CBPR", byteorder="big")
     BNDS = int.from_bytes(b"BNDS", byteorder="big")
     HEAD = int.from_bytes(b"HEAD", byteorder="big")
+    SKAN = int.from_bytes(b"SKAN", byteorder="big")
+
+
+def chunk_name(cid: int) -> str:
+    """ four character code as stored in the file """
+
+    return cid.to_bytes(4, "big").decode("ascii", "replace")
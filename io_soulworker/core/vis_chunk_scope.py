@@ -4,6 +4,7 @@ from traceback import print_exception
 
 from io_soulworker.core.binary_reader import BinaryReader
 from io_soulworker.core.vis_chunk_id import VisChunkId
+from io_soulworker.core.vis_chunk_id import chunk_name
 
 
 class VisChunkScope(object):
@@ -23,7 +24,7 @@ class VisChunkScope(object):
             return self
 
         self.cid = self.reader.read_cid()
-        debug("enter chunk id: %s", self.__get_chunk_name(self.cid))
+        debug("enter chunk id: %s", chunk_name(self.cid))
 
         self.length = self.reader.read_uint32()
         self.pos = self.reader.tell()
@@ -44,7 +45,4 @@ class VisChunkScope(object):
         debug("exit stack depth: %d", self.depth)
 
         exit_cid = self.reader.read_cid()
-        debug("exit chunk id: %s", self.__get_chunk_name(exit_cid))
-
-    def __get_chunk_name(self, id: VisChunkId) -> str:
-        return id.to_bytes(4, "big").decode("ascii")
+        debug("exit chunk id: %s", chunk_name(exit_cid))
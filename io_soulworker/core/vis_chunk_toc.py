@@ -0,0 +1,64 @@
+from logging import debug
+
+from io_soulworker.core.binary_reader import BinaryReader
+from io_soulworker.core.vis_chunk_id import VisChunkId
+
+
+class VisChunkTocEntry(object):
+
+    depth: int
+    """ stack depth read on chunk enter """
+
+    cid: VisChunkId
+    """ Chunk Id """
+
+    length: int
+    """ payload length in bytes """
+
+    offset: int
+    """ absolute offset of the payload """
+
+    def __init__(self, depth: int, cid: VisChunkId, length: int, offset: int) -> None:
+        self.depth = depth
+        self.cid = cid
+        self.length = length
+        self.offset = offset
+
+
+class VisChunkToc(object):
+    """ Top level chunks of a file, found by walking the chunk headers without decoding any payload """
+
+    entries: list[VisChunkTocEntry]
+
+    def __init__(self, reader: BinaryReader) -> None:
+        """ reader must be positioned right after VisBinHeader """
+
+        self.entries = []
+
+        while True:
+            depth = reader.read_int32()
+            if depth < 0:
+                break
+
+            cid = reader.read_cid()
+            length = reader.read_uint32()
+            offset = reader.tell()
+
+            self.entries.append(VisChunkTocEntry(depth, cid, length, offset))
+
+            # skip payload, exit depth and exit chunk id
+            reader.seek(offset + length + 8)
+
+        debug("toc: %d chunks", len(self.entries))
+
+    def find(self, cid: VisChunkId) -> VisChunkTocEntry | None:
+        return next((entry for entry in self.entries if entry.cid == cid), None)
+
+    def __contains__(self, cid: VisChunkId) -> bool:
+        return self.find(cid) is not None
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
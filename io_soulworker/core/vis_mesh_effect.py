@@ -1,7 +1,12 @@
 from io_soulworker.core.binary_reader import BinaryReader
+from io_soulworker.core.binary_writer import BinaryWriter
 
 
 class VisMeshEffect:
     def __init__(self, reader: BinaryReader) -> None:
         self.name = reader.read_utf8_uint32_string()
         self.flags = reader.read_uint32()
+
+    def write(self, writer: BinaryWriter) -> None:
+        writer.write_utf8_uint32_string(self.name)
+        writer.write_uint32(self.flags)
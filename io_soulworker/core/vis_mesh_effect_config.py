@@ -1,4 +1,5 @@
 from io_soulworker.core.binary_reader import BinaryReader
+from io_soulworker.core.binary_writer import BinaryWriter
 from io_soulworker.core.vis_mesh_effect import VisMeshEffect
 
 
@@ -8,3 +9,9 @@ class VisMeshEffectConfig:
     def __init__(self, reader: BinaryReader) -> None:
         count = reader.read_uint16()
         self.values = [VisMeshEffect(reader) for _ in range(count)]
+
+    def write(self, writer: BinaryWriter) -> None:
+        writer.write_uint16(len(self.values))
+
+        for value in self.values:
+            value.write(writer)
@@ -1,4 +1,5 @@
 from io_soulworker.core.binary_reader import BinaryReader
+from io_soulworker.core.binary_writer import BinaryWriter
 
 
 class VisRenderState:
@@ -6,3 +7,8 @@ class VisRenderState:
         self.transp_mode = reader.read_transparency()
         self.unused = reader.read_uint8()
         self.render_flags = reader.read_render_state_flags()
+
+    def write(self, writer: BinaryWriter) -> None:
+        writer.write_uint8(self.transp_mode)
+        writer.write_uint8(self.unused)
+        writer.write_uint16(self.render_flags)
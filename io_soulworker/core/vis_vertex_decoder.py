@@ -0,0 +1,106 @@
+from numpy import clip
+from numpy import dtype
+from numpy import empty
+from numpy import float32
+from numpy import maximum
+from numpy import ndarray
+from numpy import rint
+
+from io_soulworker.core.vis_vertex_descriptor import VisVertexDescriptor
+from io_soulworker.core.vis_vertex_format import VERTEX_FORMATS
+from io_soulworker.core.vis_vertex_format import VisVertexFormat
+
+
+SIZES = {"pos": 3, "normal": 3, "uv": 2}
+""" float32 columns of every decoded component """
+
+
+class VisVertexComponent(object):
+    """ Conversion of one stored component to float32 and back """
+
+    def __init__(self, name: str, format: VisVertexFormat) -> None:
+        scalar, self.count, self.scale = VERTEX_FORMATS[format]
+
+        self.size = SIZES[name]
+
+        self.is_signed = scalar == "i2"
+        """ signed normalized values reach -1 from both -32767 and -32768 """
+
+        self.is_biased = name == "normal" and format == VisVertexFormat.BYTE4N
+        """ packed normals: [0, 1] holds [-1, 1] """
+
+    def decode(self, value: ndarray) -> ndarray:
+        columns = min(self.count, self.size)
+
+        result = empty((len(value), self.size), float32)
+        result[:, :columns] = value[:, :columns]
+        result[:, columns:] = 0
+
+        if self.scale is not None:
+            result *= 1 / self.scale
+
+            if self.is_signed:
+                maximum(result, -1, out=result)
+
+        if self.is_biased:
+            result *= 2
+            result -= 1
+
+        return result
+
+    def encode(self, value: ndarray, target: ndarray) -> None:
+        columns = min(self.count, self.size)
+        data = value[:, :columns]
+
+        if self.is_biased:
+            data = (data + 1) / 2
+
+        if self.scale is not None:
+            data = rint(clip(data, -1 if self.is_signed else 0, 1) * self.scale)
+
+        target[:, :columns] = data
+
+
+class VisVertexDecoder(object):
+    """ Compiled for one vertex layout: the structured dtype of the stored vertex and a conversion per component.
+
+    Decoders are cached by descriptor hash and byte order; the offsets are part of the key too,
+    version 42 descriptors carry no hash and a stale one must not pick another layout.
+    """
+
+    __cache: dict[tuple, "VisVertexDecoder"] = {}
+
+    def __init__(self, descriptor: VisVertexDescriptor, is_big_endian: bool = False) -> None:
+        self.layout: dtype = descriptor.vertex_dtype(is_big_endian)
+
+        self.components = {name: VisVertexComponent(name, format)
+                           for name, (_, format) in descriptor.components().items()}
+
+    def get(descriptor: VisVertexDescriptor, is_big_endian: bool = False) -> "VisVertexDecoder":
+        key = (getattr(descriptor, "hash", None), descriptor.stride, descriptor.pos_offset,
+               descriptor.normal_offset, descriptor.tex_offset[0], is_big_endian)
+
+        decoder = VisVertexDecoder.__cache.get(key)
+
+        if decoder is None:
+            decoder = VisVertexDecoder.__cache[key] = VisVertexDecoder(descriptor, is_big_endian)
+
+        return decoder
+
+    def decode(self, vertices: ndarray, name: str) -> ndarray:
+        """ (count, size) float32 of a component, (0, size) when the vertex has none """
+
+        component = self.components.get(name)
+
+        if component is None:
+            return empty((0, SIZES[name]), float32)
+
+        return component.decode(vertices[name])
+
+    def encode(self, vertices: ndarray, name: str, value: ndarray) -> None:
+        """ decoded component back into the stored format of `vertices` """
+
+        component = self.components.get(name)
+
+        if component is not None:
+            component.encode(value, vertices[name])
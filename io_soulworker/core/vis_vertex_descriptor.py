@@ -1,6 +1,11 @@
 from logging import debug, warn
 
+from numpy import dtype
+
 from io_soulworker.core.binary_reader import BinaryReader
+from io_soulworker.core.binary_writer import BinaryWriter
+from io_soulworker.core.vis_vertex_format import VERTEX_FORMATS
+from io_soulworker.core.vis_vertex_format import VisVertexFormat
 
 
 class VisVertexDescriptor(object):
@@ -8,6 +13,14 @@ class VisVertexDescriptor(object):
     MAGICK = 0x1020A0B
     MAX_TEXTURES = 16
     VERTEXDESC_OFFSET_MASK = 0x0fff
+    VERTEXDESC_FORMAT_MASK = 0xf000
+
+    DEFAULT_FORMATS = {
+        "pos": VisVertexFormat.FLOAT3,
+        "normal": VisVertexFormat.FLOAT3,
+        "uv": VisVertexFormat.FLOAT2,
+    }
+    """ format of a component stored without format bits """
 
     stride: int
     """ Stride of the vertex structure; must be set to the size of the vertex structure. """
@@ -36,8 +49,48 @@ class VisVertexDescriptor(object):
     hash: int
     """ Hash value. Set automatically when computing the hash or at serialization time. """
 
-    def hasComponent(self, value: int): return value != -1
+    # offsets are read unsigned, an absent component is stored as -1
+    def hasComponent(self, value: int): return value not in (-1, 0xFFFF)
     def offsetOf(self, value: int): return value & self.VERTEXDESC_OFFSET_MASK
+    def formatOf(self, value: int): return VisVertexFormat(value & self.VERTEXDESC_FORMAT_MASK)
+
+    def components(self) -> dict[str, tuple[int, VisVertexFormat]]:
+        """ offset and format of every present component, defaults resolved """
+
+        components = {}
+
+        for name, value in (("pos", self.pos_offset), ("normal", self.normal_offset), ("uv", self.tex_offset[0])):
+            if self.hasComponent(value):
+                format = self.formatOf(value)
+                components[name] = (self.offsetOf(value), format or self.DEFAULT_FORMATS[name])
+
+        return components
+
+    def vertex_dtype(self, is_big_endian: bool = False) -> dtype:
+        """ Structured dtype of one vertex in the buffer, in the stored formats; absent components are left out. """
+
+        names = []
+        formats = []
+        offsets = []
+
+        for name, (offset, format) in self.components().items():
+            scalar, count, _ = VERTEX_FORMATS[format]
+            field = dtype((">" if is_big_endian else "<") + scalar)
+
+            # a component past the end of the vertex would read its neighbour
+            assert offset + field.itemsize * count <= self.stride, \
+                "%s overruns the %d byte vertex" % (name, self.stride)
+
+            names.append(name)
+            formats.append((field, (count,)))
+            offsets.append(offset)
+
+        return dtype({
+            "names": names,
+            "formats": formats,
+            "offsets": offsets,
+            "itemsize": self.stride,
+        })
 
     def __init__(self, reader: BinaryReader) -> None:
 
@@ -52,7 +105,7 @@ class VisVertexDescriptor(object):
         self.color_offset = reader.read_uint16()
         self.normal_offset = reader.read_uint16()
         self.tex_offset = self.__read_uv(reader)
-        self.secondary_color_offset = reader.read_uint16()
+        self.secondary_color_offset = self.__secondary_color_offset = reader.read_uint16()
 
         if self.version == 42:
             warn('Need recalc hash')
@@ -62,10 +115,32 @@ class VisVertexDescriptor(object):
             self.last_text_coord = reader.read_uint8()
             self.hash = reader.read_uint32()
 
-        if self.MAGICK == reader.read_uint32():
+        self.end = reader.read_uint32()
+        if self.MAGICK == self.end:
             self.secondary_color_offset = -1
 
     def __read_uv(self, reader: BinaryReader):
         return [reader.read_uint16() for _ in range(self.MAX_TEXTURES)]
 
+    def write(self, writer: BinaryWriter) -> None:
+        writer.write_uint32(self.MAGICK)
+        writer.write_uint32(self.version)
+
+        writer.write_uint16(self.stride)
+        writer.write_uint16(self.pos_offset)
+        writer.write_uint16(self.color_offset)
+        writer.write_uint16(self.normal_offset)
+
+        for offset in self.tex_offset:
+            writer.write_uint16(offset)
+
+        writer.write_uint16(self.__secondary_color_offset)
+
+        if self.version == 48:
+            writer.write_uint8(self.first_text_coord)
+            writer.write_uint8(self.last_text_coord)
+            writer.write_uint32(self.hash)
+
+        writer.write_uint32(self.end)
+
 # https://youtu.be/UnIhRpIT7nc
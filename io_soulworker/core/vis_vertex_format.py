@@ -0,0 +1,48 @@
+from enum import IntEnum
+
+
+class VisVertexFormat(IntEnum):
+    """ Component format, the upper nibble of a vertex descriptor offset (VERTEXDESC_FORMAT_xyz) """
+
+    DEFAULT = 0x0000,
+    """ Format of the component's type: 3 floats for positions and normals, 2 for texture coordinates. """
+
+    FLOAT = 0x1000,
+    FLOAT2 = 0x2000,
+    FLOAT3 = 0x3000,
+    FLOAT4 = 0x4000,
+
+    BYTE4N = 0x5000,
+    """ 4 unsigned bytes mapped to [0, 1]; normals in this format are mapped to [-1, 1]. """
+
+    SHORT2 = 0x6000,
+    SHORT4 = 0x7000,
+
+    SHORT2N = 0x8000,
+    """ 2 signed shorts mapped to [-1, 1]. """
+
+    SHORT4N = 0x9000,
+    """ 4 signed shorts mapped to [-1, 1]. """
+
+    HALF2 = 0xA000,
+    HALF4 = 0xB000,
+
+    BYTE4 = 0xC000
+    """ 4 unsigned bytes as is. """
+
+
+VERTEX_FORMATS = {
+    # scalar type, count, normalized by
+    VisVertexFormat.FLOAT: ("f4", 1, None),
+    VisVertexFormat.FLOAT2: ("f4", 2, None),
+    VisVertexFormat.FLOAT3: ("f4", 3, None),
+    VisVertexFormat.FLOAT4: ("f4", 4, None),
+    VisVertexFormat.BYTE4N: ("u1", 4, 255),
+    VisVertexFormat.SHORT2: ("i2", 2, None),
+    VisVertexFormat.SHORT4: ("i2", 4, None),
+    VisVertexFormat.SHORT2N: ("i2", 2, 32767),
+    VisVertexFormat.SHORT4N: ("i2", 4, 32767),
+    VisVertexFormat.HALF2: ("f2", 2, None),
+    VisVertexFormat.HALF4: ("f2", 4, None),
+    VisVertexFormat.BYTE4: ("u1", 4, None),
+}
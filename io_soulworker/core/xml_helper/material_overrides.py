@@ -0,0 +1,112 @@
+from logging import debug
+from pathlib import Path
+from xml.etree.ElementTree import Element
+from xml.etree.ElementTree import iterparse
+
+from io_soulworker.core.vis_material import VisMaterial
+from io_soulworker.core.vis_transparency_type import VisTransparencyType
+from io_soulworker.core.xml_helper.exchange_transparency import exchange_transparency
+
+
+class MaterialOverrides(object):
+    """ Parsed materials.xml files by path, parsed again only when their mtime changes """
+
+    def __init__(self) -> None:
+        self.__files: dict[Path, tuple[int, dict[str, VisMaterial]]] = {}
+
+    def find(self, model: Path) -> dict[str, VisMaterial]:
+        """ overrides of a model; the Overrides folder wins over the model_data folder """
+
+        values = dict()
+
+        for path in MaterialOverrides.__materials_paths(model):
+            values.update(self.load(path))
+
+        return values
+
+    def mtime(self, model: Path) -> int:
+        """ newest change among the model's override files, 0 without any """
+
+        mtime = 0
+
+        for path in MaterialOverrides.__materials_paths(model):
+            try:
+                mtime = max(mtime, path.stat().st_mtime_ns)
+            except OSError:
+                pass
+
+        return mtime
+
+    def load(self, path: Path) -> dict[str, VisMaterial]:
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return {}
+
+        cached = self.__files.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        debug('load from: %s', path)
+
+        values = parse_materials(path)
+        self.__files[path] = (mtime, values)
+
+        return values
+
+    def __materials_paths(path: Path):
+        # NPC_0001_Mirium.model -> NPC_0001_Mirium.model_data\\materials.xml
+        yield path.parent / (path.name + "_data/materials.xml")
+
+        # NPC_0001_Mirium.model -> Overrides\\NPC_0001_Mirium.model_data\\materials.xml
+        yield path.parent / "Overrides" / (path.name + "_data/materials.xml")
+
+
+def parse_materials(path: Path) -> dict[str, VisMaterial]:
+    """ Material nodes under Materials; every other node is dropped as soon as it is read """
+
+    def __float(name: str, node: Element):
+        value = node.attrib.get(name)
+        return float(value) if value is not None else None
+
+    def __color(name: str, node: Element):
+        value = node.attrib.get(name)
+        return [int(v) for v in value.split(',')] if value is not None else None
+
+    def create(node: Element) -> VisMaterial:
+        material = VisMaterial()
+        material.name = node.attrib.get("name")
+
+        material.ambient = __color("ambient", node)
+
+        material.diffuse = node.attrib.get("diffuse")
+
+        transparency = node.attrib.get("transparency")
+        material.transparency = VisTransparencyType(
+            exchange_transparency(transparency)) if transparency else VisTransparencyType.NONE
+
+        material.alphathreshold = __float("alphathreshold", node)
+
+        return material
+
+    values = dict()
+    tags = []
+
+    for event, node in iterparse(path, events=("start", "end")):
+        if event == "start":
+            tags.append(node.tag)
+            continue
+
+        tags.pop()
+
+        if node.tag == "Material" and tags[-1:] == ["Materials"]:
+            material = create(node)
+            values[material.name] = material
+
+        node.clear()
+
+    return values
+
+
+overrides = MaterialOverrides()
+""" shared by every file read in this process """
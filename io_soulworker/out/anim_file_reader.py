@@ -0,0 +1,29 @@
+from logging import debug
+from pathlib import Path
+
+from io_soulworker.chunks.anim_chunk import AnimChunk
+from io_soulworker.core.binary_reader import BinaryReader
+from io_soulworker.core.vis_chunk_file import VisChunkFileReader
+from io_soulworker.core.vis_chunk_file import is_chunk_end
+from io_soulworker.core.vis_chunk_id import VisChunkId
+
+
+class AnimFileReader(VisChunkFileReader):
+
+    def on_animation(self, _: AnimChunk): debug('Not impl callback')
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+
+        self.handlers = {
+            VisChunkId.SKAN: self.__parse_animation,
+        }
+
+    def __parse_animation(self, reader: BinaryReader):
+        chunk = AnimChunk(reader)
+
+        # the layout is a guess, a clip that doesn't fill its chunk exactly isn't imported as garbage keys
+        if not is_chunk_end(reader, VisChunkId.SKAN):
+            raise ValueError("SKAN chunk doesn't match the supported layout (animation import is experimental)")
+
+        self.on_animation(chunk)
@@ -0,0 +1,101 @@
+import bpy
+
+from bpy.types import Action
+from bpy.types import Context
+from bpy.types import Object
+
+from numpy import array
+from numpy import empty
+from numpy import float32
+from numpy import float64
+from numpy import ndarray
+
+from logging import debug
+from pathlib import Path
+
+from io_soulworker.chunks.anim_chunk import AnimChunk
+from io_soulworker.core.profiler import profiler
+from io_soulworker.out.anim_file_reader import AnimFileReader
+from io_soulworker.out.model_importer import BONE_BIND
+from io_soulworker.out.model_importer import BONE_INDEX
+
+
+class AnimImporter(AnimFileReader):
+    """ Clip as an action of an armature built by ModelImporter, tracks are matched by SKEL bone index """
+
+    action: Action | None = None
+
+    def __init__(self, path: Path, context: Context, armature_object: Object) -> None:
+        super().__init__(path)
+
+        self.context = context
+        self.armature_object = armature_object
+
+    def on_animation(self, chunk: AnimChunk):
+        with profiler.span("action build"):
+            bones = AnimImporter.__bind_pose(self.armature_object)
+
+            scene = self.context.scene
+            fps = scene.render.fps / scene.render.fps_base
+
+            action = bpy.data.actions.new(chunk.name or self.path.stem)
+
+            # every clip stays in the file for preview, not only the assigned one
+            action.use_fake_user = True
+
+            for track in chunk.tracks:
+                bone = bones.get(track.bone)
+
+                if bone is None:
+                    debug("no bone %d for track, skipped", track.bone)
+                    continue
+
+                name, rest_rotation, rest_position, offset = bone
+                locations, rotations = track.to_pose(rest_rotation, rest_position, offset)
+
+                data_path = 'pose.bones["%s"]' % bpy.utils.escape_identifier(name)
+
+                AnimImporter.__fill(action, data_path + ".location", name,
+                                    track.position_times * fps + scene.frame_start, locations)
+
+                AnimImporter.__fill(action, data_path + ".rotation_quaternion", name,
+                                    track.rotation_times * fps + scene.frame_start, rotations)
+
+            animation_data = self.armature_object.animation_data or self.armature_object.animation_data_create()
+            animation_data.action = action
+
+            self.action = action
+
+        profiler.count("action build", sum(track.key_count for track in chunk.tracks))
+
+    def __bind_pose(armature_object: Object) -> dict[int, tuple[str, ndarray, ndarray, ndarray]]:
+        """ name, rest rotation, rest position and frame offset by SKEL bone index """
+
+        bones = {}
+
+        for bone in armature_object.data.bones:
+            if BONE_INDEX not in bone or BONE_BIND not in bone:
+                continue
+
+            bind = array(bone[BONE_BIND][:], float64)
+            bones[bone[BONE_INDEX]] = (bone.name, bind[:4], bind[4:7], bind[7:])
+
+        return bones
+
+    def __fill(action: Action, data_path: str, group: str, frames: ndarray, values: ndarray):
+        """ one f-curve per component, keys added and set in bulk """
+
+        if not len(frames):
+            return
+
+        co = empty((len(frames), 2), float32)
+        co[:, 0] = frames
+
+        for index in range(values.shape[1]):
+            fcurve = action.fcurves.new(data_path, index=index, action_group=group)
+            fcurve.keyframe_points.add(len(frames))
+
+            co[:, 1] = values[:, index]
+            fcurve.keyframe_points.foreach_set("co", co.ravel())
+
+            fcurve.update()
@@ -0,0 +1,221 @@
+from hashlib import sha1
+from logging import debug
+from multiprocessing import cpu_count
+from multiprocessing import get_context
+from ntpath import basename
+from os import stat_result
+from pathlib import Path
+from sqlite3 import Connection
+from sqlite3 import connect
+from time import perf_counter
+
+from io_soulworker.core.xml_helper.material_overrides import overrides
+from io_soulworker.out.model_probe import ModelProbe
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    overrides_mtime_ns INTEGER NOT NULL,
+    version INTEGER,
+    vertex_count INTEGER,
+    index_count INTEGER,
+    index_format TEXT,
+    prim_type TEXT,
+    stride INTEGER,
+    bone_count INTEGER,
+    bone_hash TEXT,
+    error TEXT
+);
+
+CREATE TABLE IF NOT EXISTS materials (
+    model_id INTEGER NOT NULL REFERENCES models(id) ON DELETE CASCADE,
+    slot INTEGER NOT NULL,
+    name TEXT,
+    is_override INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS textures (
+    model_id INTEGER NOT NULL REFERENCES models(id) ON DELETE CASCADE,
+    material_slot INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS bones (
+    model_id INTEGER NOT NULL REFERENCES models(id) ON DELETE CASCADE,
+    bone INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    parent INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS materials_model ON materials(model_id);
+CREATE INDEX IF NOT EXISTS textures_model ON textures(model_id);
+CREATE INDEX IF NOT EXISTS textures_name ON textures(name);
+CREATE INDEX IF NOT EXISTS bones_model ON bones(model_id);
+CREATE INDEX IF NOT EXISTS bones_name ON bones(name);
+CREATE INDEX IF NOT EXISTS models_bone_hash ON models(bone_hash);
+"""
+
+
+def texture_name(path: str) -> str:
+    """ lower case file name, textures are referenced with windows separators """
+
+    return basename(path.replace("/", "\\")).lower()
+
+
+def probe(path: Path) -> dict:
+    """ worker entry point: the indexed values of one file, reading only MTRS, SUBM, SKEL and the VMSH header """
+
+    try:
+        model = ModelProbe(path, is_bone_names=True)
+    except Exception as e:
+        return {"path": str(path), "error": "%s: %s" % (type(e).__name__, e)}
+
+    values = model.to_dict()
+    values["bones"] = model.bones
+
+    return values
+
+
+class AssetIndex(object):
+    """ SQLite catalog of a game data tree.
+
+    update() only parses files whose size, mtime or materials.xml overrides changed since the last run.
+
+    with AssetIndex(Path("assets.sqlite")) as index:
+        index.update(Path("data"))
+        paths = index.models_using_texture("NPC_0001_D.dds")
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.connection: Connection = connect(path)
+
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(SCHEMA)
+
+    def update(self, root: Path, pattern: str = "*.model", jobs: int = 0) -> dict:
+        """ returns scanned, parsed, removed and failed file counts """
+
+        start = perf_counter()
+
+        known = {path: (size, mtime, overrides_mtime) for path, size, mtime, overrides_mtime in
+                 self.connection.execute("SELECT path, size, mtime_ns, overrides_mtime_ns FROM models")}
+
+        changed: dict[str, tuple[stat_result, int]] = {}
+        seen = set()
+
+        for path in root.resolve().rglob(pattern):
+            key = str(path)
+            seen.add(key)
+
+            stat = path.stat()
+            overrides_mtime = overrides.mtime(path)
+
+            if known.get(key) != (stat.st_size, stat.st_mtime_ns, overrides_mtime):
+                changed[key] = (stat, overrides_mtime)
+
+        removed = [path for path in known if path not in seen]
+
+        with self.connection:
+            self.connection.executemany("DELETE FROM models WHERE path = ?", [(path,) for path in removed])
+
+            failed = 0
+
+            for values in self.__probe([Path(path) for path in changed], jobs):
+                stat, overrides_mtime = changed[values["path"]]
+                failed += "error" in values
+
+                self.__store(values, stat, overrides_mtime)
+
+        counts = {"scanned": len(seen), "parsed": len(changed), "removed": len(removed), "failed": failed}
+        debug("index %s: %s in %.2f s", root, counts, perf_counter() - start)
+
+        return counts
+
+    def __probe(self, paths: list[Path], jobs: int):
+        jobs = min(jobs or cpu_count() or 1, len(paths))
+
+        if jobs <= 1:
+            yield from map(probe, paths)
+            return
+
+        with get_context("spawn").Pool(jobs) as pool:
+            yield from pool.imap_unordered(probe, paths, chunksize=16)
+
+    def __store(self, values: dict, stat: stat_result, overrides_mtime: int) -> None:
+        execute = self.connection.execute
+
+        execute("DELETE FROM models WHERE path = ?", (values["path"],))
+
+        if "error" in values:
+            execute("INSERT INTO models (path, size, mtime_ns, overrides_mtime_ns, error) VALUES (?, ?, ?, ?, ?)",
+                    (values["path"], stat.st_size, stat.st_mtime_ns, overrides_mtime, values["error"]))
+            return
+
+        bones = values["bones"]
+        bone_hash = sha1("\n".join(name for name, _ in bones).encode("utf-8")).hexdigest() if bones else None
+
+        model_id = execute(
+            "INSERT INTO models (path, size, mtime_ns, overrides_mtime_ns, version, vertex_count, index_count,"
+            " index_format, prim_type, stride, bone_count, bone_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (values["path"], stat.st_size, stat.st_mtime_ns, overrides_mtime, values["version"],
+             values["vertex_count"], values["index_count"], values["index_format"], values["prim_type"],
+             values["stride"], values["bone_count"], bone_hash)).lastrowid
+
+        textures = []
+
+        for slot, material in enumerate(values["materials"]):
+            execute("INSERT INTO materials (model_id, slot, name, is_override) VALUES (?, ?, ?, ?)",
+                    (model_id, slot, material["name"], material["is_override"]))
+
+            # the stored diffuse stays, the override one is what the importer loads
+            paths = [("diffuse", material["diffuse"]), ("specular", material["specular"]),
+                     ("normal", material["normal"]), ("override", material["override"])] \
+                + [("aux", path) for path in material["aux"]]
+
+            textures += [(model_id, slot, kind, path, texture_name(path)) for kind, path in paths if path]
+
+        self.connection.executemany(
+            "INSERT INTO textures (model_id, material_slot, kind, path, name) VALUES (?, ?, ?, ?, ?)", textures)
+
+        self.connection.executemany(
+            "INSERT INTO bones (model_id, bone, name, parent) VALUES (?, ?, ?, ?)",
+            [(model_id, i, name, parent) for i, (name, parent) in enumerate(bones)])
+
+    def models_using_texture(self, texture: str) -> list[str]:
+        """ texture file name, case insensitive """
+
+        return [path for path, in self.connection.execute(
+            "SELECT DISTINCT m.path FROM textures t JOIN models m ON m.id = t.model_id"
+            " WHERE t.name = ? ORDER BY m.path", (texture_name(texture),))]
+
+    def models_sharing_bones(self, model: Path) -> list[str]:
+        """ other models with the same bone names in the same order """
+
+        return [path for path, in self.connection.execute(
+            "SELECT other.path FROM models this JOIN models other ON other.bone_hash = this.bone_hash"
+            " WHERE this.path = ? AND other.id != this.id ORDER BY other.path", (str(model.resolve()),))]
+
+    def models_over_budget(self, vertices: int | None = None, indices: int | None = None) -> list[tuple[str, int, int]]:
+        """ path, vertex count and index count of meshes above either limit """
+
+        return self.connection.execute(
+            "SELECT path, vertex_count, index_count FROM models"
+            " WHERE vertex_count > ? OR index_count > ? ORDER BY vertex_count DESC",
+            (vertices if vertices is not None else 1 << 62, indices if indices is not None else 1 << 62)).fetchall()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
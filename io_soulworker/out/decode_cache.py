@@ -0,0 +1,274 @@
+from argparse import ArgumentParser
+from hashlib import sha1
+from hashlib import sha256
+from hmac import compare_digest
+from hmac import digest
+from logging import debug
+from logging import error
+from mmap import ACCESS_READ
+from mmap import mmap
+from os import environ
+from os import O_CREAT
+from os import O_EXCL
+from os import O_WRONLY
+from os import close
+from os import getpid
+from os import open as os_open
+from os import replace
+from os import urandom
+from os import utime
+from os import write
+from pathlib import Path
+from struct import Struct
+
+from io_soulworker.core.xml_helper.material_overrides import overrides
+from io_soulworker.out.model_payload import ModelPayload
+from io_soulworker.out.model_payload import aligned
+from io_soulworker.out.model_proxy import ModelProxy
+
+
+PARSER_VERSION = 9
+""" bump whenever the layout of decoded chunks changes, old entries are then never hit again """
+
+MAGICK = b"SWDC"
+
+FILE_HEADER = Struct("<4sIQ32s")
+""" magick, parser version, pickled header length, keyed digest of the pickled header """
+
+KEY_NAME = "key"
+""" per cache secret, only headers written with it are ever unpickled """
+
+DEFAULT_ROOT = Path(environ.get("IO_SOULWORKER_CACHE", Path.home() / ".cache" / "io_soulworker"))
+
+DEFAULT_MAX_SIZE = 2 << 30
+
+
+class DecodeCache(object):
+    """ Decoded models on disk, keyed by path, size, mtime, materials.xml overrides mtime,
+    parser version, proxy and whether WGHT was decoded.
+
+    An entry is the pickled remainder of a ModelPayload followed by its flat array buffer,
+    loading maps the file and the arrays are views into the mapping. The pickled part is
+    signed with the cache key and left alone when the signature doesn't match.
+    Eviction is least recently used, hits refresh the entry mtime.
+    """
+
+    SUFFIX = ".swdc"
+
+    def __init__(self, root: Path = DEFAULT_ROOT, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.root = root
+        self.max_size = max_size
+
+        self.__key: bytes | None = None
+
+    def key(self) -> bytes:
+        """ secret of this cache, created readable by its owner only """
+
+        if self.__key is not None:
+            return self.__key
+
+        path = self.root / KEY_NAME
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            descriptor = os_open(path, O_WRONLY | O_CREAT | O_EXCL, 0o600)
+        except FileExistsError:
+            self.__key = path.read_bytes()
+        else:
+            self.__key = urandom(32)
+
+            try:
+                write(descriptor, self.__key)
+            finally:
+                close(descriptor)
+
+        return self.__key
+
+    def sign(self, header: bytes) -> bytes:
+        return digest(self.key(), header, sha256)
+
+    def entry(self, path: Path, proxy: ModelProxy | None = None, is_decode_weights: bool = False) -> Path:
+        path = path.resolve()
+        stat = path.stat()
+
+        # decoded materials carry their overrides, an edited materials.xml is a different entry
+        key = "%s|%d|%d|%d|%d" % (path, stat.st_size, stat.st_mtime_ns, overrides.mtime(path), PARSER_VERSION)
+
+        if proxy is not None:
+            key += "|" + proxy.key
+
+        if is_decode_weights:
+            key += "|weights"
+
+        return self.root / (sha1(key.encode("utf-8")).hexdigest() + self.SUFFIX)
+
+    def load(self, path: Path, proxy: ModelProxy | None = None,
+             is_decode_weights: bool = False) -> ModelPayload | None:
+        """ None on a miss; an entry that can't be read is a miss too, and a bad one is removed """
+
+        try:
+            entry = self.entry(path, proxy, is_decode_weights)
+
+            with open(entry, "rb") as file:
+                data = mmap(file.fileno(), 0, access=ACCESS_READ)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            error("cache entry unreadable, ignored: %s (%s)", path, e)
+            return None
+
+        try:
+            payload = self.__read(data)
+        except Exception as e:
+            error("bad cache entry, ignored: %s (%s)", entry, e)
+
+            try:
+                data.close()
+            except BufferError:
+                # views into a half attached payload, the mapping goes when they are collected
+                pass
+
+            self.__remove(entry)
+            return None
+
+        try:
+            utime(entry)
+        except OSError as e:
+            debug("cache entry not refreshed: %s (%s)", entry, e)
+
+        debug("cache hit: %s", path)
+
+        return payload
+
+    def __read(self, data: mmap) -> ModelPayload:
+        magick, version, length, signature = FILE_HEADER.unpack_from(data)
+
+        if magick != MAGICK or version != PARSER_VERSION:
+            raise ValueError("not an entry of this parser version")
+
+        start = FILE_HEADER.size
+        header = data[start:start + length]
+
+        # never unpickle what this cache didn't write, or what got truncated since
+        if len(header) != length or not compare_digest(signature, self.sign(header)):
+            raise ValueError("signature doesn't match")
+
+        # arrays keep the mapping alive, it is closed once they are collected;
+        # the signature doesn't cover them, a truncated buffer fails while attaching
+        return ModelPayload.from_buffer(header, memoryview(data)[aligned(start + length):])
+
+    def __remove(self, entry: Path) -> None:
+        try:
+            entry.unlink()
+        except OSError as e:
+            # still mapped by an import on windows
+            debug("can't remove %s: %s", entry, e)
+
+    def store(self, path: Path, header: bytes, buffer: memoryview, proxy: ModelProxy | None = None,
+              is_decode_weights: bool = False) -> None:
+        entry = self.entry(path, proxy, is_decode_weights)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+
+        temporary = entry.with_suffix(".%d.tmp" % getpid())
+
+        with open(temporary, "wb") as file:
+            file.write(FILE_HEADER.pack(MAGICK, PARSER_VERSION, len(header), self.sign(header)))
+            file.write(header)
+            file.write(bytes(aligned(file.tell()) - file.tell()))
+            file.write(buffer)
+
+        # atomic, concurrent imports never see a partial entry
+        replace(temporary, entry)
+
+    def decode(self, path: Path, proxy: ModelProxy | None = None, is_decode_weights: bool = False) -> ModelPayload:
+        """ cached payload, or decode the file and remember it """
+
+        payload = self.load(path, proxy, is_decode_weights)
+        if payload is not None:
+            return payload
+
+        header, buffer = ModelPayload.record(path, proxy, is_decode_weights).to_buffer()
+        self.store(path, header, buffer, proxy, is_decode_weights)
+
+        return ModelPayload.from_buffer(header, memoryview(buffer))
+
+    def entries(self) -> list[Path]:
+        """ least recently used first """
+
+        if not self.root.is_dir():
+            return []
+
+        return sorted(self.root.glob("*" + self.SUFFIX), key=lambda entry: entry.stat().st_mtime_ns)
+
+    def size(self) -> int:
+        return sum(entry.stat().st_size for entry in self.entries())
+
+    def prune(self, max_size: int | None = None) -> tuple[int, int]:
+        """ evict least recently used entries until the cache fits; returns removed count and bytes """
+
+        max_size = self.max_size if max_size is None else max_size
+
+        entries = self.entries()
+        total = sum(entry.stat().st_size for entry in entries)
+
+        count = 0
+        removed = 0
+
+        for entry in entries:
+            if total - removed <= max_size:
+                break
+
+            size = entry.stat().st_size
+
+            try:
+                entry.unlink()
+            except OSError as e:
+                # still mapped by an import on windows
+                error("can't evict %s: %s", entry, e)
+                continue
+
+            count += 1
+            removed += size
+
+        return count, removed
+
+
+def parse_size(value: str) -> int:
+    """ 512, 512K, 512M, 2G """
+
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+    value = value.strip().upper().rstrip("B")
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+
+    return int(value)
+
+
+def main():
+    parser = ArgumentParser(prog="python -m io_soulworker.out.decode_cache",
+                            description="Manage the decoded model cache")
+    parser.add_argument("--root", type=Path, default=DEFAULT_ROOT)
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    prune = commands.add_parser("prune", help="evict least recently used entries")
+    prune.add_argument("--max-size", type=parse_size, default=DEFAULT_MAX_SIZE)
+
+    commands.add_parser("clear", help="remove every entry")
+    commands.add_parser("stats", help="print entry count and size")
+
+    args = parser.parse_args()
+    cache = DecodeCache(args.root)
+
+    if args.command == "stats":
+        entries = cache.entries()
+        print("%s: %d entries, %d bytes" % (cache.root, len(entries), cache.size()))
+    else:
+        max_size = args.max_size if args.command == "prune" else 0
+        count, removed = cache.prune(max_size)
+        print("removed %d entries, %d bytes" % (count, removed))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,11 @@
 import bpy
 
 from bpy.props import CollectionProperty
+from bpy.props import EnumProperty
 from bpy.props import FloatProperty
 from bpy.props import BoolProperty
+from bpy.props import IntProperty
+from bpy.props import StringProperty
 from bpy.types import Context
 from bpy.types import LayerCollection
 from bpy.types import Collection
@@ -10,10 +13,25 @@ from bpy.types import Operator
 from bpy.types import PropertyGroup
 from bpy_extras.io_utils import ImportHelper
 
+from io_soulworker.core.profiler import profiler
+from io_soulworker.core.profiler import report_path
+from io_soulworker.out.decode_cache import DecodeCache
+from io_soulworker.out.image_cache import ImageCache
+from io_soulworker.out.material_cache import MaterialCache
 from io_soulworker.out.model_importer import ModelImporter
+from io_soulworker.out.model_payload import ModelPayload
+from io_soulworker.out.model_payload import decode
+from io_soulworker.out.model_payload import init_worker
+from io_soulworker.out.model_proxy import BOX
+from io_soulworker.out.model_proxy import DECIMATE
+from io_soulworker.out.model_proxy import ModelProxy
 
+from multiprocessing import TimeoutError
+from multiprocessing import cpu_count
+from multiprocessing import get_context
 from pathlib import Path
 from logging import error
+from secrets import token_hex
 
 
 class FileRunner(Operator, ImportHelper):
@@ -25,6 +43,110 @@ class FileRunner(Operator, ImportHelper):
         default=False,
     )
 
+    is_create_vertex_groups: BoolProperty(
+        name="Create vertex groups",
+        description="Create a vertex group for every submesh material",
+        default=False,
+    )
+
+    is_decode_weights: BoolProperty(
+        name="Skin weights",
+        description="Decode WGHT and bind meshes to their armature; experimental, the layout is unverified",
+        default=False,
+    )
+
+    max_influences: IntProperty(
+        name="Bone influences",
+        description="Heaviest bone weights kept per vertex, renormalized",
+        default=4,
+        min=1,
+        max=8,
+    )
+
+    is_recalc_normals: BoolProperty(
+        name="Recalculate normals",
+        description="Compute normals during import; normals stored in the file are applied as custom normals either way",
+        default=False,
+    )
+
+    is_weld: BoolProperty(
+        name="Weld vertices",
+        description="Merge vertices split at UV and normal seams, drop degenerate and duplicate faces",
+        default=False,
+    )
+
+    weld_distance: FloatProperty(
+        name="Weld distance",
+        description="Positions on the same grid cell of this size are merged",
+        default=1e-5,
+        min=0,
+        precision=6,
+    )
+
+    import_mode: EnumProperty(
+        name="Import mode",
+        description="Geometry built while decoding, proxies can be swapped for full resolution later",
+        items=[
+            ("FULL", "Full resolution", "Geometry as stored in the file"),
+            (DECIMATE, "Decimated proxy", "Vertices clustered down to the proxy ratio of the triangles"),
+            (BOX, "Bounding boxes", "A box per submesh, from its stored bounds"),
+        ],
+        default="FULL",
+    )
+
+    proxy_ratio: FloatProperty(
+        name="Proxy ratio",
+        description="Share of the triangles a decimated proxy keeps, roughly",
+        default=0.1,
+        min=0.001,
+        max=1,
+    )
+
+    is_reuse_materials: BoolProperty(
+        name="Reuse materials",
+        description="Share identical materials between the imported files",
+        default=True,
+    )
+
+    is_parallel: BoolProperty(
+        name="Parallel decoding",
+        description="Decode the selected files in worker processes",
+        default=True,
+    )
+
+    decode_timeout: FloatProperty(
+        name="Decode timeout",
+        description="Seconds to wait for one file before it is skipped",
+        default=60,
+        min=1,
+    )
+
+    is_use_cache: BoolProperty(
+        name="Decode cache",
+        description="Keep decoded files on disk so repeat imports skip parsing",
+        default=True,
+    )
+
+    cache_size: IntProperty(
+        name="Cache size (MiB)",
+        description="Least recently used files are evicted above this size",
+        default=2048,
+        min=0,
+    )
+
+    is_profile: BoolProperty(
+        name="Timing report",
+        description="Report time, bytes read and object counts per stage and file",
+        default=False,
+    )
+
+    profile_path: StringProperty(
+        name="Report file",
+        description="Write the timing report as json, the console is used when empty",
+        subtype="FILE_PATH",
+        default="",
+    )
+
     emission_strength: FloatProperty(
         name="Emission Strength",
         default=7,
@@ -70,6 +192,7 @@ class FileRunner(Operator, ImportHelper):
             collection
         )
 
+    # .anim stays out until AnimChunk's layout is checked against game clips
     AVAILABLE_EXTENSIONS = [".model", ".vmesh"]
 
     def execute(self, context: Context):
@@ -80,6 +203,8 @@ class FileRunner(Operator, ImportHelper):
         if self.is_create_collection:
             self.create_collection(context, root.parent.name)
 
+        paths = []
+
         for file in self.files:
             path: Path = root.parent / file.name
             ext = path.suffix.lower()
@@ -88,7 +213,132 @@ class FileRunner(Operator, ImportHelper):
                 error("bad path, skipped: %s", path)
                 continue
 
-            importer = ModelImporter(path, context, self.emission_strength)
-            importer.run()
+            paths.append(path)
+
+        # the environment variable turns it on for every import
+        is_profiling = profiler.is_enabled
+        profiler.enable(is_profiling or self.is_profile)
+
+        cache = DecodeCache(max_size=self.cache_size << 20) if self.is_use_cache else None
+        images = ImageCache()
+        materials = MaterialCache() if self.is_reuse_materials else None
+        proxy = self.create_proxy()
+
+        # closed explicitly on errors, so worker processes and their blocks go right away
+        decoded = self.decode(paths, cache, proxy)
+
+        try:
+            for path, payload in decoded:
+                # like a file that doesn't decode, one that doesn't build costs only itself
+                try:
+                    with profiler.file(path):
+                        payload.replay(self.create_importer(context, path, images, materials, proxy))
+                except Exception as e:
+                    error("import failed, skipped: %s (%s)", path, e)
+
+            if cache is not None:
+                cache.prune()
+
+            if profiler.is_enabled:
+                profiler.dump(Path(bpy.path.abspath(self.profile_path)) if self.profile_path else report_path())
+        finally:
+            decoded.close()
+
+            profiler.clear()
+            profiler.enable(is_profiling)
 
         return {"FINISHED"}
+
+    def create_proxy(self) -> ModelProxy | None:
+        return ModelProxy(self.import_mode, self.proxy_ratio) if self.import_mode != "FULL" else None
+
+    def create_importer(self, context: Context, path: Path, images: ImageCache,
+                        materials: MaterialCache | None, proxy: ModelProxy | None = None) -> ModelImporter:
+        return ModelImporter(path, context, self.emission_strength,
+                             self.is_create_vertex_groups, images, materials, self.max_influences,
+                             self.is_recalc_normals, self.is_weld, self.weld_distance,
+                             proxy.key if proxy is not None else "", self.is_decode_weights)
+
+    def decode(self, paths: list[Path], cache: DecodeCache | None, proxy: ModelProxy | None = None):
+        """ yields (path, payload); cached files are never parsed, proxies are built while decoding """
+
+        pending = []
+
+        for path in paths:
+            payload = None
+
+            if cache is not None:
+                with profiler.file(path), profiler.span("cache load"):
+                    payload = cache.load(path, proxy, self.is_decode_weights)
+
+            if payload is None:
+                pending.append(path)
+            else:
+                yield path, payload
+
+        if self.is_parallel and len(pending) > 1:
+            yield from self.decode_parallel(pending, cache, proxy)
+            return
+
+        for path in pending:
+            try:
+                if cache is not None:
+                    payload = cache.decode(path, proxy, self.is_decode_weights)
+                else:
+                    payload = ModelPayload.record(path, proxy, self.is_decode_weights)
+            except Exception as e:
+                error("decode failed, skipped: %s (%s)", path, e)
+                continue
+
+            yield path, payload
+
+    def decode_parallel(self, paths: list[Path], cache: DecodeCache | None, proxy: ModelProxy | None = None):
+        """ decode in worker processes, only the bpy work runs here """
+
+        is_complete = False
+        is_timed_out = False
+
+        # blocks are named here, so the ones never read can be released whatever happened to their result
+        names = ["swdc_%s" % token_hex(8) for _ in paths]
+        unread = set(names)
+
+        pool = get_context("spawn").Pool(min(len(paths), cpu_count() or 1),
+                                         initializer=init_worker, initargs=(profiler.is_enabled,))
+
+        try:
+            results = [pool.apply_async(decode, (path, proxy, name, self.is_decode_weights))
+                       for path, name in zip(paths, names)]
+
+            # results are collected in order, so a hung file costs at most one timeout
+            for path, block, result in zip(paths, names, results):
+                try:
+                    name, header, profile = result.get(self.decode_timeout)
+                    buffer = ModelPayload.read_shared_memory(name)
+                except TimeoutError:
+                    error("decode timed out, skipped: %s", path)
+                    is_timed_out = True
+                    continue
+                except Exception as e:
+                    error("decode failed, skipped: %s (%s)", path, e)
+                    continue
+
+                unread.discard(block)
+                profiler.merge(path, profile)
+
+                if cache is not None:
+                    cache.store(path, header, buffer, proxy, self.is_decode_weights)
+
+                yield path, ModelPayload.from_buffer(header, memoryview(buffer))
+
+            is_complete = True
+        finally:
+            # an import that failed or stopped early doesn't wait for the files it won't use
+            if is_timed_out or not is_complete:
+                pool.terminate()
+            else:
+                pool.close()
+
+            pool.join()
+
+            for name in unread:
+                ModelPayload.release_shared_memory(name)
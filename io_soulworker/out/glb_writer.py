@@ -0,0 +1,291 @@
+from json import dumps
+from pathlib import Path
+from time import perf_counter
+from urllib.parse import quote
+
+from numpy import array
+from numpy import ascontiguousarray
+from numpy import float32
+from numpy import ndarray
+from numpy import uint16
+from numpy import uint32
+
+from io_soulworker.chunks.mtrs_chunk import MtrsChunk
+from io_soulworker.chunks.skel_chunk import SkelChunk
+from io_soulworker.chunks.vmsh_chunk import VMshChunk
+from io_soulworker.core.binary_writer import BinaryWriter
+from io_soulworker.core.vis_transparency_type import VisTransparencyType
+from io_soulworker.out.model_file import ModelFile
+
+
+GLB_MAGICK = 0x46546C67
+GLB_VERSION = 2
+
+JSON_CHUNK = 0x4E4F534A
+BIN_CHUNK = 0x004E4942
+
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+
+FLOAT = 5126
+UNSIGNED_SHORT = 5123
+UNSIGNED_INT = 5125
+
+POINTS = 0
+LINES = 1
+
+Z_UP_TO_Y_UP = [-0.5 ** 0.5, 0.0, 0.0, 0.5 ** 0.5]
+""" -90 degrees around x as (x, y, z, w): (x, y, z) becomes (x, z, -y) """
+
+ALPHA_MODES = {
+    VisTransparencyType.NONE: "OPAQUE",
+    VisTransparencyType.COLORKEY: "MASK",
+}
+""" every other transparency type blends """
+
+
+def aligned(size: int) -> int:
+    """ glb chunks and buffer views start on 4 byte boundaries """
+
+    return (size + 3) & ~3
+
+
+class GlbWriter(object):
+    """ glTF 2.0 binary of one decoded model.
+
+    Every buffer view is one of the decoded arrays, written as is after the json;
+    primitives are the SUBM ranges of the shared index buffer. Bones become a node tree,
+    skins aren't written. Decoded data is z up, the one scene root turns it to gltf's y up.
+    """
+
+    def __init__(self, model: ModelFile) -> None:
+        self.gltf = {
+            "asset": {"version": "2.0", "generator": "io_soulworker"},
+            "scene": 0,
+            "scenes": [{"nodes": []}],
+            "nodes": [],
+            "buffers": [],
+            "bufferViews": [],
+            "accessors": [],
+        }
+
+        self.arrays: list[ndarray] = []
+        self.length = 0
+
+        name = Path(model.path).stem if isinstance(model.path, (Path, str)) else "model"
+
+        self.root = self.__add_node({"name": name, "rotation": Z_UP_TO_Y_UP})
+        self.gltf["scenes"][0]["nodes"].append(self.root)
+
+        materials = [self.__material(material) for material in model.materials]
+        mesh = model.mesh
+
+        if mesh is not None:
+            submeshes = model.vertices_materials
+            self.__mesh(name, mesh, submeshes.materials if submeshes else [], len(materials))
+
+        skeleton = model.skeleton
+        if skeleton is not None:
+            self.__skeleton(skeleton)
+
+        if materials:
+            self.gltf["materials"] = materials
+
+        if self.arrays:
+            self.gltf["buffers"].append({"byteLength": self.length})
+
+    def __view(self, value: ndarray, target: int) -> int:
+        self.gltf["bufferViews"].append({
+            "buffer": 0,
+            "byteOffset": self.length,
+            "byteLength": value.nbytes,
+            "target": target,
+        })
+
+        self.arrays.append(value)
+        self.length += aligned(value.nbytes)
+
+        return len(self.gltf["bufferViews"]) - 1
+
+    def __accessor(self, view: int, component_type: int, count: int, type: str, offset: int = 0, **bounds) -> int:
+        accessor = {
+            "bufferView": view,
+            "byteOffset": offset,
+            "componentType": component_type,
+            "count": count,
+            "type": type,
+        }
+        accessor.update(bounds)
+
+        self.gltf["accessors"].append(accessor)
+
+        return len(self.gltf["accessors"]) - 1
+
+    def __attribute(self, value: ndarray, type: str, is_bounds: bool = False) -> int:
+        bounds = {"min": value.min(axis=0).tolist(), "max": value.max(axis=0).tolist()} if is_bounds else {}
+        view = self.__view(value, ARRAY_BUFFER)
+
+        return self.__accessor(view, FLOAT, len(value), type, **bounds)
+
+    def __mesh(self, name: str, mesh: VMshChunk, submeshes: list, material_count: int) -> None:
+        attributes = {"POSITION": self.__attribute(mesh.vertices, "VEC3", True)}
+
+        if len(mesh.normals):
+            attributes["NORMAL"] = self.__attribute(mesh.normals, "VEC3")
+
+        if len(mesh.uvs):
+            # decoded uvs are flipped for blender, gltf uses the file's orientation
+            attributes["TEXCOORD_0"] = self.__attribute(mesh.uvs * array((1, -1), float32), "VEC2")
+
+        faces = mesh.faces
+
+        if not len(faces):
+            # point lists, nothing to index
+            self.__add_mesh(name, [{"attributes": attributes, "mode": POINTS}])
+            return
+
+        # strips and non-indexed primitives are written as the lists they were unrolled to;
+        # for indexed triangle lists this is the index buffer itself, not a copy
+        indices = ascontiguousarray(faces.astype(uint16 if mesh.vertex_count <= 0x10000 else uint32, copy=False))
+        indices = indices.reshape(-1)
+
+        component_type = UNSIGNED_SHORT if indices.dtype == uint16 else UNSIGNED_INT
+        view = self.__view(indices, ELEMENT_ARRAY_BUFFER)
+
+        ranges = [mesh.face_range(submesh.indices_start, submesh.indices_count) + (submesh.id,)
+                  for submesh in submeshes] or [(0, len(faces), 0)]
+
+        vertices_per_face = faces.shape[1]
+        primitives = []
+
+        for start, end, material in ranges:
+            primitive = {
+                "attributes": attributes,
+                "indices": self.__accessor(view, component_type, (end - start) * vertices_per_face, "SCALAR",
+                                           start * vertices_per_face * indices.itemsize),
+            }
+
+            if vertices_per_face == 2:
+                primitive["mode"] = LINES
+
+            if 0 <= material < material_count:
+                primitive["material"] = material
+
+            primitives.append(primitive)
+
+        self.__add_mesh(name, primitives)
+
+    def __add_node(self, node: dict, parent: int | None = None) -> int:
+        self.gltf["nodes"].append(node)
+        index = len(self.gltf["nodes"]) - 1
+
+        if parent is not None:
+            self.gltf["nodes"][parent].setdefault("children", []).append(index)
+
+        return index
+
+    def __add_mesh(self, name: str, primitives: list[dict]) -> None:
+        self.gltf.setdefault("meshes", []).append({"name": name, "primitives": primitives})
+
+        self.__add_node({"name": name, "mesh": len(self.gltf["meshes"]) - 1}, self.root)
+
+    def __material(self, chunk: MtrsChunk) -> dict:
+        material = {
+            "name": chunk.name,
+            "pbrMetallicRoughness": {"metallicFactor": 0.0},
+            "alphaMode": ALPHA_MODES.get(chunk.transparency_type, "BLEND"),
+        }
+
+        if material["alphaMode"] == "MASK" and hasattr(chunk, "custom_alpha_threshold"):
+            material["alphaCutoff"] = chunk.custom_alpha_threshold
+
+        if chunk.diffuse_map:
+            material["pbrMetallicRoughness"]["baseColorTexture"] = {"index": self.__texture(chunk.diffuse_map)}
+
+        return material
+
+    def __texture(self, path: str) -> int:
+        """ texture of an image referenced by its original relative path, images aren't converted """
+
+        uri = quote(path.replace("\\", "/"))
+
+        images = self.gltf.setdefault("images", [])
+        textures = self.gltf.setdefault("textures", [])
+
+        for i, texture in enumerate(textures):
+            if images[texture["source"]]["uri"] == uri:
+                return i
+
+        images.append({"uri": uri})
+        textures.append({"source": len(images) - 1})
+
+        return len(textures) - 1
+
+    def __skeleton(self, skeleton: SkelChunk) -> None:
+        first = len(self.gltf["nodes"])
+
+        for bone in skeleton.bones:
+            w, x, y, z = bone.local_rot
+
+            self.gltf["nodes"].append({
+                "name": bone.name,
+                "translation": list(bone.local_pos),
+                "rotation": [x, y, z, w],
+            })
+
+        for i, parent in enumerate(skeleton.parents()):
+            parent = self.root if parent < 0 else first + parent
+            self.gltf["nodes"][parent].setdefault("children", []).append(first + i)
+
+    def write(self, path: Path) -> int:
+        """ returns the file size """
+
+        data = dumps(self.gltf, separators=(",", ":")).encode("utf-8")
+        data += b" " * (aligned(len(data)) - len(data))
+
+        size = 12 + 8 + len(data) + (8 + self.length if self.arrays else 0)
+
+        with BinaryWriter(path) as writer:
+            writer.write_uint32(GLB_MAGICK)
+            writer.write_uint32(GLB_VERSION)
+            writer.write_uint32(size)
+
+            writer.write_uint32(len(data))
+            writer.write_uint32(JSON_CHUNK)
+            writer.write(data)
+
+            if self.arrays:
+                writer.write_uint32(self.length)
+                writer.write_uint32(BIN_CHUNK)
+
+                for value in self.arrays:
+                    writer.write_array(value)
+                    writer.write(bytes(aligned(value.nbytes) - value.nbytes))
+
+        return size
+
+
+def convert(paths: tuple[Path, Path]) -> dict:
+    """ worker entry point: one .model to .glb, with the numbers for the throughput report """
+
+    source, target = paths
+    start = perf_counter()
+
+    try:
+        with ModelFile(source) as model:
+            writer = GlbWriter(model)
+            vertices = len(model.mesh.vertices) if model.mesh else 0
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        size = writer.write(target)
+    except Exception as e:
+        return {"source": str(source), "error": "%s: %s" % (type(e).__name__, e)}
+
+    return {
+        "source": str(source),
+        "target": str(target),
+        "bytes_in": source.stat().st_size,
+        "bytes_out": size,
+        "vertices": vertices,
+        "time": perf_counter() - start,
+    }
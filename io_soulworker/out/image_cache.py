@@ -0,0 +1,50 @@
+import bpy
+
+from bpy.types import Image
+
+from logging import debug
+from logging import error
+from pathlib import Path
+
+
+class ImageCache(object):
+    """ Texture paths and images shared by every file of an import batch.
+
+    Each texture path is stat'ed once and each image file is loaded once.
+    """
+
+    def __init__(self) -> None:
+        self.__paths: dict[tuple[Path, str], Path | None] = {}
+        self.__images: dict[Path, Image] = {}
+
+    def resolve(self, model: Path, texture: str) -> Path | None:
+        """ absolute texture path next to the model, or in its Textures folder """
+
+        key = (model.parent, texture)
+
+        if key not in self.__paths:
+            self.__paths[key] = ImageCache.__resolve(model.parent, texture)
+
+        return self.__paths[key]
+
+    def load(self, path: Path) -> Image:
+        image = self.__images.get(path)
+
+        if image is None:
+            image = self.__images[path] = bpy.data.images.load(str(path), check_existing=True)
+            debug("texture loaded: %s", path)
+
+        return image
+
+    def __resolve(root: Path, texture: str) -> Path | None:
+        path = root / texture
+
+        if not path.is_file():
+            error("FILE NOT FOUND %s", path)
+
+            path = root / 'Textures' / path.name
+            if not path.is_file():
+                error("FILE NOT FOUND %s", path)
+                return None
+
+        return path.resolve()
@@ -0,0 +1,40 @@
+from enum import Enum
+from pathlib import Path
+
+from bpy.types import Material
+
+from io_soulworker.chunks.mtrs_chunk import MtrsChunk
+from io_soulworker.core.vis_color import VisColor
+
+
+class MaterialCache(object):
+    """ Materials shared by every file of an import batch, keyed by their decoded fields """
+
+    def __init__(self) -> None:
+        self.__materials: dict[tuple, Material] = {}
+
+    def fingerprint(chunk: MtrsChunk, texture: Path | None, emission_strength: float) -> tuple:
+        """ every decoded MTRS field; the diffuse map is keyed by the file it resolves to,
+            so the same relative path in two folders stays two materials """
+
+        def value(item):
+            if isinstance(item, VisColor):
+                return (item.r, item.g, item.b, item.a)
+
+            if isinstance(item, Enum):
+                return item.value
+
+            if isinstance(item, list):
+                return tuple(item)
+
+            return item
+
+        fields = tuple((key, value(item)) for key, item in sorted(vars(chunk).items()) if key != "diffuse_map")
+
+        return (fields, texture, emission_strength)
+
+    def get(self, key: tuple) -> Material | None:
+        return self.__materials.get(key)
+
+    def add(self, key: tuple, material: Material) -> None:
+        self.__materials[key] = material
@@ -0,0 +1,44 @@
+from io_soulworker.chunks.mtrs_chunk import MtrsChunk
+from io_soulworker.chunks.skel_chunk import SkelChunk
+from io_soulworker.chunks.subm_chunk import SubmChunk
+from io_soulworker.chunks.vmsh_chunk import VMshChunk
+from io_soulworker.chunks.wght_chunk import WghtChunk
+from io_soulworker.core.vis_chunk_file import VisChunkFile
+from io_soulworker.core.vis_chunk_id import VisChunkId
+from io_soulworker.out.model_file_reader import ModelFileReader
+
+
+class ModelFile(VisChunkFile):
+    """ .model file whose chunks are only decoded when asked for
+
+    with ModelFile(path) as model:
+        names = [material.name for material in model.materials]
+    """
+
+    decoders = {
+        VisChunkId.MTRS: ModelFileReader.read_materials,
+        VisChunkId.VMSH: lambda reader: VMshChunk(VisChunkId.VMSH, reader),
+        VisChunkId.SUBM: SubmChunk,
+        VisChunkId.SKEL: SkelChunk,
+        VisChunkId.WGHT: ModelFileReader.read_weights,
+    }
+
+    @property
+    def materials(self) -> list[MtrsChunk]:
+        return self.get(VisChunkId.MTRS, [])
+
+    @property
+    def mesh(self) -> VMshChunk | None:
+        return self.get(VisChunkId.VMSH)
+
+    @property
+    def vertices_materials(self) -> SubmChunk | None:
+        return self.get(VisChunkId.SUBM)
+
+    @property
+    def skeleton(self) -> SkelChunk | None:
+        return self.get(VisChunkId.SKEL)
+
+    @property
+    def weights(self) -> WghtChunk | None:
+        return self.get(VisChunkId.WGHT)
@@ -1,113 +1,96 @@
 
 from logging import debug
+from logging import error
 from pathlib import Path
-
-from xml.etree.ElementTree import Element, parse
+from struct import error as StructError
 
 from io_soulworker.core.vis_material import VisMaterial
 from io_soulworker.core.vis_chunk_file import VisChunkFileReader
+from io_soulworker.core.vis_chunk_file import is_chunk_end
 from io_soulworker.core.vis_chunk_id import VisChunkId
 from io_soulworker.core.binary_reader import BinaryReader
 from io_soulworker.chunks.subm_chunk import SubmChunk
 from io_soulworker.chunks.mtrs_chunk import MtrsChunk
 from io_soulworker.chunks.vmsh_chunk import VMshChunk
 from io_soulworker.chunks.skel_chunk import SkelChunk
-from io_soulworker.core.vis_transparency_type import VisTransparencyType
-from io_soulworker.core.xml_helper.exchange_transparency import exchange_transparency
+from io_soulworker.chunks.wght_chunk import WghtChunk
+from io_soulworker.core.xml_helper.material_overrides import overrides
 
 
 class ModelFileReader(VisChunkFileReader):
 
+    is_decode_weights: bool
+    """ WGHT is only decoded when asked for, its layout hasn't been checked against game files """
+
     def on_surface(self, _: MtrsChunk): debug('Not impl callback')
     def on_mesh(self, _: VMshChunk): debug('Not impl callback')
     def on_skeleton(self, _: SkelChunk): debug('Not impl callback')
-    def on_skeleton_weights(self): debug('Not impl callback')
+    def on_skeleton_weights(self, _: WghtChunk): debug('Not impl callback')
     def on_vertices_material(self, _: SubmChunk): debug('Not impl callback')
 
-    def on_chunk_start(self, cid: VisChunkId, reader: BinaryReader) -> None:
-        if cid == VisChunkId.MTRS:
-            self.__parse_materials(reader)
-
-        elif cid == VisChunkId.VMSH:
-            self.__parse_mesh(cid, reader)
+    def __init__(self, path: Path, is_decode_weights: bool = False) -> None:
+        super().__init__(path)
 
-        elif cid == VisChunkId.SKEL:
-            self.__parse_skeleton(reader)
+        self.is_decode_weights = is_decode_weights
 
-        elif cid == VisChunkId.WGHT:
-            self.on_skeleton_weights()
+        self.handlers = {
+            VisChunkId.MTRS: self.__parse_materials,
+            VisChunkId.VMSH: self.__parse_mesh,
+            VisChunkId.SKEL: self.__parse_skeleton,
+            VisChunkId.SUBM: self.__parse_vertices_materials,
+        }
 
-        elif cid == VisChunkId.SUBM:
-            self.__parse_vertices_materials(reader)
+        if is_decode_weights:
+            self.handlers[VisChunkId.WGHT] = self.__parse_skeleton_weights
 
     def __parse_skeleton(self, reader: BinaryReader):
         self.on_skeleton(SkelChunk(reader))
 
+    def __parse_skeleton_weights(self, reader: BinaryReader):
+        chunk = ModelFileReader.read_weights(reader)
+
+        if chunk is not None:
+            self.on_skeleton_weights(chunk)
+
     def __parse_vertices_materials(self, reader: BinaryReader):
         self.on_vertices_material(SubmChunk(reader))
 
-    def __parse_mesh(self, cid: VisChunkId, reader: BinaryReader):
-        self.on_mesh(VMshChunk(cid, reader))
+    def __parse_mesh(self, reader: BinaryReader):
+        self.on_mesh(VMshChunk(VisChunkId.VMSH, reader))
 
     def __parse_materials(self, reader: BinaryReader):
+        for chunk in ModelFileReader.read_materials(reader):
+            self.on_surface(chunk)
+
+    def read_materials(reader: BinaryReader) -> list[MtrsChunk]:
+        """ MTRS payload, with materials.xml overrides applied """
+
         overrides = ModelFileReader.__xml_material(reader)
 
         count = reader.read_uint32()
+        chunks = [MtrsChunk(reader) for _ in range(count)]
 
-        for _ in range(count):
-            chunk = MtrsChunk(reader)
-
+        for chunk in chunks:
             override = overrides.get(chunk.name)
             if override:
                 chunk.diffuse_map = override.diffuse
 
-            self.on_surface(chunk)
-
-    def __xml_material(reader: BinaryReader) -> dict[str, VisMaterial]:
-        paths = ModelFileReader.__materials_paths(Path(reader.name))
-
-        values = dict()
-
-        for path in paths:
-            debug('try load from: %s', path)
-
-            if Path.exists(path):
-                debug('load from: %s', path)
-                values.update(ModelFileReader.__material_from_file(path))
-
-        return values
-
-    def __material_from_file(path: Path) -> dict[str, VisMaterial]:
-        def __float(name: str, node: Element): float(node.attrib.get(name))
-        def __int(name: str, node: Element): int(node.attrib.get(name))
-
-        def __color(name: str, node: Element): return [
-            int(v) for v in node.attrib.get(name).split(',')]
+        return chunks
 
-        def create(node: Element) -> tuple[str, VisMaterial]:
-            material = VisMaterial()
-            material.name = node.attrib.get("name")
+    def read_weights(reader: BinaryReader) -> WghtChunk | None:
+        """ WGHT payload, None when it doesn't decode; its layout is a guess, a bad one costs the weights only """
 
-            material.ambient = __color("ambient", node)
+        try:
+            chunk = WghtChunk(reader)
 
-            material.diffuse = node.attrib.get("diffuse")
-            material.transparency = VisTransparencyType(
-                exchange_transparency(node.attrib.get("transparency")))
+            # a layout that doesn't match stops short of or runs past the payload
+            if not is_chunk_end(reader, VisChunkId.WGHT):
+                raise ValueError("decoded size doesn't match the chunk")
 
-            material.alphathreshold = __float("alphathreshold", node)
+            return chunk
+        except (ValueError, EOFError, StructError) as e:
+            error("skin weights skipped, mesh imported without them: %s (%s)", reader.name, e)
+            return None
 
-            return [material.name, material]
-
-        xml = parse(path)
-        root = xml.getroot()
-
-        materials = root.find('Materials')
-
-        return dict(map(create, (node for node in materials if node.tag == 'Material')))
-
-    def __materials_paths(path: Path):
-        # NPC_0001_Mirium.model -> NPC_0001_Mirium.model_data\\materials.xml
-        yield path.parent / (path.name + "_data/materials.xml")
-
-        # NPC_0001_Mirium.model -> Overrides\\NPC_0001_Mirium.model_data\\materials.xml
-        yield path.parent / "Overrides" / (path.name + "_data/materials.xml")
+    def __xml_material(reader: BinaryReader) -> dict[str, VisMaterial]:
+        return overrides.find(Path(reader.name))
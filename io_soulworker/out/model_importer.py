@@ -12,30 +12,89 @@ from mathutils import Matrix
 from mathutils import Quaternion
 from mathutils import Vector
 
+from numpy import arange
+from numpy import ascontiguousarray
+from numpy import float32
+from numpy import full
+from numpy import int32
+from numpy import ones
+from numpy import unique
+from numpy import zeros
+
 from pathlib import Path
 from logging import debug
-from logging import error
+from logging import info
 
 from io_soulworker.chunks.skel_chunk import SkelChunk
 from io_soulworker.chunks.vmsh_chunk import VMshChunk
 from io_soulworker.chunks.mtrs_chunk import MtrsChunk
 from io_soulworker.chunks.subm_chunk import SubmChunk
+from io_soulworker.chunks.wght_chunk import WghtChunk
+from io_soulworker.chunks.wght_chunk import weight_buckets
+from io_soulworker.core.mesh_weld import MeshWeld
+from io_soulworker.core.profiler import profiler
 from io_soulworker.core.vis_transparency_type import VisTransparencyType
+from io_soulworker.out.image_cache import ImageCache
+from io_soulworker.out.material_cache import MaterialCache
 from io_soulworker.out.model_file_reader import ModelFileReader
+from io_soulworker.out.model_proxy import ARMATURE
+from io_soulworker.out.model_proxy import OPTIONS
+from io_soulworker.out.model_proxy import PROXY
+from io_soulworker.out.model_proxy import SOURCE
+
+
+BONE_TAIL = Vector((0.01, 0.01, 0.01))
+""" bones carry no length, each one gets a short tail """
+
+BONE_INDEX = "soulworker_index"
+""" custom property of an armature bone: its index in SkelChunk.bones """
+
+BONE_BIND = "soulworker_bind"
+""" custom property of an armature bone: file rest rotation (w, x, y, z), rest position,
+    and the rotation from the file's object space frame to the blender bone's """
 
 
 class ModelImporter(ModelFileReader):
 
     mesh: Mesh = None
     object: Object = None
+    armature_object: Object = None
+    mesh_chunk: VMshChunk | None = None
+    skeleton_chunk: SkelChunk | None = None
+    weights_chunk: WghtChunk | None = None
+    weld: MeshWeld | None = None
     context: Context
     emission_strength: float
+    is_create_vertex_groups: bool
+    max_influences: int
+    is_recalc_normals: bool
+    is_weld: bool
+    weld_distance: float
+    proxy: str
+    images: ImageCache
+    materials: MaterialCache | None
+
+    def __init__(self, path: Path, context: Context, emission_strength: float,
+                 is_create_vertex_groups: bool = False, images: ImageCache | None = None,
+                 materials: MaterialCache | None = None, max_influences: int = 4,
+                 is_recalc_normals: bool = False, is_weld: bool = False, weld_distance: float = 1e-5,
+                 proxy: str = "", is_decode_weights: bool = False) -> None:
+
+        super().__init__(path, is_decode_weights)
 
-    def __init__(self, path: Path, context: Context, emission_strength: float) -> None:
+        self.emission_strength = emission_strength
+        self.is_create_vertex_groups = is_create_vertex_groups
+        self.max_influences = max_influences
+        self.is_recalc_normals = is_recalc_normals
+        self.is_weld = is_weld
+        self.weld_distance = weld_distance
+        self.proxy = proxy
 
-        super().__init__(path)
+        # shared by the whole batch when given
+        self.images = images if images is not None else ImageCache()
 
-        self.emission_strength = emission_strength
+        # identical materials are reused when given
+        self.materials = materials
 
         # save context
         self.context = context
@@ -46,9 +105,22 @@ class ModelImporter(ModelFileReader):
         # create object
         self.object = bpy.data.objects.new(self.mesh.name, self.mesh)
 
+        # proxies are swapped for the file they came from later, imported the same way
+        self.object[SOURCE] = str(self.path)
+        self.object[PROXY] = proxy
+        self.object[OPTIONS] = {
+            "emission_strength": emission_strength,
+            "is_create_vertex_groups": is_create_vertex_groups,
+            "max_influences": max_influences,
+            "is_recalc_normals": is_recalc_normals,
+            "is_weld": is_weld,
+            "weld_distance": weld_distance,
+            "is_decode_weights": is_decode_weights,
+        }
+
     def on_surface(self, chunk: MtrsChunk):
 
-        def create_blender_nodes(material: Material):
+        def create_blender_nodes(material: Material, path: Path | None):
 
             node_tree = material.node_tree
             nodes = node_tree.nodes
@@ -71,21 +143,13 @@ class ModelImporter(ModelFileReader):
             #     )
             # else:
 
-            path = self.path.parent / chunk.diffuse_map
-
-            if not path.exists() or not path.is_file():
-                error("FILE NOT FOUND %s", path)
-
-                path = self.path.parent / 'Textures' / path.name
-                if not path.exists() or not path.is_file():
-                    error("FILE NOT FOUND %s", path)
-                    return
+            if path is None:
+                return
 
             texture_node: ShaderNodeTexImage = nodes.new("ShaderNodeTexImage")
             debug("texture path: %s", path)
 
-            texture_node.image = bpy.data.images.load(path.__str__())
-            debug("texture loaded: %s", path)
+            texture_node.image = self.images.load(path)
 
             node_tree.links.new(
                 pbsdf_node.inputs.get("Base Color"),
@@ -114,109 +178,240 @@ class ModelImporter(ModelFileReader):
 
             # material.alpha_threshold = v_material.alphathreshold
 
-        material = bpy.data.materials.new(chunk.name)
-        material.use_nodes = True
+        with profiler.span("material build"):
+            path = self.images.resolve(self.path, chunk.diffuse_map)
+
+            key = MaterialCache.fingerprint(chunk, path, self.emission_strength)
+            material = self.materials.get(key) if self.materials is not None else None
+
+            if material is None:
+                material = bpy.data.materials.new(chunk.name)
+                material.use_nodes = True
+
+                create_blender_nodes(material, path)
 
-        create_blender_nodes(material)
+                if self.materials is not None:
+                    self.materials.add(key, material)
+            else:
+                debug("reuse material: %s", material.name)
 
-        self.mesh.materials.append(material)
+            self.mesh.materials.append(material)
+
+        profiler.count("material build", 1)
 
     def on_mesh(self, chunk: VMshChunk):
 
-        self.mesh_chunk = chunk
+        with profiler.span("mesh build"):
+            self.mesh_chunk = chunk
+
+            vertices, faces, corners = chunk.vertices, chunk.faces, chunk.faces
+
+            if self.is_weld:
+                self.weld = MeshWeld(chunk.vertices, chunk.faces, self.weld_distance)
+                vertices, faces, corners = self.weld.vertices, self.weld.faces, self.weld.corners
+
+                info("weld %s: %s", self.path.name, self.weld.counts)
 
-        # fill vertices, edges and faces from file
-        self.mesh.from_pydata(chunk.vertices, [], chunk.faces)
+            edges = None
 
-        uv_layer = self.mesh.uv_layers.new()
+            if faces.shape[1] < 3:
+                # line lists become loose edges, kept by update(calc_edges=True)
+                edges, faces, corners = faces, faces[:0, :0].reshape(0, 3), corners[:0, :0].reshape(0, 3)
 
-        for face in self.mesh.polygons:
-            for vert_idx, loop_idx in zip(face.vertices, face.loop_indices):
-                uv_layer.data[loop_idx].uv = chunk.uvs[vert_idx]
+            face_count, vertices_per_face = faces.shape
+            loops = faces.ravel()
 
-        # self.mesh.normals_split_custom_set(chunk.normals)
-        self.mesh.calc_normals()
-        self.mesh.update()
+            # decoded vertex of every loop, per vertex attributes are picked with it
+            corners = corners.ravel()
 
-        self.context.collection.objects.link(self.object)
+            # fill vertices, loops and faces from file in bulk
+            self.mesh.vertices.add(len(vertices))
+            self.mesh.loops.add(len(loops))
+            self.mesh.polygons.add(face_count)
+
+            self.mesh.vertices.foreach_set("co", vertices.ravel())
+
+            if edges is not None:
+                self.mesh.edges.add(len(edges))
+                self.mesh.edges.foreach_set("vertices", edges.ravel().astype(int32))
+            self.mesh.loops.foreach_set("vertex_index", loops.astype(int32))
+            self.mesh.polygons.foreach_set("loop_start", arange(0, len(loops), vertices_per_face, dtype=int32))
+
+            # derived from loop_start (and read-only) since 3.6
+            if bpy.app.version < (3, 6, 0):
+                self.mesh.polygons.foreach_set("loop_total", full(face_count, vertices_per_face, int32))
+
+            uv_layer = self.mesh.uv_layers.new()
+
+            if len(chunk.uvs):
+                # uvs are stored per vertex, blender wants them per loop
+                uv_layer.data.foreach_set("uv", chunk.uvs[corners].ravel())
+
+            self.mesh.update(calc_edges=True)
+
+            if len(chunk.normals):
+                # the file's normals as custom normals, so its hard edges survive
+                if bpy.app.version < (4, 1, 0):
+                    self.mesh.use_auto_smooth = True
+
+                self.mesh.polygons.foreach_set("use_smooth", ones(face_count, bool))
+
+                if self.weld is None:
+                    self.mesh.normals_split_custom_set_from_vertices(ascontiguousarray(chunk.normals, float32))
+                else:
+                    # welded vertices keep the normal of every seam side per loop
+                    self.mesh.normals_split_custom_set(ascontiguousarray(chunk.normals[corners], float32))
+
+            # gone in 4.0, normals are always computed on demand there
+            if self.is_recalc_normals and bpy.app.version < (4, 0, 0):
+                self.mesh.calc_normals()
+
+            self.context.collection.objects.link(self.object)
+
+        profiler.count("mesh build", face_count)
+
+        self.__bind_skin()
 
     def on_skeleton(self, chunk: SkelChunk):
-        armature = bpy.data.armatures.new("Skeleton")
-        armature_object = bpy.data.objects.new("Bones", armature)
-        bpy.context.scene.collection.objects.link(armature_object)
-        bpy.context.view_layer.objects.active = armature_object
-        bpy.ops.object.mode_set(mode='OBJECT')
-        for i in bpy.context.scene.collection.objects:
-            i.select_set(state=False)  # deselect all objects
-        armature_object.select_set(state=True)
-        bpy.ops.object.mode_set(mode="EDIT")
-        boneParentList = []
-        boneParentMat = {}
-        for bone in chunk.bones:
-
-            boneParentList.append(bone.name)
-            new = armature.edit_bones.new(bone.name)
-            boneLocalMat = bone.local_rot_euler.to_matrix().to_4x4()
-            boneLocalMat.translation = bone.local_pos
-
-            armature_mat = boneLocalMat
-            if(bone.parent_id != 65535): #-1
-              armature_mat = boneParentMat[boneParentList[bone.parent_id]] @ boneLocalMat
-            boneParentMat[bone.name] = armature_mat
-
-            newMatBone = bone.local_rot.to_matrix().to_4x4()
-            newMatBone.translation = armature_mat.to_translation()
-            new.transform(newMatBone)
-            new.tail = new.head + Vector((0.01, 0.01, 0.01))
-            for obj in chunk.bones:
-              if obj.id == bone.parent_id:
-                debug("Found parent for %s, its %s",bone.name,obj.name)
-                for editbone in armature.edit_bones:
-                    if editbone.name == obj.name:
-                        debug("Attached parent.")
-                        new.parent = editbone
-                        break
-                break
-        bpy.ops.object.mode_set(mode="OBJECT")
-        bpy.context.view_layer.update()
-
-    # def process_wght(self, chunk: VisChunkId, reader: BinaryReader):
-    #     pass
+        with profiler.span("skeleton build"):
+            armature = bpy.data.armatures.new("Skeleton")
+            armature_object = bpy.data.objects.new("Bones", armature)
+            self.context.scene.collection.objects.link(armature_object)
 
-    def on_vertices_material(self, chunk: SubmChunk):
+            self.armature_object = armature_object
+            self.skeleton_chunk = chunk
+
+            # removed along with the mesh, parented to it or not
+            self.object[ARMATURE] = armature_object
+
+            parents = chunk.parents()
+            rotations = [Quaternion(bone.local_rot).to_matrix().to_4x4() for bone in chunk.bones]
 
-        # TODO: i have no idea how this can be done without touching the interface.
-        # hope someone can help me with this.
-        def set_material(vertex_group_name: str, material_id: int):
+            # object space matrix of every bone in one pass, parents are composed first
+            world: list[Matrix | None] = [None] * len(chunk.bones)
 
+            for i in chunk.order():
+                local = rotations[i].copy()
+                local.translation = chunk.bones[i].local_pos
+
+                parent = parents[i]
+                world[i] = world[parent] @ local if parent >= 0 and world[parent] is not None else local
+
+            # edit bones only exist in edit mode, enter it for the armature alone
+            view_layer = self.context.view_layer
+            view_layer.objects.active = armature_object
+            bpy.ops.object.mode_set(mode="OBJECT")
+
+            for selected in self.context.selected_objects:
+                selected.select_set(False)
+
+            armature_object.select_set(True)
             bpy.ops.object.mode_set(mode="EDIT")
-            bpy.ops.object.vertex_group_set_active(group=vertex_group_name)
-            bpy.ops.object.vertex_group_select()
 
-            self.object.active_material_index = material_id
+            edit_bones = [armature.edit_bones.new(bone.name) for bone in chunk.bones]
+
+            for i, edit_bone in enumerate(edit_bones):
+                matrix = rotations[i]
+                matrix.translation = world[i].to_translation()
+
+                edit_bone.transform(matrix)
+                edit_bone.tail = edit_bone.head + BONE_TAIL
+
+                if parents[i] >= 0:
+                    edit_bone.parent = edit_bones[parents[i]]
+
+            # blender may rename, edit bones are gone once edit mode is left
+            names = [edit_bone.name for edit_bone in edit_bones]
 
-            bpy.ops.object.material_slot_assign()
-            bpy.ops.mesh.select_all(action="DESELECT")
             bpy.ops.object.mode_set(mode="OBJECT")
+            view_layer.update()
+
+            # what AnimImporter needs to move file keys into pose space
+            for i, (name, bone) in enumerate(zip(names, chunk.bones)):
+                rest = armature.bones[name]
+                offset = world[i].to_quaternion().inverted() @ rest.matrix_local.to_quaternion()
+
+                rest[BONE_INDEX] = i
+                rest[BONE_BIND] = [*bone.local_rot, *bone.local_pos, *offset]
+
+        profiler.count("skeleton build", len(chunk.bones))
+
+        self.__bind_skin()
+
+    def on_skeleton_weights(self, chunk: WghtChunk):
+        self.weights_chunk = chunk
+
+        self.__bind_skin()
+
+    def __bind_skin(self):
+        """ vertex group per bone and an armature modifier, once mesh, bones and weights are all read """
+
+        if self.mesh_chunk is None or self.skeleton_chunk is None or self.weights_chunk is None:
+            return
+
+        with profiler.span("skin build"):
+            bones = self.skeleton_chunk.bones
+            vertices, bone_ids, weights = self.weights_chunk.influences(self.max_influences, len(bones))
+
+            is_in_mesh = vertices < len(self.mesh_chunk.vertices)
+            vertices, bone_ids, weights = vertices[is_in_mesh], bone_ids[is_in_mesh], weights[is_in_mesh]
+
+            if self.weld is not None:
+                # seam copies carry the same weights, the last one written wins
+                vertices = self.weld.remap[vertices]
+
+            # the armature modifier matches groups to bones by name
+            vertex_groups = [self.object.vertex_groups.new(name=bone.name) for bone in bones]
+
+            for bone, weight, members in weight_buckets(vertices, bone_ids, weights):
+                vertex_groups[bone].add(members.tolist(), weight, "REPLACE")
+
+            modifier = self.object.modifiers.new("Armature", "ARMATURE")
+            modifier.object = self.armature_object
+
+            self.object.parent = self.armature_object
+
+        profiler.count("skin build", len(weights))
+
+    def on_vertices_material(self, chunk: SubmChunk):
+
+        with profiler.span("submesh build"):
+            faces = self.mesh_chunk.faces
+            material_index = zeros(len(faces), int32)
+
+            materials = self.mesh.materials
+            vertex_groups = self.object.vertex_groups
+
+            for material in chunk.materials:
+                # submesh ranges are in indices, faces are consecutive runs of them
+                start, end = self.mesh_chunk.face_range(material.indices_start, material.indices_count)
+
+                material_index[start:end] = material.id
+
+                if self.is_create_vertex_groups:
+                    name = materials[material.id].name_full
+                    vertex_group = vertex_groups.new(name=name)
 
-        materials = self.mesh.materials
-        vertex_groups = self.object.vertex_groups
+                    indices = faces[start:end].ravel()
+                    if self.weld is not None:
+                        indices = self.weld.remap[indices]
 
-        bpy.context.view_layer.objects.active = self.object
+                    vertex_group.add(unique(indices).tolist(), 1, "REPLACE")
 
-        for material in chunk.materials:
-            name = materials[material.id].name_full
-            vertex_group = vertex_groups.new(name=name)
+                debug("material_id: %d", material.id)
+                debug("indices_start: %d", material.indices_start)
+                debug("indices_count: %d", material.indices_count)
 
-            indices = self.mesh_chunk.indices[material.indices_start:
-                                              material.indices_start + material.indices_count]
-            vertex_group.add(indices, 1, "REPLACE")
+            if self.weld is not None:
+                # ranges are in decoded faces, only the faces left are in the mesh
+                material_index = material_index[self.weld.kept]
 
-            set_material(vertex_group.name, material.id)
+            # line lists have no polygons to assign to
+            if faces.shape[1] >= 3:
+                self.mesh.polygons.foreach_set("material_index", material_index)
+            self.mesh.update()
 
-            debug("material_id: %d", material.id)
-            debug("indices_start: %d", material.indices_start)
-            debug("indices_count: %d", material.indices_count)
+        profiler.count("submesh build", len(chunk.materials))
 
 
 # https://youtu.be/UXQGKfCWCBc
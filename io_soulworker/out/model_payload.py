@@ -0,0 +1,247 @@
+from enum import Enum
+from os import name as os_name
+from pathlib import Path
+from pickle import dumps
+from pickle import loads
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+from numpy import frombuffer
+from numpy import ndarray
+
+from io_soulworker.chunks.mtrs_chunk import MtrsChunk
+from io_soulworker.chunks.skel_chunk import SkelChunk
+from io_soulworker.chunks.subm_chunk import SubmChunk
+from io_soulworker.chunks.vmsh_chunk import VMshChunk
+from io_soulworker.chunks.wght_chunk import WghtChunk
+from io_soulworker.core.profiler import profiler
+from io_soulworker.out.model_file_reader import ModelFileReader
+from io_soulworker.out.model_proxy import ModelProxy
+
+
+ALIGNMENT = 16
+
+READ_FLAG_SIZE = ALIGNMENT
+""" shared memory blocks start with a flag the receiving process sets once it copied the arrays out """
+
+
+class ArrayRef(object):
+    """ Placeholder left in a decoded chunk for an array stored in the flat buffer """
+
+    def __init__(self, offset: int, value: ndarray) -> None:
+        self.offset = offset
+        self.dtype = value.dtype.str
+        self.shape = value.shape
+        self.nbytes = value.nbytes
+
+
+def aligned(size: int) -> int:
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def buffer_size(arrays: list[ndarray]) -> int:
+    return sum(aligned(array.nbytes) for array in arrays)
+
+
+def write_arrays(arrays: list[ndarray], buffer: memoryview):
+    offset = 0
+
+    for array in arrays:
+        target = frombuffer(buffer, array.dtype, array.size, offset)
+        target[:] = array.ravel()
+
+        offset += aligned(array.nbytes)
+
+
+def detach_arrays(value, arrays: list[ndarray]):
+    """ Replace every numpy array reachable through lists, tuples and object attributes with an ArrayRef """
+
+    if isinstance(value, ndarray):
+        offset = buffer_size(arrays)
+        arrays.append(value)
+
+        return ArrayRef(offset, value)
+
+    if isinstance(value, list):
+        value[:] = [detach_arrays(item, arrays) for item in value]
+    elif isinstance(value, tuple):
+        return tuple(detach_arrays(item, arrays) for item in value)
+    elif hasattr(value, "__dict__") and not isinstance(value, Enum):
+        for key, item in vars(value).items():
+            setattr(value, key, detach_arrays(item, arrays))
+
+    return value
+
+
+def attach_arrays(value, buffer: memoryview):
+    """ Inverse of detach_arrays, arrays become views into buffer """
+
+    if isinstance(value, ArrayRef):
+        view = buffer[value.offset:value.offset + value.nbytes]
+
+        return frombuffer(view, value.dtype).reshape(value.shape)
+
+    if isinstance(value, list):
+        value[:] = [attach_arrays(item, buffer) for item in value]
+    elif isinstance(value, tuple):
+        return tuple(attach_arrays(item, buffer) for item in value)
+    elif hasattr(value, "__dict__") and not isinstance(value, Enum):
+        for key, item in vars(value).items():
+            setattr(value, key, attach_arrays(item, buffer))
+
+    return value
+
+
+class ModelRecorder(ModelFileReader):
+    """ Decodes a file and keeps the reader callbacks, so they can be replayed elsewhere """
+
+    def __init__(self, path: Path, is_decode_weights: bool = False) -> None:
+        super().__init__(path, is_decode_weights)
+
+        self.events: list[tuple[str, tuple]] = []
+
+    def on_surface(self, chunk: MtrsChunk): self.events.append(("on_surface", (chunk,)))
+    def on_mesh(self, chunk: VMshChunk): self.events.append(("on_mesh", (chunk,)))
+    def on_skeleton(self, chunk: SkelChunk): self.events.append(("on_skeleton", (chunk,)))
+    def on_skeleton_weights(self, chunk: WghtChunk): self.events.append(("on_skeleton_weights", (chunk,)))
+    def on_vertices_material(self, chunk: SubmChunk): self.events.append(("on_vertices_material", (chunk,)))
+
+
+class ModelPayload(object):
+    """ Recorded callbacks of one decoded file.
+
+    Numpy arrays are moved into one flat buffer (shared memory between processes),
+    only the small remainder is pickled.
+    """
+
+    events: list[tuple[str, tuple]]
+
+    __handles: list[SharedMemory] = []
+    """ blocks this worker created on windows, held until the receiving process flags them read """
+
+    def __init__(self, events: list[tuple[str, tuple]]) -> None:
+        self.events = events
+
+    def replay(self, reader: ModelFileReader) -> None:
+        for name, args in self.events:
+            getattr(reader, name)(*args)
+
+    def detach(self) -> tuple[bytes, list[ndarray]]:
+        """ pickled remainder and the arrays it refers to; the recorded chunks keep only ArrayRefs """
+
+        arrays = []
+        header = dumps(detach_arrays(self.events, arrays))
+
+        return header, arrays
+
+    def to_buffer(self) -> tuple[bytes, bytearray]:
+        header, arrays = self.detach()
+
+        buffer = bytearray(buffer_size(arrays))
+        write_arrays(arrays, memoryview(buffer))
+
+        return header, buffer
+
+    def from_buffer(header: bytes, buffer: memoryview) -> "ModelPayload":
+        """ arrays become views into buffer, read-only if buffer is """
+
+        return ModelPayload(attach_arrays(loads(header), buffer))
+
+    def to_shared_memory(self, name: str | None = None) -> tuple[str | None, bytes]:
+        """ shared memory block name (None when there are no arrays) and pickled remainder;
+            the caller may pick the name, so it can release blocks whose result it never reads """
+
+        header, arrays = self.detach()
+
+        size = buffer_size(arrays)
+        if size == 0:
+            return None, header
+
+        memory = SharedMemory(name, create=True, size=READ_FLAG_SIZE + size)
+        memory.buf[0] = 0
+        write_arrays(arrays, memory.buf[READ_FLAG_SIZE:])
+
+        if os_name == "nt":
+            # windows frees the block with its last handle, keep ours until it has been read
+            ModelPayload.__release_read()
+            ModelPayload.__handles.append(memory)
+        else:
+            # the receiving process unlinks the block, not our resource tracker
+            resource_tracker.unregister(memory._name, "shared_memory")
+            memory.close()
+
+        return memory.name, header
+
+    def read_shared_memory(name: str | None) -> bytearray:
+        """ copies the block out and releases it """
+
+        if name is None:
+            return bytearray()
+
+        memory = SharedMemory(name=name)
+
+        try:
+            buffer = bytearray(memory.buf[READ_FLAG_SIZE:])
+            memory.buf[0] = 1
+
+            return buffer
+        finally:
+            memory.close()
+            memory.unlink()
+
+    def __release_read() -> None:
+        """ close the handles of blocks the receiving process is done with """
+
+        handles = []
+
+        for memory in ModelPayload.__handles:
+            if memory.buf[0]:
+                memory.close()
+            else:
+                handles.append(memory)
+
+        ModelPayload.__handles[:] = handles
+
+    def release_shared_memory(name: str) -> bool:
+        """ unlinks a block nobody is going to read; False when it was never created or is gone already """
+
+        try:
+            memory = SharedMemory(name=name)
+        except FileNotFoundError:
+            return False
+
+        memory.close()
+        memory.unlink()
+
+        return True
+
+    def from_shared_memory(name: str | None, header: bytes) -> "ModelPayload":
+        buffer = ModelPayload.read_shared_memory(name)
+
+        return ModelPayload.from_buffer(header, memoryview(buffer))
+
+    def record(path: Path, proxy: ModelProxy | None = None, is_decode_weights: bool = False) -> "ModelPayload":
+        """ decode a file in this process, reduced to a proxy when given """
+
+        recorder = ModelRecorder(path, is_decode_weights)
+        recorder.run()
+
+        events = recorder.events
+        if proxy is not None:
+            events = proxy.apply(events)
+
+        return ModelPayload(events)
+
+
+def init_worker(is_profiling: bool) -> None:
+    profiler.enable(is_profiling)
+
+
+def decode(path: Path, proxy: ModelProxy | None = None, name: str | None = None,
+           is_decode_weights: bool = False) -> tuple[str | None, bytes, dict | None]:
+    """ worker entry point: parse a file without touching bpy; the profile of the file rides along,
+        arrays go to the shared memory block `name` when given """
+
+    name, header = ModelPayload.record(path, proxy, is_decode_weights).to_shared_memory(name)
+
+    return name, header, profiler.pop(path)
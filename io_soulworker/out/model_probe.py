@@ -0,0 +1,174 @@
+from io import SEEK_CUR
+from logging import error
+from pathlib import Path
+from typing import Iterator
+
+from io_soulworker.chunks.mtrs_chunk import MtrsChunk
+from io_soulworker.chunks.subm_chunk import SubmChunk
+from io_soulworker.chunks.subm_chunk import VisVerticesMaterial
+from io_soulworker.chunks.vmsh_chunk import VMshChunk
+from io_soulworker.core.binary_reader import BinaryReader
+from io_soulworker.core.vis_chunk_file import VisChunkFile
+from io_soulworker.core.vis_chunk_id import VisChunkId
+from io_soulworker.core.vis_material import VisMaterial
+from io_soulworker.core.xml_helper.material_overrides import overrides
+
+
+def read_materials(reader: BinaryReader) -> list[MtrsChunk]:
+    """ MTRS payload as stored, without materials.xml overrides """
+
+    count = reader.read_uint32()
+
+    return [MtrsChunk(reader) for _ in range(count)]
+
+
+def read_bone_count(reader: BinaryReader) -> int:
+    """ SKEL payload starts with version and bone count, the bones themselves are skipped """
+
+    _ = reader.read_uint16()
+
+    return reader.read_uint16()
+
+
+def read_bones(reader: BinaryReader) -> list[tuple[str, int]]:
+    """ name and parent id of every bone, the transforms are skipped """
+
+    _ = reader.read_uint16()
+    count = reader.read_uint16()
+
+    bones = []
+
+    for _ in range(count):
+        name = reader.read_utf8_uint32_string()
+        parent = reader.read_uint16()
+
+        # inverse object space position and orientation, local position and rotation
+        reader.seek(BONE_TRANSFORM_SIZE, SEEK_CUR)
+
+        bones.append((name, parent))
+
+    return bones
+
+
+BONE_TRANSFORM_SIZE = 14 * 4
+
+
+class ModelProbe(VisChunkFile):
+    """ Header level summary of a .model file for catalog scans.
+
+    Only the bin header, the VMSH header, MTRS, SUBM and the bone count are decoded;
+    vertex and index payloads are never read. Materials keep their stored textures,
+    the materials.xml overrides the importer would apply are kept next to them.
+    """
+
+    decoders = {
+        VisChunkId.MTRS: read_materials,
+        VisChunkId.VMSH: lambda reader: VMshChunk(VisChunkId.VMSH, reader, is_header_only=True),
+        VisChunkId.SUBM: SubmChunk,
+        VisChunkId.SKEL: read_bone_count,
+    }
+
+    version: int
+    """ VisBinHeader version """
+
+    mesh: VMshChunk | None
+    """ header only chunk: vertex_count, index_count, index_format, prim_type, descriptor """
+
+    materials: list[MtrsChunk]
+
+    overrides: dict[str, VisMaterial]
+    """ materials.xml overrides by material name, as ModelFileReader finds them """
+
+    submeshes: list[VisVerticesMaterial]
+
+    bone_count: int
+
+    bones: list[tuple[str, int]]
+    """ name and parent id, only read when asked for """
+
+    def __init__(self, path: Path, is_bone_names: bool = False) -> None:
+        super().__init__(path)
+
+        if is_bone_names:
+            self.decoders = dict(self.decoders)
+            self.decoders[VisChunkId.SKEL] = read_bones
+
+        try:
+            self.version = self.header.version
+            self.mesh = self.get(VisChunkId.VMSH)
+            self.materials = self.get(VisChunkId.MTRS, [])
+            self.overrides = overrides.find(path) if self.materials else {}
+
+            submeshes = self.get(VisChunkId.SUBM)
+            self.submeshes = submeshes.materials if submeshes else []
+
+            if is_bone_names:
+                self.bones = self.get(VisChunkId.SKEL, [])
+                self.bone_count = len(self.bones)
+            else:
+                self.bones = []
+                self.bone_count = self.get(VisChunkId.SKEL, 0)
+        finally:
+            self.close()
+
+    def override(self, material: MtrsChunk) -> str | None:
+        """ diffuse the importer uses instead of the stored one, None without an override """
+
+        override = self.overrides.get(material.name)
+
+        return override.diffuse if override else None
+
+    @property
+    def textures(self) -> list[str]:
+        """ every texture path referenced by the materials and their overrides """
+
+        def paths(material: MtrsChunk):
+            yield material.diffuse_map
+            yield material.specular_map
+            yield material.normal_map
+            yield from material.aux_filenames
+            yield self.override(material)
+
+        return sorted({path for material in self.materials for path in paths(material) if path})
+
+    def to_dict(self) -> dict:
+        """ plain values, ready for json """
+
+        mesh = self.mesh
+
+        return {
+            "path": str(self.path),
+            "version": self.version,
+            "vertex_count": mesh.vertex_count if mesh else 0,
+            "index_count": mesh.index_count if mesh else 0,
+            "index_format": mesh.index_format.name if mesh else None,
+            "prim_type": mesh.prim_type.name if mesh else None,
+            "stride": mesh.descriptor.stride if mesh else 0,
+            "materials": [{
+                "name": material.name,
+                "diffuse": material.diffuse_map,
+                "specular": material.specular_map,
+                "normal": material.normal_map,
+                "aux": material.aux_filenames,
+                "is_override": material.name in self.overrides,
+                "override": self.override(material),
+            } for material in self.materials],
+            "submeshes": [{
+                "material": submesh.id,
+                "indices_start": submesh.indices_start,
+                "indices_count": submesh.indices_count,
+                "first_vertex": submesh.first_vertex,
+                "num_vertices": submesh.num_vertices,
+            } for submesh in self.submeshes],
+            "bone_count": self.bone_count,
+        }
+
+
+def scan(root: Path, pattern: str = "*.model") -> Iterator[ModelProbe]:
+    """ probe every model under root; unreadable files are logged and skipped """
+
+    for path in root.rglob(pattern):
+        try:
+            yield ModelProbe(path)
+        except Exception as e:
+            error("probe failed %s: %s", path, e)
@@ -0,0 +1,140 @@
+from logging import info
+
+from numpy import concatenate
+from numpy import float32
+from numpy import searchsorted
+from numpy import uint32
+from numpy import where
+from numpy import zeros
+
+from io_soulworker.chunks.subm_chunk import SubmChunk
+from io_soulworker.chunks.vmsh_chunk import VMshChunk
+from io_soulworker.core.mesh_proxy import BOX_FACE_COUNT
+from io_soulworker.core.mesh_proxy import MeshProxy
+from io_soulworker.core.mesh_proxy import box_proxy
+from io_soulworker.core.mesh_proxy import is_valid_bounds
+
+
+DECIMATE = "DECIMATE"
+BOX = "BOX"
+
+SOURCE = "soulworker_source"
+""" custom property of an imported object: path of the file it was decoded from """
+
+PROXY = "soulworker_proxy"
+""" custom property of an imported object: proxy key, empty at full resolution """
+
+OPTIONS = "soulworker_options"
+""" custom property of an imported object: ModelImporter keyword arguments it was built with """
+
+ARMATURE = "soulworker_armature"
+""" custom property of an imported object: the armature object imported with it """
+
+
+class ModelProxy(object):
+    """ Reduced geometry for laying out scenes, built from the decoded events before they are replayed.
+
+    DECIMATE clusters the mesh down to about `ratio` of its triangles, BOX puts an axis aligned
+    box on every SUBM range (from its stored bounds, or its vertices when those are unset).
+    The mesh becomes an indexed triangle list and SUBM ranges are rewritten to match,
+    so importers see an ordinary model. Boxes drop the skeleton and its weights, decimated
+    meshes keep the weights of the vertices left.
+    """
+
+    def __init__(self, mode: str = DECIMATE, ratio: float = 0.1) -> None:
+        assert mode in (DECIMATE, BOX)
+
+        self.mode = mode
+        self.ratio = ratio
+
+    @property
+    def key(self) -> str:
+        """ tells proxies apart in caches and on imported objects """
+
+        return self.mode if self.mode == BOX else "%s %g" % (self.mode, self.ratio)
+
+    def apply(self, events: list[tuple[str, tuple]]) -> list[tuple[str, tuple]]:
+        chunks = {name: args[0] for name, args in events}
+
+        mesh: VMshChunk | None = chunks.get("on_mesh")
+        submeshes: SubmChunk | None = chunks.get("on_vertices_material")
+
+        if mesh is None or not len(mesh.vertices):
+            return events
+
+        if self.mode == BOX:
+            ranges = self.__boxes(mesh, submeshes)
+            events = [(name, args) for name, args in events if name not in ("on_skeleton", "on_skeleton_weights")]
+        elif mesh.faces.shape[1] == 3 and self.ratio < 1:
+            ranges = self.__decimate(mesh, submeshes, chunks.get("on_skeleton_weights"))
+        else:
+            # lines and points are cheap already
+            return events
+
+        if submeshes is not None:
+            for material, (start, end) in zip(submeshes.materials, ranges):
+                material.indices_start = start * 3
+                material.indices_count = (end - start) * 3
+
+        return events
+
+    def __boxes(self, mesh: VMshChunk, submeshes: SubmChunk | None) -> list[tuple[int, int]]:
+        materials = submeshes.materials if submeshes is not None else []
+        bounds = []
+
+        for material in materials:
+            if is_valid_bounds(material.bounding_box, material.bounding_box_max):
+                bounds.append((material.bounding_box, material.bounding_box_max))
+                continue
+
+            start, end = mesh.face_range(material.indices_start, material.indices_count)
+            used = mesh.vertices[mesh.faces[start:end].ravel()]
+            used = used if len(used) else mesh.vertices
+
+            bounds.append((used.min(axis=0), used.max(axis=0)))
+
+        if not bounds:
+            bounds.append((mesh.vertices.min(axis=0), mesh.vertices.max(axis=0)))
+
+        boxes = [box_proxy(minimum, maximum) for minimum, maximum in bounds]
+
+        vertices = concatenate([box[0] for box in boxes])
+        normals = concatenate([box[1] for box in boxes])
+        faces = concatenate([box[2] + i * len(box[0]) for i, box in enumerate(boxes)]).astype(uint32)
+
+        # one texel of the texture is a fair color for a stand-in
+        uvs = zeros((len(vertices) if len(mesh.uvs) else 0, 2), float32)
+
+        info("proxy %s: %d boxes", self.key, len(boxes))
+
+        mesh.set_triangles(vertices, normals, uvs, faces)
+
+        return [(i * BOX_FACE_COUNT, (i + 1) * BOX_FACE_COUNT) for i in range(len(materials))]
+
+    def __decimate(self, mesh: VMshChunk, submeshes: SubmChunk | None, weights) -> list[tuple[int, int]]:
+        proxy = MeshProxy(mesh.vertices, mesh.faces, self.ratio)
+
+        # kept faces are in file order, a range keeps the faces left inside it
+        ranges = [mesh.face_range(material.indices_start, material.indices_count)
+                  for material in (submeshes.materials if submeshes is not None else [])]
+        ranges = [(int(searchsorted(proxy.kept, start)), int(searchsorted(proxy.kept, end))) for start, end in ranges]
+
+        first = proxy.first
+
+        mesh.set_triangles(mesh.vertices[first],
+                           mesh.normals[first] if len(mesh.normals) else mesh.normals,
+                           mesh.uvs[first] if len(mesh.uvs) else mesh.uvs,
+                           proxy.faces)
+
+        if weights is not None:
+            # vertices past the weights are left unweighted, as at full resolution
+            is_weighted = first < weights.vertex_count
+            rows = where(is_weighted, first, 0)
+
+            weights.bones, weights.weights = weights.bones[rows], weights.weights[rows]
+            weights.weights[~is_weighted] = 0
+            weights.vertex_count = len(rows)
+
+        info("proxy %s: %s", self.key, proxy.counts)
+
+        return ranges
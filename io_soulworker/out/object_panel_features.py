@@ -23,3 +23,18 @@ class OutObjectPanelFeatures(Panel):
         active_operator = space_data.active_operator
 
         layout.prop(active_operator, 'is_create_collection')
+        layout.prop(active_operator, 'is_create_vertex_groups')
+        layout.prop(active_operator, 'is_decode_weights')
+        layout.prop(active_operator, 'max_influences')
+        layout.prop(active_operator, 'is_recalc_normals')
+        layout.prop(active_operator, 'is_weld')
+        layout.prop(active_operator, 'weld_distance')
+        layout.prop(active_operator, 'import_mode')
+        layout.prop(active_operator, 'proxy_ratio')
+        layout.prop(active_operator, 'is_reuse_materials')
+        layout.prop(active_operator, 'is_parallel')
+        layout.prop(active_operator, 'decode_timeout')
+        layout.prop(active_operator, 'is_use_cache')
+        layout.prop(active_operator, 'cache_size')
+        layout.prop(active_operator, 'is_profile')
+        layout.prop(active_operator, 'profile_path')
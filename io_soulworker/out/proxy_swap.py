@@ -0,0 +1,94 @@
+import bpy
+
+from bpy.types import Context
+from bpy.types import Object
+from bpy.types import Operator
+
+from io_soulworker.out.decode_cache import DecodeCache
+from io_soulworker.out.image_cache import ImageCache
+from io_soulworker.out.material_cache import MaterialCache
+from io_soulworker.out.model_importer import ModelImporter
+from io_soulworker.out.model_payload import ModelPayload
+from io_soulworker.out.model_proxy import ARMATURE
+from io_soulworker.out.model_proxy import OPTIONS
+from io_soulworker.out.model_proxy import PROXY
+from io_soulworker.out.model_proxy import SOURCE
+
+from pathlib import Path
+from logging import error
+from logging import info
+
+
+class ProxySwap(Operator):
+    """ Import the selected proxies at full resolution in their place """
+
+    bl_idname = "io_soulworker.swap_proxies"
+    bl_label = "Swap SoulWorker proxies"
+    bl_options = {"REGISTER", "UNDO"}
+
+    @classmethod
+    def poll(cls, context):
+        return any(selected.get(PROXY) for selected in context.selected_objects)
+
+    def execute(self, context: Context):
+        proxies = [selected for selected in context.selected_objects if selected.get(PROXY)]
+
+        cache = DecodeCache()
+        images = ImageCache()
+        materials = MaterialCache()
+
+        # a prop placed many times is decoded once
+        payloads: dict[tuple[Path, bool], ModelPayload] = {}
+        count = 0
+
+        for proxy in proxies:
+            path = Path(proxy[SOURCE])
+
+            # imported again the way the proxy was, the importer's defaults otherwise
+            options = proxy[OPTIONS].to_dict() if OPTIONS in proxy else {"emission_strength": 7}
+            key = (path, options.get("is_decode_weights", False))
+
+            try:
+                if key not in payloads:
+                    payloads[key] = cache.decode(path, is_decode_weights=key[1])
+            except Exception as e:
+                error("decode failed, proxy kept: %s (%s)", path, e)
+                continue
+
+            collection = proxy.users_collection[0] if proxy.users_collection else context.scene.collection
+
+            with context.temp_override(collection=collection):
+                importer = ModelImporter(path, bpy.context, images=images, materials=materials, **options)
+                payloads[key].replay(importer)
+
+            self.replace(proxy, importer)
+            count += 1
+
+        cache.prune()
+        info("%d of %d proxies swapped", count, len(proxies))
+
+        return {"FINISHED"}
+
+    def replace(self, proxy: Object, importer: ModelImporter) -> None:
+        """ the full resolution object takes the proxy's place; the proxy goes, with the armature imported for it """
+
+        # decimated proxies keep the skeleton, boxes have none
+        armature = proxy.get(ARMATURE)
+
+        placed = importer.armature_object if importer.armature_object is not None else importer.object
+        placed.matrix_world = (armature or proxy).matrix_world.copy()
+        placed.select_set(True)
+
+        mesh = proxy.data
+        bpy.data.objects.remove(proxy)
+
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+        # kept while anything else hangs from it
+        if armature is not None and not armature.children:
+            data = armature.data
+            bpy.data.objects.remove(armature)
+
+            if data.users == 0:
+                bpy.data.armatures.remove(data)
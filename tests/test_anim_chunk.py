@@ -0,0 +1,98 @@
+from math import cos
+from math import pi
+from math import sin
+from pathlib import Path
+from struct import pack
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from numpy import allclose
+from numpy import array
+
+from benchmarks.synthetic_model import SyntheticAnimation
+from io_soulworker.chunks.anim_chunk import AnimChunk
+from io_soulworker.core.binary_reader import BinaryReader
+from io_soulworker.core.utility import quaternion_continuous
+from io_soulworker.core.utility import quaternion_multiply
+from io_soulworker.core.utility import quaternion_rotate
+from io_soulworker.out.anim_file_reader import AnimFileReader
+
+
+def z_rotation(angle: float) -> array:
+    return array([cos(angle / 2), 0, 0, sin(angle / 2)])
+
+
+IDENTITY = array([1.0, 0, 0, 0])
+
+
+class TestAnimChunk(TestCase):
+
+    def test(self):
+        with BinaryReader(SyntheticAnimation(10, 3).skan()) as reader:
+            chunk = AnimChunk(reader)
+
+        self.assertEqual(chunk.name, "Clip")
+        self.assertEqual([track.bone for track in chunk.tracks], [0, 1, 2])
+
+        track = chunk.tracks[1]
+        self.assertEqual(track.positions.shape, (10, 3))
+        self.assertEqual(track.rotations.shape, (10, 4))
+        self.assertAlmostEqual(float(track.position_times[3]), 0.1, places=6)
+        self.assertTrue(allclose((track.rotations ** 2).sum(axis=1), 1, atol=1e-5))
+
+    def test_quaternion(self):
+        quarter = z_rotation(pi / 2)
+
+        self.assertTrue(allclose(quaternion_rotate(quarter, array([1.0, 0, 0])), [0, 1, 0]))
+        self.assertTrue(allclose(quaternion_multiply(quarter, quarter), z_rotation(pi)))
+
+        flipped = quaternion_continuous(array([IDENTITY, -IDENTITY, IDENTITY]))
+        self.assertTrue(allclose(flipped, [IDENTITY, IDENTITY, IDENTITY]))
+
+    def test_to_pose(self):
+        with BinaryReader(SyntheticAnimation(2, 1).skan()) as reader:
+            track = AnimChunk(reader).tracks[0]
+
+        rest_rotation = z_rotation(pi / 2)
+        rest_position = array([1.0, 2, 3])
+
+        # keys at the rest pose, then turned a further quarter and moved along the parent's x
+        track.positions[:] = [rest_position, rest_position + (1, 0, 0)]
+        track.rotations[:] = [rest_rotation, z_rotation(pi)]
+
+        locations, rotations = track.to_pose(rest_rotation, rest_position, IDENTITY)
+
+        self.assertTrue(allclose(locations, [[0, 0, 0], [0, -1, 0]], atol=1e-6))
+        self.assertTrue(allclose(rotations, [IDENTITY, z_rotation(pi / 2)], atol=1e-6))
+
+    def test_unknown_layout(self):
+        payload = SyntheticAnimation(4, 2).skan()
+
+        with BinaryReader(pack("<H", 7) + payload[2:]) as reader:
+            with self.assertRaisesRegex(ValueError, "version 7"):
+                AnimChunk(reader)
+
+        # last rotation track with times running backwards, as read through a layout that doesn't match
+        rotations = pack("<I4f", 4, 3, 2, 1, 0) + bytes(4 * 16)
+
+        with BinaryReader(payload[:-len(rotations)] + rotations) as reader:
+            with self.assertRaisesRegex(ValueError, "SKAN layout"):
+                AnimChunk(reader)
+
+    def test_chunk_end(self):
+        class Padded(SyntheticAnimation):
+            def skan(self) -> bytes:
+                return super().skan() + bytes(8)
+
+        class Recorder(AnimFileReader):
+            def on_animation(self, chunk: AnimChunk):
+                self.chunk = chunk
+
+        with TemporaryDirectory() as root:
+            reader = Recorder(SyntheticAnimation(4, 2).write(Path(root) / "clip.anim"))
+            reader.run()
+            self.assertEqual(len(reader.chunk.tracks), 2)
+
+            # payload left over: the guessed layout doesn't describe this clip
+            with self.assertRaisesRegex(ValueError, "experimental"):
+                Recorder(Padded(4, 2).write(Path(root) / "padded.anim")).run()
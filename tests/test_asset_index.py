@@ -0,0 +1,78 @@
+from os import utime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from benchmarks.synthetic_model import SyntheticModel
+from io_soulworker.out.asset_index import AssetIndex
+
+
+OVERRIDE = """<root><Materials><Material name="Material_0" diffuse="Shared_D.dds"/></Materials></root>"""
+
+
+class TestAssetIndex(TestCase):
+
+    def test(self):
+        with TemporaryDirectory() as root:
+            data = Path(root) / "data"
+            (data / "npc").mkdir(parents=True)
+
+            SyntheticModel(10, bone_count=4).write(data / "npc" / "a.model")
+            SyntheticModel(20, bone_count=4, seed=1).write(data / "npc" / "b.model")
+            SyntheticModel(3000, material_count=2).write(data / "prop.model")
+
+            with AssetIndex(Path(root) / "assets.sqlite") as index:
+                self.assertEqual(index.update(data, jobs=1),
+                                 {"scanned": 3, "parsed": 3, "removed": 0, "failed": 0})
+
+                # nothing changed, nothing parsed
+                self.assertEqual(index.update(data, jobs=1)["parsed"], 0)
+
+                a = (data / "npc" / "a.model").resolve()
+                b = (data / "npc" / "b.model").resolve()
+                prop = (data / "prop.model").resolve()
+
+                self.assertEqual(index.models_using_texture("material_1_d.DDS"), [str(prop)])
+                self.assertEqual(index.models_sharing_bones(a), [str(b)])
+                self.assertEqual([path for path, _, _ in index.models_over_budget(vertices=100)], [str(prop)])
+
+                # an override file re-reads only its model
+                xml = data / "npc" / "a.model_data" / "materials.xml"
+                xml.parent.mkdir()
+                xml.write_text(OVERRIDE)
+                utime(xml, ns=(0, 10 ** 18))
+
+                self.assertEqual(index.update(data, jobs=1)["parsed"], 1)
+                self.assertEqual(index.models_using_texture("shared_d.dds"), [str(a)])
+
+                (data / "prop.model").unlink()
+                self.assertEqual(index.update(data, jobs=1)["removed"], 1)
+                self.assertEqual(index.models_using_texture("Material_1_D.dds"), [])
+
+    def test_override(self):
+        with TemporaryDirectory() as root:
+            data = Path(root) / "data"
+            data.mkdir()
+
+            SyntheticModel(10, material_count=2).write(data / "a.model")
+            SyntheticModel(10, material_count=2).write(data / "b.model")
+
+            # only the override refers to the new texture
+            xml = data / "Overrides" / "a.model_data" / "materials.xml"
+            xml.parent.mkdir(parents=True)
+            xml.write_text(OVERRIDE)
+
+            with AssetIndex(Path(root) / "assets.sqlite") as index:
+                index.update(data, jobs=1)
+
+                a = str((data / "a.model").resolve())
+
+                self.assertEqual(index.models_using_texture("Shared_D.dds"), [a])
+                self.assertEqual(len(index.models_using_texture("Material_0_D.dds")), 2)
+
+                rows = index.connection.execute(
+                    "SELECT t.material_slot, t.path, mt.is_override FROM textures t"
+                    " JOIN materials mt ON mt.model_id = t.model_id AND mt.slot = t.material_slot"
+                    " WHERE t.kind = 'override'").fetchall()
+
+                self.assertEqual(rows, [(0, "Shared_D.dds", 1)])
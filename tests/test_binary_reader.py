@@ -1,5 +1,5 @@
-
 from pathlib import Path
+from struct import pack
 from unittest import TestCase
 
 from io_soulworker.core.binary_reader import BinaryReader
@@ -18,3 +18,34 @@ class TestBinaryReader(TestCase):
 
             self.assertEqual(header.cid, VisChunkId.VBIN)
             self.assertEqual(header.version, 65536)
+
+    def test_buffer(self):
+        data = b"VBIN" + pack("<IhI", 65536, -2, 3) + b"abc" + pack("<3fB", 1, 2, 3, 255)
+
+        with BinaryReader(memoryview(data)) as reader:
+            header = VisBinHeader(reader)
+
+            self.assertEqual(header.cid, VisChunkId.VBIN)
+            self.assertEqual(header.version, 65536)
+            self.assertEqual(reader.read_int16(), -2)
+            self.assertEqual(reader.read_utf8_uint32_string(), "abc")
+            self.assertEqual(tuple(reader.read_float_vector3()), (1, 2, 3))
+            self.assertEqual(reader.read_uint8(), 255)
+            self.assertEqual(reader.tell(), len(data))
+            self.assertEqual(reader.read(4), b"")
+
+    def test_vectors(self):
+        data = pack("<3f4f3f4f", 1, 2, 3, 4, 5, 6, 7, 1, 2, 3, 4, 5, 6, 7)
+
+        with BinaryReader(data) as reader:
+            self.assertEqual(reader.read_float_tuple3(), (1, 2, 3))
+            self.assertEqual(reader.read_quaternion_tuple(), (7, 4, 5, 6))
+
+            # the mathutils api outside callers use is still there
+            vector = reader.read_float_vector3()
+            self.assertEqual(type(vector).__name__, "Vector")
+            self.assertEqual(tuple(vector), (1, 2, 3))
+
+            quaternion = reader.read_quaternion()
+            self.assertEqual(type(quaternion).__name__, "Quaternion")
+            self.assertEqual(tuple(quaternion), (7, 4, 5, 6))
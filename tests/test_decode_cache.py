@@ -0,0 +1,105 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from benchmarks.synthetic_model import SyntheticModel
+from io_soulworker.chunks.vmsh_chunk import VMshChunk
+from io_soulworker.out.decode_cache import FILE_HEADER
+from io_soulworker.out.decode_cache import DecodeCache
+from io_soulworker.out.decode_cache import parse_size
+
+
+SYNTHETIC = SyntheticModel(3, triangle_count=1)
+
+
+def mesh_of(payload) -> VMshChunk:
+    return next(args[0] for name, args in payload.events if name == "on_mesh")
+
+
+class TestDecodeCache(TestCase):
+
+    def test(self):
+        with TemporaryDirectory() as root:
+            path = SYNTHETIC.write(Path(root) / "cached.model")
+
+            cache = DecodeCache(Path(root) / "cache")
+            self.assertIsNone(cache.load(path))
+
+            cache.decode(path)
+            self.assertEqual(len(cache.entries()), 1)
+
+            payload = cache.load(path)
+            self.assertIsNotNone(payload)
+
+            mesh = mesh_of(payload)
+            self.assertEqual(mesh.vertices.tolist(), SYNTHETIC.vertices()["pos"].tolist())
+            self.assertEqual(mesh.faces.tolist(), SYNTHETIC.indices().reshape(-1, 3).tolist())
+
+            # a changed file is a different entry
+            path.write_bytes(SYNTHETIC.to_bytes() + b"\0")
+            self.assertIsNone(cache.load(path))
+
+            del payload, mesh
+
+            size = cache.size()
+            self.assertEqual(cache.prune(0), (1, size))
+            self.assertEqual(cache.entries(), [])
+
+    def test_overrides(self):
+        with TemporaryDirectory() as root:
+            path = SYNTHETIC.write(Path(root) / "cached.model")
+
+            cache = DecodeCache(Path(root) / "cache")
+            cache.decode(path)
+
+            # an edited materials.xml is a miss, the decoded materials would be stale
+            materials = Path(root) / "cached.model_data" / "materials.xml"
+            materials.parent.mkdir()
+            materials.write_text("<Materials/>")
+
+            self.assertIsNone(cache.load(path))
+
+    def test_signature(self):
+        with TemporaryDirectory() as root:
+            path = SYNTHETIC.write(Path(root) / "cached.model")
+
+            cache = DecodeCache(Path(root) / "cache")
+            cache.decode(path)
+
+            entry, = cache.entries()
+            data = bytearray(entry.read_bytes())
+            data[FILE_HEADER.size] ^= 1
+            entry.write_bytes(data)
+
+            self.assertIsNone(cache.load(path))
+
+            # another cache key doesn't vouch for this one's entries either
+            cache.decode(path)
+
+            other = DecodeCache(Path(root) / "other")
+            other.key()
+            other.entry(path).write_bytes(cache.entry(path).read_bytes())
+
+            self.assertIsNotNone(cache.load(path))
+            self.assertIsNone(other.load(path))
+
+    def test_truncated(self):
+        with TemporaryDirectory() as root:
+            path = SYNTHETIC.write(Path(root) / "cached.model")
+
+            cache = DecodeCache(Path(root) / "cache")
+            cache.decode(path)
+
+            # the signed header is intact, the arrays behind it are cut short
+            entry, = cache.entries()
+            entry.write_bytes(entry.read_bytes()[:-24])
+
+            self.assertIsNone(cache.load(path))
+            self.assertEqual(cache.entries(), [])
+
+            self.assertEqual(mesh_of(cache.decode(path)).faces.tolist(), SYNTHETIC.indices().reshape(-1, 3).tolist())
+
+    def test_parse_size(self):
+        self.assertEqual(parse_size("512"), 512)
+        self.assertEqual(parse_size("2G"), 2 << 30)
+        self.assertEqual(parse_size("1.5mb"), 3 << 19)
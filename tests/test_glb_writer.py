@@ -0,0 +1,65 @@
+from json import loads
+from pathlib import Path
+from struct import unpack_from
+from subprocess import run
+from sys import executable
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from numpy import array
+from numpy import frombuffer
+from numpy.testing import assert_allclose
+
+from benchmarks.synthetic_model import SyntheticModel
+from io_soulworker.core.utility import quaternion_rotate
+from io_soulworker.out.glb_writer import GLB_MAGICK
+from io_soulworker.out.glb_writer import convert
+
+
+class TestGlbWriter(TestCase):
+
+    def test(self):
+        synthetic = SyntheticModel(50, material_count=2, bone_count=3)
+
+        with TemporaryDirectory() as root:
+            source = synthetic.write(Path(root) / "NPC.model")
+            result = convert((source, Path(root) / "out" / "NPC.glb"))
+
+            data = Path(result["target"]).read_bytes()
+
+        magick, _, length = unpack_from("<III", data)
+        self.assertEqual(magick, GLB_MAGICK)
+        self.assertEqual(length, len(data))
+        self.assertEqual(result["vertices"], 50)
+
+        json_length, = unpack_from("<I", data, 12)
+        gltf = loads(data[20:20 + json_length])
+        binary = data[28 + json_length:]
+
+        primitives = gltf["meshes"][0]["primitives"]
+        self.assertEqual([primitive.get("material") for primitive in primitives], [0, 1])
+
+        # the position view holds the decoded vertices unchanged
+        position = gltf["accessors"][primitives[0]["attributes"]["POSITION"]]
+        view = gltf["bufferViews"][position["bufferView"]]
+        positions = frombuffer(binary, "<f4", 50 * 3, view["byteOffset"]).reshape(50, 3)
+        self.assertEqual(positions.tolist(), synthetic.vertices()["pos"].tolist())
+
+        # one z up to y up root over the mesh and the first bone of a chain of three
+        self.assertEqual(gltf["scenes"][0]["nodes"], [0])
+        self.assertEqual(gltf["nodes"][0]["children"], [1, 2])
+        self.assertEqual(gltf["nodes"][2]["children"], [3])
+
+        # a vertex up in the file is up along +y in the scene
+        x, y, z, w = gltf["nodes"][0]["rotation"]
+        rotation = array((w, x, y, z))
+
+        assert_allclose(quaternion_rotate(rotation, array((0, 0, 1))), (0, 1, 0), atol=1e-6)
+        assert_allclose(quaternion_rotate(rotation, positions[0]), positions[0][[0, 2, 1]] * (1, 1, -1), atol=1e-6)
+
+    def test_without_mathutils(self):
+        # inside blender the add-on itself pulls mathutils in
+        code = "import sys, io_soulworker.out.glb_writer; " \
+               "sys.exit('mathutils' in sys.modules and 'bpy' not in sys.modules)"
+
+        self.assertEqual(run([executable, "-c", code]).returncode, 0)
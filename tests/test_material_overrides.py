@@ -0,0 +1,46 @@
+from os import utime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from io_soulworker.core.vis_transparency_type import VisTransparencyType
+from io_soulworker.core.xml_helper.material_overrides import MaterialOverrides
+
+
+XML = """<root>
+  <Materials>
+    <Material name="body" ambient="1,2,3,4" diffuse="%s" transparency="alpha" alphathreshold="0.5">
+      <Param name="ignored"/>
+    </Material>
+    <Material name="glow" diffuse="glow.dds"/>
+  </Materials>
+</root>"""
+
+
+class TestMaterialOverrides(TestCase):
+
+    def test(self):
+        with TemporaryDirectory() as root:
+            model = Path(root) / "NPC.model"
+
+            path = Path(root) / "Overrides" / "NPC.model_data" / "materials.xml"
+            path.parent.mkdir(parents=True)
+            path.write_text(XML % "body.dds")
+
+            overrides = MaterialOverrides()
+            values = overrides.find(model)
+
+            self.assertEqual(sorted(values), ["body", "glow"])
+            self.assertEqual(values["body"].diffuse, "body.dds")
+            self.assertEqual(values["body"].ambient, [1, 2, 3, 4])
+            self.assertEqual(values["body"].alphathreshold, 0.5)
+            self.assertEqual(values["body"].transparency, VisTransparencyType.ALPHA)
+            self.assertEqual(values["glow"].transparency, VisTransparencyType.NONE)
+
+            # unchanged files are not parsed again
+            self.assertIs(overrides.load(path), overrides.load(path))
+
+            path.write_text(XML % "body_2.dds")
+            utime(path, ns=(0, path.stat().st_mtime_ns + 1))
+
+            self.assertEqual(overrides.find(model)["body"].diffuse, "body_2.dds")
@@ -0,0 +1,72 @@
+from unittest import TestCase
+
+from numpy import arange
+from numpy import cross
+from numpy import float32
+from numpy import meshgrid
+from numpy import stack
+from numpy import uint32
+from numpy import zeros
+
+from io_soulworker.core.mesh_proxy import BOX_FACE_COUNT
+from io_soulworker.core.mesh_proxy import MeshProxy
+from io_soulworker.core.mesh_proxy import box_proxy
+from io_soulworker.core.mesh_proxy import is_valid_bounds
+
+
+def grid(size: int):
+    """ a unit square of size * size quads, two triangles each """
+
+    x, y = meshgrid(arange(size + 1, dtype=float32) / size, arange(size + 1, dtype=float32) / size)
+    vertices = stack((x.ravel(), y.ravel(), zeros(x.size, float32)), axis=1)
+
+    corner = (arange(size)[:, None] * (size + 1) + arange(size)).ravel()
+    faces = stack((corner, corner + 1, corner + size + 2, corner, corner + size + 2, corner + size + 1), axis=1)
+
+    return vertices, faces.reshape(-1, 3).astype(uint32)
+
+
+class TestMeshProxy(TestCase):
+
+    def test(self):
+        vertices, faces = grid(100)
+        proxy = MeshProxy(vertices, faces, 0.1)
+
+        self.assertLess(abs(len(proxy.faces) - 2000), 2000 * proxy.TOLERANCE)
+        self.assertEqual(proxy.counts["faces"], (20000, len(proxy.faces)))
+
+        # every proxy vertex is used, kept faces stay in file order
+        self.assertEqual(sorted(set(proxy.faces.ravel().tolist())), list(range(len(proxy.first))))
+        self.assertTrue((proxy.kept[1:] > proxy.kept[:-1]).all())
+
+        # nothing flipped, the plane still faces +z
+        corners = vertices[proxy.first][proxy.faces]
+        normals = cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        self.assertTrue((normals[:, 2] >= 0).all())
+
+    def test_flat(self):
+        vertices = zeros((3, 3), float32)
+        proxy = MeshProxy(vertices, arange(3, dtype=uint32).reshape(1, 3), 0.5)
+
+        self.assertEqual(proxy.cell, 0)
+        self.assertEqual(len(proxy.faces), 0)
+
+    def test_box(self):
+        vertices, normals, faces = box_proxy((0, 0, 0), (1, 2, 3))
+
+        self.assertEqual(vertices.shape, (24, 3))
+        self.assertEqual(faces.shape, (BOX_FACE_COUNT, 3))
+        self.assertEqual(vertices.max(axis=0).tolist(), [1, 2, 3])
+
+        corners = vertices[faces]
+        face_normals = cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+
+        # counter-clockwise from outside, along the stored normal of the side
+        self.assertTrue(((face_normals * normals[faces[:, 0]]).sum(axis=1) > 0).all())
+        self.assertTrue(((face_normals * (corners.mean(axis=1) - (0.5, 1, 1.5))).sum(axis=1) > 0).all())
+
+    def test_bounds(self):
+        self.assertTrue(is_valid_bounds((0, 0, 0), (1, 0, 0)))
+        self.assertFalse(is_valid_bounds((0, 0, 0), (0, 0, 0)))
+        self.assertFalse(is_valid_bounds((1, 0, 0), (0, 1, 1)))
+        self.assertFalse(is_valid_bounds((0, 0, float("nan")), (1, 1, 1)))
@@ -0,0 +1,49 @@
+from unittest import TestCase
+
+from numpy import array
+from numpy import float32
+from numpy import uint16
+
+from io_soulworker.core.mesh_weld import MeshWeld
+
+
+# a quad split along a uv seam: vertices 4 and 5 repeat 1 and 2
+VERTICES = array([
+    [0, 0, 0],
+    [1, 0, 0],
+    [0, 1, 0],
+    [1, 1, 0],
+    [1, 0, 0],
+    [0, 1.000001, 0],
+], float32)
+
+FACES = array([
+    [0, 1, 2],
+    [4, 3, 5],
+    [2, 0, 1],  # the first face starting at another corner
+    [0, 2, 1],  # the first face flipped
+    [0, 1, 4],  # degenerate once welded
+], uint16)
+
+
+class TestMeshWeld(TestCase):
+
+    def test(self):
+        weld = MeshWeld(VERTICES, FACES)
+
+        self.assertEqual(len(weld.vertices), 4)
+        self.assertEqual(weld.remap[4], weld.remap[1])
+        self.assertEqual(weld.remap[5], weld.remap[2])
+
+        self.assertEqual(weld.kept.tolist(), [0, 1, 3])
+        self.assertEqual(weld.corners.tolist(), [[0, 1, 2], [4, 3, 5], [0, 2, 1]])
+        self.assertEqual(weld.faces.tolist(), weld.remap[weld.corners].tolist())
+
+        self.assertEqual(weld.counts, {"vertices": (6, 4), "faces": (5, 3), "degenerate": 1, "duplicate": 1})
+
+    def test_exact(self):
+        weld = MeshWeld(VERTICES, FACES, 0)
+
+        # 5 is off by more than nothing
+        self.assertEqual(len(weld.vertices), 5)
+        self.assertNotEqual(weld.remap[5], weld.remap[2])
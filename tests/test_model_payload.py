@@ -0,0 +1,82 @@
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from os import getpid
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from benchmarks.synthetic_model import SyntheticModel
+from io_soulworker.chunks.subm_chunk import SubmChunk
+from io_soulworker.chunks.vmsh_chunk import VMshChunk
+from io_soulworker.out.model_file import ModelFile
+from io_soulworker.out.model_payload import ModelPayload
+from io_soulworker.out.model_payload import ModelRecorder
+from io_soulworker.out.model_payload import decode
+
+
+SYNTHETIC = SyntheticModel(3, triangle_count=1)
+
+
+class Replay(ModelRecorder):
+    pass
+
+
+class TestModelPayload(TestCase):
+
+    def test(self):
+        with TemporaryDirectory() as root:
+            path = SYNTHETIC.write(Path(root) / "payload.model")
+
+            name, header, profile = decode(path)
+            payload = ModelPayload.from_shared_memory(name, header)
+
+            # decoded in this process, without the round trip
+            with ModelFile(path) as model:
+                vertices, uvs, faces = model.mesh.vertices.tolist(), model.mesh.uvs.tolist(), model.mesh.faces.tolist()
+
+        # profiling is off unless asked for
+        self.assertIsNone(profile)
+
+        replay = Replay(path)
+        payload.replay(replay)
+
+        self.assertEqual([name for name, _ in replay.events], ["on_surface", "on_mesh", "on_vertices_material"])
+
+        mesh: VMshChunk = replay.events[1][1][0]
+        self.assertEqual(mesh.vertices.tolist(), vertices)
+        self.assertEqual(mesh.uvs.tolist(), uvs)
+        self.assertEqual(mesh.faces.tolist(), faces)
+        self.assertEqual(mesh.faces.tolist(), SYNTHETIC.indices().reshape(-1, 3).tolist())
+
+        submeshes: SubmChunk = replay.events[2][1][0]
+        self.assertEqual(submeshes.materials[0].indices_count, 3)
+
+    def test_release(self):
+        with TemporaryDirectory() as root:
+            path = SYNTHETIC.write(Path(root) / "payload.model")
+
+            name, _, _ = decode(path, None, "swdc_test_%d" % getpid())
+
+        # a result nobody reads is unlinked by the name it was given
+        self.assertTrue(ModelPayload.release_shared_memory(name))
+        self.assertFalse(ModelPayload.release_shared_memory(name))
+
+    def test_read_flag(self):
+        with TemporaryDirectory() as root:
+            path = SYNTHETIC.write(Path(root) / "payload.model")
+
+            name, header, _ = decode(path, None, "swdc_test_%d" % getpid())
+
+        # stands in for the handle a windows worker holds until the block is read
+        worker = SharedMemory(name=name)
+        resource_tracker.unregister(worker._name, "shared_memory")
+
+        try:
+            self.assertEqual(worker.buf[0], 0)
+
+            payload = ModelPayload.from_shared_memory(name, header)
+            self.assertEqual(worker.buf[0], 1)
+        finally:
+            worker.close()
+
+        self.assertEqual(payload.events[1][1][0].faces.tolist(), SYNTHETIC.indices().reshape(-1, 3).tolist())
@@ -0,0 +1,48 @@
+from pathlib import Path
+from struct import pack
+from tempfile import TemporaryDirectory
+from traceback import walk_tb
+from unittest import TestCase
+
+from benchmarks.synthetic_model import SyntheticModel
+from benchmarks.synthetic_model import chunk
+from io_soulworker.core.vis_chunk_id import VisChunkId
+from io_soulworker.core.vis_index_format import VisIndexFormat
+from io_soulworker.out.model_probe import ModelProbe
+
+
+class TestModelProbe(TestCase):
+
+    def test(self):
+        synthetic = SyntheticModel(3, triangle_count=2, index_format=VisIndexFormat._32, bone_count=42)
+
+        with TemporaryDirectory() as root:
+            probe = ModelProbe(synthetic.write(Path(root) / "probe.model"))
+
+        self.assertEqual(probe.version, 65536)
+        self.assertEqual(probe.mesh.vertex_count, 3)
+        self.assertEqual(probe.mesh.index_count, 6)
+        self.assertEqual(probe.mesh.index_format, VisIndexFormat._32)
+        self.assertFalse(hasattr(probe.mesh, "vertices"))
+        self.assertEqual([material.name for material in probe.materials], ["Material_0"])
+        self.assertIn("Material_0_D.dds", probe.textures)
+        self.assertEqual(probe.submeshes[0].indices_count, 6)
+        self.assertEqual(probe.bone_count, 42)
+        self.assertEqual(probe.to_dict()["index_format"], "_32")
+
+    def test_corrupt_toc(self):
+        with TemporaryDirectory() as root:
+            path = Path(root) / "truncated.model"
+            path.write_bytes(b"VBIN" + pack("<I", 65536) + chunk(VisChunkId.SKEL, pack("<HH", 0, 42)))
+
+            try:
+                ModelProbe(path)
+            except Exception as e:
+                raised = e
+
+        # the half built probe is only reachable through the traceback, its reader is closed already
+        probes = [frame.f_locals["self"] for frame, _ in walk_tb(raised.__traceback__)
+                  if isinstance(frame.f_locals.get("self"), ModelProbe)]
+
+        self.assertTrue(probes)
+        self.assertTrue(all(probe.reader.closed for probe in probes))
@@ -0,0 +1,83 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from benchmarks.synthetic_model import SyntheticModel
+from io_soulworker.chunks.vmsh_chunk import VMshChunk
+from io_soulworker.core.mesh_proxy import BOX_FACE_COUNT
+from io_soulworker.core.vis_prim_type import VisPrimitiveType
+from io_soulworker.out.decode_cache import DecodeCache
+from io_soulworker.out.model_payload import ModelPayload
+from io_soulworker.out.model_proxy import BOX
+from io_soulworker.out.model_proxy import DECIMATE
+from io_soulworker.out.model_proxy import ModelProxy
+
+
+def events(payload: ModelPayload) -> dict:
+    return {name: args[0] for name, args in payload.events}
+
+
+class TestModelProxy(TestCase):
+
+    def test_decimate(self):
+        synthetic = SyntheticModel(2000, material_count=3, bone_count=5)
+
+        with TemporaryDirectory() as root:
+            path = synthetic.write(Path(root) / "prop.model")
+
+            full = events(ModelPayload.record(path, is_decode_weights=True))
+            chunks = events(ModelPayload.record(path, ModelProxy(DECIMATE, 0.25), is_decode_weights=True))
+
+        mesh: VMshChunk = chunks["on_mesh"]
+        self.assertLess(len(mesh.faces), len(full["on_mesh"].faces))
+        self.assertEqual(mesh.vertex_count, len(mesh.vertices))
+        self.assertEqual(len(mesh.normals), len(mesh.vertices))
+        self.assertLess(int(mesh.faces.max()), mesh.vertex_count)
+
+        # submesh ranges tile the proxy faces in order
+        ranges = [mesh.face_range(material.indices_start, material.indices_count)
+                  for material in chunks["on_vertices_material"].materials]
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], len(mesh.faces))
+        self.assertEqual([end for _, end in ranges[:-1]], [start for start, _ in ranges[1:]])
+
+        weights = chunks["on_skeleton_weights"]
+        self.assertEqual(weights.vertex_count, mesh.vertex_count)
+        self.assertEqual(weights.bones.shape[0], mesh.vertex_count)
+
+    def test_box(self):
+        synthetic = SyntheticModel(100, material_count=2, bone_count=5)
+
+        with TemporaryDirectory() as root:
+            path = synthetic.write(Path(root) / "prop.model")
+            chunks = events(ModelPayload.record(path, ModelProxy(BOX), is_decode_weights=True))
+
+        mesh: VMshChunk = chunks["on_mesh"]
+        self.assertEqual(mesh.prim_type, VisPrimitiveType.INDEXED_TRILIST)
+        self.assertEqual(mesh.faces.shape, (2 * BOX_FACE_COUNT, 3))
+        self.assertEqual(mesh.vertices.min(axis=0).tolist(), [0, 0, 0])
+        self.assertEqual(mesh.vertices.max(axis=0).tolist(), [1, 1, 1])
+
+        materials = chunks["on_vertices_material"].materials
+        self.assertEqual([mesh.face_range(material.indices_start, material.indices_count) for material in materials],
+                         [(0, BOX_FACE_COUNT), (BOX_FACE_COUNT, 2 * BOX_FACE_COUNT)])
+
+        self.assertNotIn("on_skeleton_weights", chunks)
+        self.assertNotIn("on_skeleton", chunks)
+
+    def test_cache(self):
+        with TemporaryDirectory() as root:
+            path = SyntheticModel(100).write(Path(root) / "prop.model")
+            cache = DecodeCache(Path(root) / "cache")
+
+            cache.decode(path)
+            self.assertIsNone(cache.load(path, ModelProxy(BOX)))
+
+            cache.decode(path, ModelProxy(BOX))
+            cache.decode(path, ModelProxy(DECIMATE, 0.5))
+            self.assertEqual(len(cache.entries()), 3)
+
+            boxes = cache.load(path, ModelProxy(BOX))
+            self.assertEqual(len(events(boxes)["on_mesh"].faces), BOX_FACE_COUNT)
+
+            del boxes
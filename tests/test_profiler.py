@@ -0,0 +1,52 @@
+from json import load
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from benchmarks.synthetic_model import SyntheticModel
+from io_soulworker.core.profiler import NULL_SPAN
+from io_soulworker.core.profiler import Profiler
+from io_soulworker.core.profiler import profiler
+from io_soulworker.out.model_payload import ModelPayload
+
+
+class TestProfiler(TestCase):
+
+    def test_disabled(self):
+        disabled = Profiler()
+
+        self.assertIs(disabled.span("header"), NULL_SPAN)
+        self.assertIs(disabled.file(Path("a.model")), NULL_SPAN)
+
+        disabled.count("mesh build", 1)
+        self.assertEqual(disabled.report(), {})
+
+    def test_spans(self):
+        with TemporaryDirectory() as root:
+            path = SyntheticModel(3, triangle_count=1).write(Path(root) / "NPC.model")
+
+            profiler.enable()
+
+            try:
+                ModelPayload.record(path)
+                spans = profiler.pop(path)
+            finally:
+                profiler.enable(False)
+                profiler.clear()
+
+            self.assertEqual(spans["VMSH"]["calls"], 1)
+            self.assertGreater(spans["VMSH"]["bytes"], 0)
+            self.assertEqual(spans["vertex decode"]["count"], 3)
+            self.assertEqual(spans["index decode"]["count"], 3)
+            self.assertGreater(spans["header"]["bytes"], 0)
+
+            merged = Profiler()
+            merged.merge(path, spans)
+            merged.merge(path, spans)
+            self.assertEqual(merged.report()[str(path)]["VMSH"]["calls"], 2)
+
+            report = Path(root) / "report.json"
+            merged.dump(report)
+
+            with open(report) as file:
+                self.assertIn(str(path), load(file))
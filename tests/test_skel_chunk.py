@@ -0,0 +1,44 @@
+from struct import pack
+from unittest import TestCase
+
+from benchmarks.synthetic_model import SyntheticModel
+from benchmarks.synthetic_model import string
+from io_soulworker.chunks.skel_chunk import SkelChunk
+from io_soulworker.core.binary_reader import BinaryReader
+
+
+def skel(parents: list[int]) -> bytes:
+    data = pack("<HH", 0, len(parents))
+
+    for i, parent in enumerate(parents):
+        data += string("Bone_%d" % i) + pack("<H", parent) + bytes(56)
+
+    return data
+
+
+class TestSkelChunk(TestCase):
+
+    def test_reentrant(self):
+        payload = SyntheticModel(10, bone_count=5).skel()
+
+        for _ in range(2):
+            with BinaryReader(payload) as reader:
+                chunk = SkelChunk(reader)
+
+            self.assertEqual([bone.id for bone in chunk.bones], [0, 1, 2, 3, 4])
+            self.assertEqual(chunk.parents(), [-1, 0, 1, 2, 3])
+            self.assertEqual(chunk.bones[0].local_rot, (1.0, 0.0, 0.0, 0.0))
+
+    def test_order(self):
+        # children listed before their parents, a self reference and an id out of range
+        with BinaryReader(skel([2, 0xFFFF, 1, 3, 40])) as reader:
+            chunk = SkelChunk(reader)
+
+        self.assertEqual(chunk.parents(), [2, -1, 1, -1, -1])
+        self.assertEqual(chunk.order(), [1, 2, 0, 3, 4])
+
+    def test_cycle(self):
+        with BinaryReader(skel([1, 0, 0xFFFF])) as reader:
+            chunk = SkelChunk(reader)
+
+        self.assertEqual(sorted(chunk.order()), [0, 1, 2])
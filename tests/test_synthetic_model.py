@@ -0,0 +1,45 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from benchmarks.synthetic_model import SyntheticModel
+from io_soulworker.core.vis_index_format import VisIndexFormat
+from io_soulworker.out.model_file import ModelFile
+from io_soulworker.out.model_probe import ModelProbe
+
+
+class TestSyntheticModel(TestCase):
+
+    def test(self):
+        synthetic = SyntheticModel(100, layout="full", padding=4, index_format=VisIndexFormat._32,
+                                   material_count=3)
+
+        with ModelFile(synthetic.to_bytes()) as model:
+            mesh = model.mesh
+
+            self.assertEqual(mesh.descriptor.stride, 48)
+            self.assertEqual(mesh.index_format, VisIndexFormat._32)
+            self.assertEqual(mesh.vertices.tolist(), synthetic.vertices()["pos"].tolist())
+            self.assertEqual(mesh.faces.shape, (200, 3))
+
+            self.assertEqual([material.name for material in model.materials],
+                             ["Material_0", "Material_1", "Material_2"])
+
+            submeshes = model.vertices_materials.materials
+            self.assertEqual(sum(submesh.indices_count for submesh in submeshes), 600)
+
+    def test_absent_components(self):
+        with ModelFile(SyntheticModel(10, layout="pos").to_bytes()) as model:
+            self.assertEqual(model.mesh.vertices.shape, (10, 3))
+            self.assertEqual(model.mesh.normals.shape, (0, 3))
+            self.assertEqual(model.mesh.uvs.shape, (0, 2))
+
+    def test_bones(self):
+        with TemporaryDirectory() as root:
+            path = SyntheticModel(10, bone_count=7).write(Path(root) / "bones.model")
+
+            self.assertEqual(ModelProbe(path).bone_count, 7)
+
+    def test_index_range(self):
+        with self.assertRaises(ValueError):
+            SyntheticModel(0x10001)
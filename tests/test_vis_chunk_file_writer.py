@@ -0,0 +1,47 @@
+from io import BytesIO
+from unittest import TestCase
+
+from benchmarks.synthetic_model import SyntheticModel
+from io_soulworker.chunks.vmsh_chunk import VMshChunk
+from io_soulworker.core.binary_reader import BinaryReader
+from io_soulworker.core.vis_bin_header import VisBinHeader
+from io_soulworker.core.vis_chunk_file_writer import VisChunkFileWriter
+from io_soulworker.core.vis_chunk_id import VisChunkId
+from io_soulworker.core.vis_chunk_toc import VisChunkToc
+from io_soulworker.core.vis_index_format import VisIndexFormat
+
+
+def rewrite(data: bytes, is_keep_buffer: bool) -> bytes:
+    """ VMSH decoded and encoded again, every other chunk copied """
+
+    output = BytesIO()
+
+    with BinaryReader(data) as reader:
+        header = VisBinHeader(reader)
+
+        with VisChunkFileWriter(output, header.version) as writer:
+            for entry in VisChunkToc(reader):
+                reader.seek(entry.offset)
+
+                if entry.cid == VisChunkId.VMSH:
+                    writer.write_mesh(VMshChunk(VisChunkId.VMSH, reader, is_keep_buffer=is_keep_buffer),
+                                      entry.depth)
+                else:
+                    writer.write_raw(entry.cid, reader.read_view(entry.length), entry.depth)
+
+    return output.getvalue()
+
+
+class TestVisChunkFileWriter(TestCase):
+
+    def test_buffer(self):
+        # padding and components the reader ignores survive through the raw buffer
+        data = SyntheticModel(64, layout="full", padding=4, index_format=VisIndexFormat._32,
+                              material_count=2, bone_count=3).to_bytes()
+
+        self.assertEqual(rewrite(data, True), data)
+
+    def test_components(self):
+        data = SyntheticModel(64, layout="pos_normal_uv", material_count=2).to_bytes()
+
+        self.assertEqual(rewrite(data, False), data)
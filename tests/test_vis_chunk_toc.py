@@ -0,0 +1,66 @@
+from struct import pack
+from unittest import TestCase
+
+from benchmarks.synthetic_model import chunk
+from io_soulworker.chunks.subm_chunk import SubmChunk
+from io_soulworker.core.binary_reader import BinaryReader
+from io_soulworker.core.vis_bin_header import VisBinHeader
+from io_soulworker.core.vis_chunk_id import VisChunkId
+from io_soulworker.core.vis_chunk_toc import VisChunkToc
+from io_soulworker.out.model_file import ModelFile
+from io_soulworker.out.model_file_reader import ModelFileReader
+
+
+def subm_payload() -> bytes:
+    material = pack("<8i6f2i", 0, 6, 0, 0, 0, 4, 0, 0, 0, 0, 0, 1, 1, 1, 0, 0)
+
+    return pack("<iiiI", -1, 2, 0, 1) + material
+
+
+MODEL = b"VBIN" + pack("<I", 65536) \
+    + chunk(VisChunkId.EXPR, b"\xff" * 7) \
+    + chunk(VisChunkId.SUBM, subm_payload()) \
+    + chunk(VisChunkId.BNDS, b"") \
+    + pack("<i", -1)
+
+
+class Recorder(ModelFileReader):
+
+    def on_vertices_material(self, chunk: SubmChunk):
+        self.chunk = chunk
+
+
+class TestVisChunkToc(TestCase):
+
+    def test(self):
+        with BinaryReader(MODEL) as reader:
+            VisBinHeader(reader)
+            toc = VisChunkToc(reader)
+
+        self.assertEqual([entry.cid for entry in toc],
+                         [VisChunkId.EXPR, VisChunkId.SUBM, VisChunkId.BNDS])
+        self.assertEqual(toc.find(VisChunkId.EXPR).length, 7)
+        self.assertEqual(toc.find(VisChunkId.SUBM).offset, 8 + 12 + 7 + 8 + 12)
+        self.assertIsNone(toc.find(VisChunkId.VMSH))
+
+    def test_lazy(self):
+        with ModelFile(MODEL) as model:
+            self.assertNotIn(VisChunkId.VMSH, model)
+            self.assertIsNone(model.mesh)
+
+            submeshes = model.vertices_materials
+            self.assertIs(model.vertices_materials, submeshes)
+            self.assertEqual(submeshes.materials[0].indices_count, 6)
+
+    def test_reader(self):
+        reader = Recorder(MODEL)
+        reader.run()
+
+        self.assertEqual(reader.chunk.materials[0].num_vertices, 4)
+
+    def test_old_subm(self):
+        # a plain submesh count carries no ranges, and no list shared with other chunks
+        first = SubmChunk(BinaryReader(pack("<i", 0)))
+        first.materials.append(None)
+
+        self.assertEqual(SubmChunk(BinaryReader(pack("<i", 0))).materials, [])
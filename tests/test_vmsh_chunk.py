@@ -0,0 +1,166 @@
+from io import BytesIO
+from pathlib import Path
+from struct import pack
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from numpy import allclose
+from numpy import float32
+
+from io_soulworker.chunks.vmsh_chunk import VMshChunk
+from io_soulworker.core.binary_reader import BinaryReader
+from io_soulworker.core.binary_writer import BinaryWriter
+from io_soulworker.core.vis_chunk_id import VisChunkId
+from io_soulworker.core.vis_index_format import VisIndexFormat
+from io_soulworker.core.vis_prim_type import VisPrimitiveType
+from io_soulworker.core.vis_vertex_decoder import VisVertexDecoder
+from io_soulworker.core.vis_vertex_descriptor import VisVertexDescriptor
+from io_soulworker.core.vis_vertex_format import VisVertexFormat
+
+
+def vmsh_payload(vertices: list[bytes], indices: list[int], stride: int, pos: int, normal: int, uv: int,
+                 index_format=VisIndexFormat._16, is_big_endian: bool = False,
+                 prim_type=VisPrimitiveType.INDEXED_TRILIST) -> bytes:
+    tex = [uv] + [0] * (VisVertexDescriptor.MAX_TEXTURES - 1)
+
+    descriptor = pack("<IIHHHH16HH", VisVertexDescriptor.MAGICK, 42, stride, pos, 0, normal, *tex, 0)
+    descriptor += pack("<I", 0)
+
+    header = pack("<IIII", VisChunkId.VMSH, 1, VMshChunk.MAGICK, 5) + descriptor
+    header += pack("<IBBBH", len(vertices), 0, 0, is_big_endian, 0)
+    prim_count = len(indices) // 3 if prim_type == VisPrimitiveType.INDEXED_TRILIST else max(len(indices) - 2, 0)
+
+    header += pack("<IIIIBB", prim_type, len(indices), index_format, prim_count, 0, 0)
+    header += pack("<BBB", 0, 0, 0)
+    header += pack("<BBH", 0, 0, 0)
+    header += pack("<BB", 0, 1)
+    header += pack("<H", 0)
+
+    index = "H" if index_format == VisIndexFormat._16 else "I"
+
+    return header + b"".join(vertices) + pack("%s%d%s" % (">" if is_big_endian else "<", len(indices), index), *indices)
+
+
+# pos, padding, normal, uv (with unused third component)
+VERTICES = [
+    pack("<3f4x3f3f", 1, 2, 3, 0, 0, 1, 0.25, 0.5, 0),
+    pack("<3f4x3f3f", 4, 5, 6, 0, 1, 0, 0.75, 1.0, 0),
+    pack("<3f4x3f3f", 7, 8, 9, 1, 0, 0, 0.0, 0.0, 0),
+]
+
+
+class TestVMshChunk(TestCase):
+
+    def test(self):
+        with TemporaryDirectory() as root:
+            path = Path(root) / "VMSH"
+            path.write_bytes(vmsh_payload(VERTICES, [0, 1, 2], 40, 0, 16, 28))
+
+            with BinaryReader(path) as reader:
+                chunk = VMshChunk(VisChunkId.VMSH, reader)
+
+        self.assertEqual(chunk.vertices.shape, (3, 3))
+        self.assertTrue(chunk.vertices.flags.c_contiguous)
+        self.assertEqual(chunk.vertices.tolist(), [[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+        self.assertEqual(chunk.normals.tolist(), [[0, 0, 1], [0, 1, 0], [1, 0, 0]])
+        self.assertEqual(chunk.uvs.tolist(), [[0.25, -0.5], [0.75, -1.0], [0.0, -0.0]])
+        self.assertEqual(chunk.indices.tolist(), [0, 1, 2])
+
+    def test_indices_32(self):
+        indices = [0, 1, 2, 2, 1, 0]
+        data = vmsh_payload(VERTICES, indices, 40, 0, 16, 28, VisIndexFormat._32)
+
+        with BinaryReader(data) as reader:
+            chunk = VMshChunk(VisChunkId.VMSH, reader)
+
+        self.assertEqual(chunk.indices.dtype.itemsize, 4)
+        self.assertEqual(chunk.faces.shape, (2, 3))
+        self.assertEqual(chunk.faces.tolist(), [[0, 1, 2], [2, 1, 0]])
+
+    def test_compact(self):
+        # half float position, packed normal, normalized short uv; unused components are 0
+        vertices = [
+            pack("<4e4B2h", 1, 2, 3, 0, 255, 128, 0, 0, 32767, -16384),
+            pack("<4e4B2h", 0.5, -1, 0, 0, 0, 255, 0, 0, -32767, 0),
+            pack("<4e4B2h", 4, 5, 6, 0, 0, 0, 255, 0, 0, 32767),
+        ]
+
+        data = vmsh_payload(vertices, [0, 1, 2], 16, 0 | VisVertexFormat.HALF4, 8 | VisVertexFormat.BYTE4N,
+                            12 | VisVertexFormat.SHORT2N)
+
+        with BinaryReader(data) as reader:
+            chunk = VMshChunk(VisChunkId.VMSH, reader)
+
+        self.assertEqual(chunk.vertices.dtype, float32)
+        self.assertEqual(chunk.vertices.tolist(), [[1, 2, 3], [0.5, -1, 0], [4, 5, 6]])
+        self.assertTrue(allclose(chunk.normals, [[1, 1 / 255, -1], [-1, 1, -1], [-1, -1, 1]], atol=1e-6))
+        self.assertTrue(allclose(chunk.uvs, [[1, 0.5], [-1, -0.0], [0, -1]], atol=1e-4))
+
+        # packed back from the decoded components
+        writer = BytesIO()
+        chunk.write(BinaryWriter(writer))
+
+        self.assertEqual(writer.getvalue(), data)
+
+    def test_big_endian(self):
+        vertices = [pack(">3f4x3f3f", *vertex) for vertex in
+                    [(1, 2, 3, 0, 0, 1, 0.25, 0.5, 0), (4, 5, 6, 0, 1, 0, 0.75, 1.0, 0)]]
+
+        with BinaryReader(vmsh_payload(vertices, [0, 1, 1], 40, 0, 16, 28, is_big_endian=True)) as reader:
+            chunk = VMshChunk(VisChunkId.VMSH, reader)
+
+        self.assertEqual(chunk.vertices.tolist(), [[1, 2, 3], [4, 5, 6]])
+        self.assertEqual(chunk.uvs.tolist(), [[0.25, -0.5], [0.75, -1.0]])
+        self.assertEqual(chunk.indices.tolist(), [0, 1, 1])
+
+    def test_big_endian_write(self):
+        vertices = [pack(">3f4x3f3f", *vertex) for vertex in
+                    [(1, 2, 3, 0, 0, 1, 0.25, 0.5, 0), (4, 5, 6, 0, 1, 0, 0.75, 1.0, 0)]]
+        data = vmsh_payload(vertices, [0, 1, 1, 0x102], 40, 0, 16, 28, is_big_endian=True)
+
+        # raw buffer or packed from the decoded components, the bytes stay big-endian
+        for is_keep_buffer in (True, False):
+            with BinaryReader(data) as reader:
+                chunk = VMshChunk(VisChunkId.VMSH, reader, is_keep_buffer=is_keep_buffer)
+
+            writer = BytesIO()
+            chunk.write(BinaryWriter(writer))
+
+            self.assertEqual(writer.getvalue(), data)
+
+    def test_overrun(self):
+        # a float3 normal at 32 reads past a 40 byte vertex
+        with BinaryReader(vmsh_payload(VERTICES, [0, 1, 2], 40, 0, 32, 28)) as reader:
+            self.assertRaises(AssertionError, VMshChunk, VisChunkId.VMSH, reader)
+
+    def test_decoder_cache(self):
+        with BinaryReader(vmsh_payload(VERTICES, [0, 1, 2], 40, 0, 16, 28)) as reader:
+            descriptor = VMshChunk(VisChunkId.VMSH, reader).descriptor
+
+        self.assertIs(VisVertexDecoder.get(descriptor), VisVertexDecoder.get(descriptor))
+        self.assertIsNot(VisVertexDecoder.get(descriptor), VisVertexDecoder.get(descriptor, True))
+
+    def test_strip(self):
+        # two strips joined by a restart, the second one stitched with a degenerate triangle
+        indices = [0, 1, 2, 0xFFFF, 2, 1, 0, 0, 1, 2]
+        data = vmsh_payload(VERTICES, indices, 40, 0, 16, 28, prim_type=VisPrimitiveType.INDEXED_TRISTRIP)
+
+        with BinaryReader(data) as reader:
+            chunk = VMshChunk(VisChunkId.VMSH, reader)
+
+        self.assertEqual(chunk.faces.tolist(), [[0, 1, 2], [2, 1, 0], [1, 0, 2]])
+        self.assertEqual(chunk.face_starts.tolist(), [0, 4, 7])
+
+        # a SUBM range over the second strip
+        self.assertEqual(chunk.face_range(4, 6), (1, 3))
+        self.assertEqual(chunk.face_range(0, 3), (0, 1))
+
+    def test_non_indexed(self):
+        data = vmsh_payload(VERTICES, [], 40, 0, 16, 28, VisIndexFormat.INVALID, prim_type=VisPrimitiveType.TRILIST)
+
+        with BinaryReader(data) as reader:
+            chunk = VMshChunk(VisChunkId.VMSH, reader)
+
+        self.assertEqual(chunk.indices.tolist(), [])
+        self.assertEqual(chunk.faces.tolist(), [[0, 1, 2]])
+        self.assertEqual(chunk.face_range(0, 3), (0, 1))
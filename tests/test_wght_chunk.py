@@ -0,0 +1,108 @@
+from pathlib import Path
+from struct import pack
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from numpy import array
+from numpy import float32
+from numpy import int32
+from numpy import uint16
+
+from benchmarks.synthetic_model import SyntheticModel
+from io_soulworker.chunks.wght_chunk import WghtChunk
+from io_soulworker.chunks.wght_chunk import weight_buckets
+from io_soulworker.core.binary_reader import BinaryReader
+from io_soulworker.out.model_file import ModelFile
+from io_soulworker.out.model_payload import ModelPayload
+
+
+def wght(slots: list[list[tuple[int, float]]]) -> bytes:
+    data = pack("<HIH", 0, len(slots), len(slots[0]))
+
+    for vertex in slots:
+        for bone, weight in vertex:
+            data += pack("<Hf", bone, weight)
+
+    return data
+
+
+class TestWghtChunk(TestCase):
+
+    def test(self):
+        payload = wght([
+            [(0, 2.0), (1, 2.0), (2, 0.0)],
+            [(1, 0.5), (2, 0.25), (3, 0.25)],
+            [(5, 1.0), (0, 0.0), (0, 0.0)],
+        ])
+
+        with BinaryReader(payload) as reader:
+            chunk = WghtChunk(reader)
+
+        self.assertEqual(chunk.bones.shape, (3, 3))
+
+        # bone 5 is past the skeleton, vertex 2 is left without weights
+        vertices, bones, weights = chunk.influences(3, bone_count=4)
+
+        self.assertEqual(vertices.tolist(), [0, 0, 1, 1, 1])
+        self.assertEqual(bones.tolist(), [0, 1, 1, 2, 3])
+        self.assertEqual(weights.tolist(), [0.5, 0.5, 0.5, 0.25, 0.25])
+
+    def test_limit(self):
+        with BinaryReader(wght([[(0, 0.1), (1, 0.6), (2, 0.3)]])) as reader:
+            vertices, bones, weights = WghtChunk(reader).influences(2)
+
+        self.assertEqual(sorted(bones.tolist()), [1, 2])
+        self.assertAlmostEqual(float(weights.sum()), 1, places=6)
+
+    def test_buckets(self):
+        vertices = array([0, 1, 2, 3, 4], int32)
+        bones = array([1, 0, 1, 1, 0], uint16)
+        weights = array([0.5, 1.0, 0.5, 0.25, 1.0], float32)
+
+        buckets = [(bone, round(weight, 3), members.tolist())
+                   for bone, weight, members in weight_buckets(vertices, bones, weights)]
+
+        self.assertEqual(buckets, [(0, 1.0, [1, 4]), (1, 0.251, [3]), (1, 0.502, [0, 2])])
+
+    def test_model(self):
+        with ModelFile(SyntheticModel(50, bone_count=6).to_bytes()) as model:
+            vertices, bones, weights = model.weights.influences(4, len(model.skeleton.bones))
+
+        self.assertEqual(model.weights.vertex_count, 50)
+        self.assertTrue((bones < 6).all())
+        self.assertTrue(abs(weights.reshape(50, 3).sum(axis=1) - 1).max() < 1e-5)
+
+    def test_option(self):
+        with TemporaryDirectory() as root:
+            path = SyntheticModel(20, bone_count=3).write(Path(root) / "skinned.model")
+
+            # the layout is unchecked, default imports leave WGHT alone
+            default = [name for name, _ in ModelPayload.record(path).events]
+            decoded = [name for name, _ in ModelPayload.record(path, is_decode_weights=True).events]
+
+        self.assertNotIn("on_skeleton_weights", default)
+        self.assertIn("on_skeleton", default)
+        self.assertIn("on_skeleton_weights", decoded)
+
+    def test_unknown_layout(self):
+        class Unknown(SyntheticModel):
+            def wght(self) -> bytes:
+                return pack("<HIH", 3, 1 << 20, 4)
+
+        class Truncated(SyntheticModel):
+            def wght(self) -> bytes:
+                return super().wght()[:-2]
+
+        for synthetic in (Unknown(20, bone_count=3), Truncated(20, bone_count=3)):
+            with TemporaryDirectory() as root:
+                path = synthetic.write(Path(root) / "skinned.model")
+
+                # the mesh still comes through, without weights
+                names = [name for name, _ in ModelPayload.record(path, is_decode_weights=True).events]
+
+                with ModelFile(path) as model:
+                    self.assertIsNone(model.weights)
+
+            self.assertIn("on_mesh", names)
+            self.assertIn("on_skeleton", names)
+            self.assertNotIn("on_skeleton_weights", names)